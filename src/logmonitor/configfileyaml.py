@@ -30,8 +30,13 @@ class ConfigField(Enum):
     ICONTHEME = "icontheme"
     PORT = "port"
     REFRESHTIME = "refreshtime"
+    WATCHFILES = "watchfiles"
+    DEBOUNCETIME = "debouncetime"
+    FEEDWRITER = "feedwriter"
+    PAGESIZE = "pagesize"
     DATAROOT = "dataroot"
     LOGDIR = "logdir"
+    STATEDIR = "statedir"
     LOGVIEWER = "logviewer"
 
     PARSER_TYPE = "parser"
@@ -59,6 +64,10 @@ def load_config(config_path):
     log_dir = specify_dir(log_dir, config_path, "log")
     general_section[ConfigField.LOGDIR.value] = log_dir
 
+    state_dir = general_section.get(ConfigField.STATEDIR.value)
+    state_dir = specify_dir(state_dir, config_path, "state")
+    general_section[ConfigField.STATEDIR.value] = state_dir
+
     return config_dict
 
 
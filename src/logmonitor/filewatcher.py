@@ -0,0 +1,234 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import logging
+import time
+import struct
+import select
+import threading
+import ctypes
+import ctypes.util
+from typing import List, Set
+from abc import ABC, abstractmethod
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+# inotify constants (from 'sys/inotify.h')
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+EVENT_HEADER = struct.Struct("iIII")  # watch descriptor, mask, cookie, name length
+
+
+class FileWatcher(ABC):
+    """Base class of watchers of log files changes.
+
+    Changes following each other in short time (e.g. burst of log writes) are reported once.
+    """
+
+    def __init__(self, file_list: List[str], debounce_time=2.0, max_delay=30.0):
+        self.files = {os.path.abspath(file_path): file_path for file_path in file_list}
+        self.debounce_time = debounce_time  # time without changes required to report changes
+        self.max_delay = max_delay  # maximum time of collecting changes
+
+    def wait_changes(self, timeout=None) -> Set[str]:
+        """Wait for changes of files.
+
+        Returns set of changed files (paths as given in constructor). Empty set is returned
+        if timeout passed or waiting was interrupted by 'wakeup'.
+        """
+        changed = self._wait(timeout)
+        if not changed:
+            return changed
+        deadline = time.monotonic() + self.max_delay
+        while True:
+            remaining = min(self.debounce_time, deadline - time.monotonic())
+            if remaining <= 0:
+                break
+            next_changed = self._wait(remaining)
+            if not next_changed:
+                # no more changes
+                break
+            changed.update(next_changed)
+        return changed
+
+    @abstractmethod
+    def wakeup(self):
+        """Interrupt waiting for changes."""
+        raise NotImplementedError("method not implemented")
+
+    # override if needed
+    def close(self):
+        """Release resources."""
+
+    @abstractmethod
+    def _wait(self, timeout) -> Set[str]:
+        """Wait for first change of files. Returns set of changed files or empty set."""
+        raise NotImplementedError("method not implemented")
+
+
+class PollingWatcher(FileWatcher):
+    """Watcher detecting changes by periodic checking of files status."""
+
+    def __init__(self, file_list: List[str], debounce_time=2.0, max_delay=30.0, poll_interval=1.0):
+        super().__init__(file_list, debounce_time, max_delay)
+        self.poll_interval = poll_interval
+        self.signatures = {file_path: get_file_signature(file_path) for file_path in self.files}
+        self.wakeup_event = threading.Event()
+
+    def wakeup(self):
+        self.wakeup_event.set()
+
+    def _wait(self, timeout) -> Set[str]:
+        deadline = None
+        if timeout is not None:
+            deadline = time.monotonic() + timeout
+        while True:
+            changed = self._check_files()
+            if changed:
+                return changed
+            wait_time = self.poll_interval
+            if deadline is not None:
+                wait_time = min(wait_time, deadline - time.monotonic())
+                if wait_time <= 0:
+                    return set()
+            if self.wakeup_event.wait(wait_time):
+                self.wakeup_event.clear()
+                return set()
+
+    def _check_files(self) -> Set[str]:
+        changed = set()
+        for file_path, signature in self.signatures.items():
+            new_signature = get_file_signature(file_path)
+            if new_signature != signature:
+                self.signatures[file_path] = new_signature
+                changed.add(self.files[file_path])
+        return changed
+
+
+class InotifyWatcher(FileWatcher):
+    """Watcher based on Linux inotify API (accessed through ctypes).
+
+    Directories of files are watched, so creation of file after rotation is also detected.
+    Raises OSError if inotify is not available.
+    """
+
+    def __init__(self, file_list: List[str], debounce_time=2.0, max_delay=30.0):
+        super().__init__(file_list, debounce_time, max_delay)
+        libc = load_libc()
+        self.inotify_fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.inotify_fd < 0:
+            raise_errno("inotify_init1")
+        self.wakeup_read, self.wakeup_write = os.pipe()
+        # watch descriptor -> directory
+        self.watches = {}
+        try:
+            for dir_path in sorted({os.path.dirname(file_path) for file_path in self.files}):
+                watch_desc = libc.inotify_add_watch(self.inotify_fd, os.fsencode(dir_path), WATCH_MASK)
+                if watch_desc < 0:
+                    raise_errno(f"inotify_add_watch {dir_path}")
+                self.watches[watch_desc] = dir_path
+        except OSError:
+            self.close()
+            raise
+
+    def wakeup(self):
+        os.write(self.wakeup_write, b"\0")
+
+    def close(self):
+        for file_desc in (self.inotify_fd, self.wakeup_read, self.wakeup_write):
+            try:
+                os.close(file_desc)
+            except OSError:
+                pass
+
+    def _wait(self, timeout) -> Set[str]:
+        deadline = None
+        if timeout is not None:
+            deadline = time.monotonic() + timeout
+        while True:
+            wait_time = None
+            if deadline is not None:
+                wait_time = max(deadline - time.monotonic(), 0)
+            ready_list, _, _ = select.select([self.inotify_fd, self.wakeup_read], [], [], wait_time)
+            if not ready_list:
+                # timeout
+                return set()
+            if self.wakeup_read in ready_list:
+                os.read(self.wakeup_read, 1024)
+                return set()
+            changed = self._read_events()
+            if changed:
+                return changed
+
+    def _read_events(self) -> Set[str]:
+        changed = set()
+        try:
+            data = os.read(self.inotify_fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+        pos = 0
+        while pos + EVENT_HEADER.size <= len(data):
+            watch_desc, mask, _, name_size = EVENT_HEADER.unpack_from(data, pos)
+            pos += EVENT_HEADER.size
+            name_end = pos + name_size
+            name = data[pos:name_end].rstrip(b"\0")
+            pos = name_end
+            if mask & IN_Q_OVERFLOW:
+                # events lost
+                return set(self.files.values())
+            dir_path = self.watches.get(watch_desc)
+            if dir_path is None or not name:
+                continue
+            file_path = os.path.join(dir_path, os.fsdecode(name))
+            if file_path in self.files:
+                changed.add(self.files[file_path])
+        return changed
+
+
+def create_watcher(file_list: List[str], debounce_time=2.0, max_delay=30.0) -> FileWatcher:
+    """Create inotify watcher. If inotify is not available then polling watcher is created."""
+    try:
+        return InotifyWatcher(file_list, debounce_time, max_delay)
+    except (OSError, AttributeError) as exc:
+        _LOGGER.info("unable to use inotify (%s) - watching files by polling", exc)
+        return PollingWatcher(file_list, debounce_time, max_delay)
+
+
+def get_file_signature(file_path):
+    try:
+        file_stat = os.stat(file_path)
+    except OSError:
+        return None
+    return (file_stat.st_ino, file_stat.st_size, file_stat.st_mtime_ns)
+
+
+def load_libc():
+    libc_path = ctypes.util.find_library("c") or "libc.so.6"
+    libc = ctypes.CDLL(libc_path, use_errno=True)
+    # raises AttributeError if functions are not available (e.g. not Linux system)
+    libc.inotify_init1.argtypes = [ctypes.c_int]
+    libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    return libc
+
+
+def raise_errno(message):
+    errno_value = ctypes.get_errno()
+    raise OSError(errno_value, f"{message}: {os.strerror(errno_value)}")
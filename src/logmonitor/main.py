@@ -68,6 +68,8 @@ def start_with_tray(parameters):
     log_dir = general_section.get(ConfigField.LOGDIR.value, "")
     log_viewer = general_section.get(ConfigField.LOGVIEWER.value)
     refresh_time = general_section.get(ConfigField.REFRESHTIME.value, 3600)
+    watch_files = general_section.get(ConfigField.WATCHFILES.value, False)
+    debounce_time = general_section.get(ConfigField.DEBOUNCETIME.value, 2.0)
     start_server = general_section.get(ConfigField.STARTSERVER.value, True)
     rss_port = general_section.get(ConfigField.PORT.value, 8080)
     startupdelay = general_section.get(ConfigField.STARTUPDELAY.value, 0)
@@ -101,7 +103,7 @@ def start_with_tray(parameters):
     exit_code = 0
     try:
         # run in loop
-        threaded_manager.start(refresh_time, startupdelay)
+        threaded_manager.start(refresh_time, startupdelay, watch_files, debounce_time)
         tray_manager.run_loop()  # run tray main loop
 
     except KeyboardInterrupt:
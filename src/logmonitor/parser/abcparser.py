@@ -6,10 +6,11 @@
 # LICENSE file in the root directory of this source tree.
 #
 
-from typing import List, Any
+from typing import List, Any, Iterable, Iterator
 from abc import ABC, abstractmethod
 
-from logmonitor.utils import read_data
+from logmonitor.parser.logcursor import LogCursor, read_new_lines
+from logmonitor.parser.filereader import open_log_file, read_lines
 
 
 class ABCParser(ABC):
@@ -18,13 +19,52 @@ class ABCParser(ABC):
     def __init__(self):
         pass
 
-    def parse_file(self, file_path) -> List[Any]:
+    def parse_file(self, file_path, cursor: LogCursor = None) -> List[Any]:
+        """Parse log file.
+
+        If cursor is given then only data appended since previous call is parsed.
+        """
         try:
-            content = read_data(file_path)
-            return self.parse_content(content, file_path=file_path)
+            return list(self.parse_file_stream(file_path, cursor=cursor))
         except FileNotFoundError:
             return None
 
+    def parse_file_stream(self, file_path, cursor: LogCursor = None, reader=None) -> Iterator[Any]:
+        """Parse log file yielding entries.
+
+        File is read lazily, so whole file is never kept in memory. Lines are not decoded
+        before matching - only emitted entries are decoded.
+        Reader (e.g. 'SharedReader') allows to share lines read from file with other parsers.
+        Raises FileNotFoundError if file does not exist.
+        """
+        if cursor is None:
+            with open_log_file(file_path) as fp:
+                lines = read_lines(fp)
+                yield from self.parse_stream(lines, file_path=file_path)
+        else:
+            if reader is None:
+                lines = read_new_lines(file_path, cursor)
+            else:
+                lines = reader.read_new_lines(file_path, cursor)
+            yield from self.parse_stream(lines, file_path=file_path, cursor=cursor)
+
+    def parse_content(self, content, file_path=None, cursor: LogCursor = None) -> List[Any]:
+        """Parse log content."""
+        lines = content.splitlines()
+        return list(self.parse_stream(lines, file_path=file_path, cursor=cursor))
+
     @abstractmethod
-    def parse_content(self, content, file_path=None) -> List[Any]:
+    def parse_stream(self, line_iterable: Iterable[bytes], file_path=None, cursor: LogCursor = None) -> Iterator[Any]:
+        """Parse lines yielding entries as soon as they are completed.
+
+        Lines are raw (not decoded) lines of file, but decoded strings are also accepted.
+        Lines may contain line terminators. 'FILE_BOUNDARY' separates lines of different files
+        (e.g. rotated file and current file). If cursor is given then entries that are
+        not completed yet are not returned, but kept in cursor to be continued in next call.
+        """
         raise NotImplementedError("method not implemented")
+
+    # override if needed
+    def get_pending(self, cursor: LogCursor) -> List[Any]:  # pylint: disable=W0613
+        """Return entries kept in cursor that are not completed yet."""
+        return []
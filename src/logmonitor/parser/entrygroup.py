@@ -0,0 +1,111 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import re
+import hashlib
+from typing import List, Dict
+
+from logmonitor.parser.logentry import LogEntry
+
+
+# hex values, ids (e.g. UUID) and numbers (including date and time) are masked in fingerprint
+FINGERPRINT_MASK = re.compile(rb"\b0x[0-9a-fA-F]+\b|\b[0-9a-fA-F]{8,}(?:-[0-9a-fA-F]{4,})*\b|\d+")
+
+
+def calculate_fingerprint(raw_lines: List[bytes]) -> str:
+    """Calculate fingerprint of log entry lines.
+
+    Entries differing only in numbers, ids or hex values have the same fingerprint.
+    """
+    content_hash = hashlib.md5()  # nosec
+    for line in raw_lines:
+        content_hash.update(FINGERPRINT_MASK.sub(b"#", line))
+        content_hash.update(b"\n")
+    return content_hash.hexdigest()
+
+
+class EntryGroup:
+    """Group of repeated log entries (entries with the same fingerprint)."""
+
+    __slots__ = ("fingerprint", "entry", "count", "first_seen", "last_seen")
+
+    def __init__(self, fingerprint, entry: LogEntry):
+        self.fingerprint = fingerprint
+        self.entry = entry  # most recent entry
+        self.count = 1
+        self.first_seen = entry.timestamp
+        self.last_seen = entry.timestamp
+
+    def add(self, entry: LogEntry):
+        self.entry = entry
+        self.count += 1
+        self.last_seen = entry.timestamp
+
+    def copy(self) -> "EntryGroup":
+        group = EntryGroup(self.fingerprint, self.entry)
+        group.count = self.count
+        group.first_seen = self.first_seen
+        group.last_seen = self.last_seen
+        return group
+
+    def __getstate__(self):
+        return (self.fingerprint, self.entry, self.count, self.first_seen, self.last_seen)
+
+    def __setstate__(self, state):
+        self.fingerprint, self.entry, self.count, self.first_seen, self.last_seen = state
+
+
+class EntryAggregator:
+    """Aggregates repeated log entries into groups.
+
+    Groups are ordered by last occurrence (the most recent is the last one).
+    If limit is set, then groups that did not occur for longest time are dropped.
+    """
+
+    def __init__(self, max_groups=None):
+        self.max_groups = max_groups
+        self.groups: Dict[str, EntryGroup] = {}
+
+    def add(self, entry: LogEntry):
+        fingerprint = calculate_fingerprint(entry.raw_lines)
+        # group is reinserted to keep order of occurrence
+        group = self.groups.pop(fingerprint, None)
+        if group is None:
+            group = EntryGroup(fingerprint, entry)
+        else:
+            group.add(entry)
+        self.groups[fingerprint] = group
+        if self.max_groups is not None and len(self.groups) > self.max_groups:
+            del self.groups[next(iter(self.groups))]
+
+    def set_groups(self, groups: Dict[str, EntryGroup]):
+        """Set groups (e.g. restored from state). Groups exceeding limit are dropped."""
+        self.groups = groups
+        if self.max_groups is not None:
+            for fingerprint in list(groups)[: max(len(groups) - self.max_groups, 0)]:
+                del groups[fingerprint]
+
+    def get_groups(self, pending_list: List[LogEntry] = None) -> List[EntryGroup]:
+        """Return groups ordered by last occurrence.
+
+        Pending entries are included in returned groups without modifying aggregator state.
+        """
+        if not pending_list:
+            groups = list(self.groups.values())
+        else:
+            aggregator = EntryAggregator(self.max_groups)
+            aggregator.groups = dict(self.groups)
+            for entry in pending_list:
+                fingerprint = calculate_fingerprint(entry.raw_lines)
+                group = aggregator.groups.get(fingerprint)
+                if group is not None:
+                    # do not modify original group
+                    aggregator.groups[fingerprint] = group.copy()
+                aggregator.add(entry)
+            groups = list(aggregator.groups.values())
+        return groups
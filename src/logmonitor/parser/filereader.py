@@ -0,0 +1,98 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import io
+import mmap
+import gzip
+import bz2
+import lzma
+from typing import Iterator
+
+
+# size of data split into lines at once
+CHUNK_SIZE = 8 * 1024 * 1024
+
+# files smaller than given size are read using standard buffered reader
+MMAP_MIN_SIZE = CHUNK_SIZE
+
+# magic numbers of supported compression formats
+COMPRESSION_MAGIC = [
+    (b"\x1f\x8b", gzip.GzipFile),
+    (b"BZh", bz2.BZ2File),
+    (b"\xfd7zXZ\x00", lzma.LZMAFile),
+]
+
+COMPRESSED_TYPES = tuple(item[1] for item in COMPRESSION_MAGIC)
+
+
+def get_decompressor(fp):
+    """Return type of reader decompressing content of file or None if file is not compressed."""
+    position = fp.tell()
+    fp.seek(0)
+    head = fp.read(6)
+    fp.seek(position)
+    for magic, reader_type in COMPRESSION_MAGIC:
+        if head.startswith(magic):
+            return reader_type
+    return None
+
+
+def open_log_file(file_path):
+    """Open file for reading in binary mode. Compressed files are decompressed while reading."""
+    fp = open(file_path, "rb")  # pylint: disable=R1732
+    decompressor = get_decompressor(fp)
+    if decompressor is None:
+        return fp
+    fp.close()
+    return decompressor(file_path)
+
+
+def read_lines(fp, offset=0) -> Iterator[bytes]:
+    """Iterate over raw lines of file opened in binary mode starting from given offset.
+
+    Lines contain line terminator, except last line if file does not end with new line.
+    Big files are memory mapped and split into lines in chunks. Compressed files are decompressed as a stream,
+    so offset is position in decompressed content.
+    """
+    if isinstance(fp, COMPRESSED_TYPES):
+        fp.seek(offset)
+        for line in fp:
+            yield line
+        return
+
+    file_size = os.fstat(fp.fileno()).st_size
+    if file_size - offset < MMAP_MIN_SIZE:
+        fp.seek(offset)
+        # 'yield from' would close file when generator is closed
+        for line in fp:
+            yield line
+        return
+
+    if hasattr(os, "posix_fadvise"):
+        # read-ahead hint
+        os.posix_fadvise(fp.fileno(), offset, 0, os.POSIX_FADV_SEQUENTIAL)
+
+    with mmap.mmap(fp.fileno(), file_size, access=mmap.ACCESS_READ) as mem_map:
+        if hasattr(mem_map, "madvise"):
+            mem_map.madvise(mmap.MADV_SEQUENTIAL)
+        pos = offset
+        while pos < file_size:
+            chunk_end = pos + CHUNK_SIZE
+            if chunk_end < file_size:
+                # chunk have to end on line boundary
+                line_end = mem_map.rfind(b"\n", pos, chunk_end)
+                if line_end < 0:
+                    # line longer than chunk
+                    line_end = mem_map.find(b"\n", chunk_end)
+                chunk_end = file_size if line_end < 0 else line_end + 1
+            else:
+                chunk_end = file_size
+            chunk = mem_map[pos:chunk_end]
+            yield from io.BytesIO(chunk)
+            pos = chunk_end
@@ -0,0 +1,215 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import logging
+import hashlib
+from typing import List, Iterator
+
+from logmonitor.parser.filereader import COMPRESSED_TYPES, get_decompressor, open_log_file, read_lines
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+# number of bytes from beginning of file used to identify the file
+FINGERPRINT_SIZE = 1024
+
+# extensions of compressed rotated files
+COMPRESSED_EXTENSIONS = [".gz", ".bz2", ".xz"]
+
+# yielded by 'read_new_lines' between lines of different files (e.g. rotated file and current file),
+# so parser completes entry of previous file and counts lines from beginning
+FILE_BOUNDARY = None
+
+
+class FileIdentity:
+    """Identity of log file.
+
+    Allows to detect if file was rotated (renamed and replaced with new file) or truncated.
+    """
+
+    def __init__(self, inode, size, head_size, fingerprint):
+        self.inode = inode
+        self.size = size
+        self.head_size = head_size  # number of bytes used to calculate fingerprint
+        self.fingerprint = fingerprint  # hash of file head
+
+
+class LogCursor:
+    """Position of parser in log file.
+
+    Allows to continue parsing from place where previous parsing finished.
+    """
+
+    def __init__(self):
+        self.offset = 0  # number of bytes of log file already parsed
+        self.state = None  # parser specific data, e.g. entry that can be continued by next lines
+        self.identity: FileIdentity = None  # identity of file pointed by offset
+
+    def reset(self):
+        self.offset = 0
+        self.state = None
+        self.identity = None
+
+
+def read_new_data(file_path, cursor: LogCursor) -> str:
+    """Read data appended to file since previous read."""
+    lines = read_new_lines(file_path, cursor)
+    return b"".join(line for line in lines if line is not FILE_BOUNDARY).decode("utf8")
+
+
+def read_new_lines(file_path, cursor: LogCursor) -> Iterator[bytes]:
+    """Read lines appended to file since previous read.
+
+    Lines are not decoded. Only complete lines are read - incomplete last line will be read in next call.
+    If file was rotated, then remaining lines of previous file and lines of all
+    files rotated in the meantime are read before lines of current file.
+    'FILE_BOUNDARY' is yielded after lines of each previous file (also if previous file was lost),
+    so lines of different files are not mixed by parser.
+    Cursor is moved while lines are consumed.
+    """
+    with open(file_path, "rb") as fp:
+        if get_decompressor(fp) is not None:
+            yield from read_compressed_lines(file_path, fp, cursor)
+            return
+
+        if cursor.identity is not None and not is_same_file(file_path, cursor.identity):
+            yield from read_rotated_lines(file_path, cursor)
+
+        for line in read_lines(fp, cursor.offset):
+            if not line.endswith(b"\n"):
+                # incomplete line
+                break
+            cursor.offset += len(line)
+            yield line
+
+        cursor.identity = read_file_identity(fp)
+        cursor.identity.size = cursor.offset
+
+
+def read_compressed_lines(file_path, fp, cursor: LogCursor) -> Iterator[bytes]:
+    """Read lines of compressed file.
+
+    Compressed file is never appended, so file already read is skipped.
+    """
+    identity = read_file_identity(fp)
+    if cursor.identity is not None:
+        if is_same_identity(identity, cursor.identity):
+            _LOGGER.debug("compressed file %s already processed", file_path)
+            return
+        _LOGGER.info("compressed file %s changed - reading from beginning", file_path)
+        cursor.reset()
+        yield FILE_BOUNDARY
+
+    with open_log_file(file_path) as data_fp:
+        for line in read_lines(data_fp, cursor.offset):
+            cursor.offset += len(line)
+            if not line.endswith(b"\n"):
+                # file will not be continued - complete last line
+                line += b"\n"
+            yield line
+
+    cursor.identity = identity
+
+
+def read_rotated_lines(file_path, cursor: LogCursor) -> Iterator[bytes]:
+    """Read remaining lines of rotated files.
+
+    Files are rotated in the same way as in 'logging.handlers.RotatingFileHandler',
+    so file 'app.log' is renamed to 'app.log.1', 'app.log.1' to 'app.log.2' and so on.
+    Cursor is moved to beginning of current file.
+    """
+    rotated_list = get_rotated_files(file_path)
+    prev_index = -1
+    for index, rotated_path in enumerate(rotated_list):
+        if is_same_file(rotated_path, cursor.identity):
+            prev_index = index
+            break
+
+    if prev_index < 0:
+        _LOGGER.warning("file %s rotated or truncated - unable to find previous file", file_path)
+        cursor.reset()
+        yield FILE_BOUNDARY
+        return
+
+    _LOGGER.info("file %s rotated - reading remaining data from %s", file_path, rotated_list[prev_index])
+    offset = cursor.offset
+    # from oldest to newest
+    for rotated_path in reversed(rotated_list[: prev_index + 1]):
+        with open_log_file(rotated_path) as fp:
+            for line in read_lines(fp, offset):
+                if not line.endswith(b"\n"):
+                    # file will not be continued - complete last line
+                    line += b"\n"
+                yield line
+        yield FILE_BOUNDARY
+        offset = 0
+
+    cursor.offset = 0
+
+
+def get_rotated_files(file_path) -> List[str]:
+    """Return list of rotated files from newest to oldest.
+
+    Rotated files can be compressed (e.g. by logrotate), so 'app.log.2.gz' is also found.
+    """
+    ret_list = []
+    index = 1
+    while True:
+        rotated_path = find_rotated_file(f"{file_path}.{index}")
+        if rotated_path is None:
+            break
+        ret_list.append(rotated_path)
+        index += 1
+    return ret_list
+
+
+def find_rotated_file(rotated_path):
+    if os.path.isfile(rotated_path):
+        return rotated_path
+    for extension in COMPRESSED_EXTENSIONS:
+        compressed_path = rotated_path + extension
+        if os.path.isfile(compressed_path):
+            return compressed_path
+    return None
+
+
+def is_same_file(file_path, identity: FileIdentity) -> bool:
+    """Check if file is the same file as the one described by identity.
+
+    File is the same if it has the same inode and beginning and it is not smaller.
+    """
+    try:
+        with open_log_file(file_path) as fp:
+            if isinstance(fp, COMPRESSED_TYPES):
+                # file compressed after rotation - only content can be compared
+                head = fp.read(identity.head_size)
+                return hashlib.md5(head).hexdigest() == identity.fingerprint  # nosec
+            file_identity = read_file_identity(fp, identity.head_size)
+    except FileNotFoundError:
+        return False
+    if file_identity.inode != identity.inode:
+        return False
+    if file_identity.size < identity.size:
+        # truncated
+        return False
+    return file_identity.fingerprint == identity.fingerprint
+
+
+def is_same_identity(identity: FileIdentity, other: FileIdentity) -> bool:
+    identity_tuple = (identity.inode, identity.size, identity.head_size, identity.fingerprint)
+    return identity_tuple == (other.inode, other.size, other.head_size, other.fingerprint)
+
+
+def read_file_identity(fp, head_size=FINGERPRINT_SIZE) -> FileIdentity:
+    file_stat = os.fstat(fp.fileno())
+    fp.seek(0)
+    head = fp.read(head_size)
+    fingerprint = hashlib.md5(head).hexdigest()  # nosec
+    return FileIdentity(file_stat.st_ino, file_stat.st_size, len(head), fingerprint)
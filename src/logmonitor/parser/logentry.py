@@ -0,0 +1,82 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+from typing import List, Dict, Any, Callable
+
+
+class LogEntry:
+    """Log entry found by parser.
+
+    Entry keeps raw (not decoded) lines of log. Lines are decoded when accessed,
+    invalid UTF-8 sequences are replaced. Fields of entry (e.g. message) are
+    extracted from lines by decoder given by parser on first access.
+    """
+
+    __slots__ = ("raw_lines", "line_number", "level", "timestamp", "entry_id", "_fields", "_decoder")
+
+    def __init__(
+        self,
+        raw_lines: List[bytes],
+        line_number=None,
+        level=None,
+        timestamp=None,
+        entry_id=None,
+        fields: Dict[str, Any] = None,
+        decoder: Callable[["LogEntry"], Dict[str, Any]] = None,
+    ):
+        self.raw_lines = raw_lines
+        self.line_number = line_number  # number of first line of entry (counting from 1 since beginning of parsing)
+        self.level = level  # priority of log level, None if unknown
+        self.timestamp = timestamp
+        self.entry_id = entry_id
+        self._fields = fields
+        self._decoder = decoder
+
+    @property
+    def lines(self) -> List[str]:
+        return [line.decode("utf8", errors="replace") for line in self.raw_lines]
+
+    @property
+    def text(self) -> str:
+        return b"\n".join(self.raw_lines).decode("utf8", errors="replace")
+
+    @property
+    def fields(self) -> Dict[str, Any]:
+        if self._fields is None:
+            if self._decoder is None:
+                self._fields = {}
+            else:
+                self._fields = self._decoder(self)
+        return self._fields
+
+    def set_decoder(self, decoder):
+        """Set decoder of fields. Fields already extracted are dropped."""
+        self._decoder = decoder
+        self._fields = None
+
+    def append_line(self, raw_line: bytes):
+        self.raw_lines.append(raw_line)
+        if self._decoder is not None:
+            # fields have to be decoded again
+            self._fields = None
+
+    def __getstate__(self):
+        # decoder is part of parser, so fields are stored instead
+        return (self.raw_lines, self.line_number, self.level, self.timestamp, self.entry_id, self.fields)
+
+    def __setstate__(self, state):
+        self.raw_lines, self.line_number, self.level, self.timestamp, self.entry_id, self._fields = state
+        self._decoder = None
+
+    def __eq__(self, other):
+        if not isinstance(other, LogEntry):
+            return NotImplemented
+        return self.__getstate__() == other.__getstate__()
+
+    def __repr__(self):
+        return f"LogEntry(line_number={self.line_number}, level={self.level}, lines={self.raw_lines})"
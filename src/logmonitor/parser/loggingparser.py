@@ -6,10 +6,35 @@
 # LICENSE file in the root directory of this source tree.
 #
 
-from typing import List, Any
+import re
+import datetime
+import functools
+from typing import List, Dict, Any, Iterable, Iterator
 from pygrok.pygrok import Grok
 
 from logmonitor.parser.abcparser import ABCParser
+from logmonitor.parser.logcursor import LogCursor, FILE_BOUNDARY
+from logmonitor.parser.logentry import LogEntry
+from logmonitor.utils import add_timezone
+
+
+# regular expressions equivalent to Grok patterns used by parser
+NATIVE_PATS = {
+    "DATA": r".*?",
+    "GREEDYDATA": r".*",
+    "NOTSPACE": r"\S+",
+    "SPACE": r"\s*",
+    "WORD": r"\b\w+\b",
+    "NONNEGINT": r"\b(?:[0-9]+)\b",
+    "NUMBER": r"(?:[+-]?(?:[0-9]+(?:\.[0-9]+)?|\.[0-9]+))",
+    "THREADNAME": r"\S+(?:\s*\S+)",
+}
+
+
+LEVEL_MAPPING = {None: 0, "DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40, "CRITICAL": 50}
+
+# mapping of level names found in raw lines
+RAW_LEVEL_MAPPING = {key.encode() if key else key: value for key, value in LEVEL_MAPPING.items()}
 
 
 class LoggingParser(ABCParser):
@@ -66,70 +91,203 @@ class LoggingParser(ABCParser):
         # Z
     }
 
-    def __init__(self, fmt=None, datefmt=None, pattern=None):
+    def __init__(self, fmt=None, datefmt=None, pattern=None, loglevel=None):
         super().__init__()
 
         if pattern is None:
-            pattern = self.parse_format(fmt)
-        self.grok = Grok(pattern, custom_patterns=self.CUSTOM_PATS)
+            # regular expression generated directly from format is much faster than Grok
+            pattern = self.format_to_regex(fmt)
+            self.matcher = get_regex_matcher(pattern)
+        else:
+            self.matcher = get_grok_matcher(pattern)
 
-        self.datetime_grok = None
+        self.datetime_matcher = None
+        self.datetime_decoder = None
         if datefmt:
-            datetime_pattern = self.parse_datetime(datefmt)
-            self.datetime_grok = Grok(datetime_pattern)
+            self.datetime_decoder = get_datetime_decoder(datefmt)
+            self.datetime_matcher = self.datetime_decoder.matcher
+
+        # lines are matched before decoding
+        regex_obj = get_bytes_regex(self.matcher.regex_obj.pattern)
+        if isinstance(self.matcher, RegexMatcher):
+            self.match_header = regex_obj.match
+        else:
+            # Grok searches pattern in whole line
+            self.match_header = regex_obj.search
+        self.has_level = "levelname" in regex_obj.groupindex
+        self.multiline = "message" in regex_obj.groupindex
+        self.has_asctime = self.datetime_decoder is not None and "asctime" in regex_obj.groupindex
+
+        # entries below threshold are rejected before extraction of fields
+        self.level_threshold = get_log_priority(loglevel)
 
-    def parse_content(self, content, file_path=None) -> List[Any]:
-        ret_list: List[Any] = []
-        lines = content.splitlines()
+    def parse_stream(self, line_iterable: Iterable[bytes], file_path=None, cursor: LogCursor = None) -> Iterator[Any]:
+        curr_entry: LogEntry = None  # entry that can be continued by next lines
         raise_detected = False  # if true then append next line
-        for line_index, raw_line in enumerate(lines):
-            found = None
+        skip_entry = False  # if true then current entry is below level threshold
+        lines_num = 0  # number of lines parsed before
+        if cursor is not None and cursor.state is not None:
+            # continue entry from previous call
+            curr_entry, raise_detected, skip_entry, lines_num = cursor.state
+            if curr_entry is not None:
+                curr_entry.set_decoder(self.decode_fields)
+        for raw_line in line_iterable:
+            if raw_line is FILE_BOUNDARY:
+                # lines of next file (e.g. after rotation) - entry of previous file is completed
+                if curr_entry is not None:
+                    yield curr_entry
+                    curr_entry = None
+                raise_detected = False
+                skip_entry = False
+                lines_num = 0
+                continue
+            if isinstance(raw_line, str):
+                raw_line = raw_line.encode("utf8")
+            raw_line = raw_line.rstrip(b"\r\n")
+            lines_num += 1
+            match_obj = None
             if raise_detected:
                 # next line after raise - line with exception log
                 raise_detected = False
-            elif raw_line.startswith("    raise "):
+            elif raw_line.startswith(b"    raise "):
                 # raise line
                 raise_detected = True
             else:
-                found = self.grok.match(raw_line)
-            if found is None:
+                match_obj = self.match_header(raw_line)
+            if match_obj is None:
                 # continuation of multiline log
-                if ret_list:
-                    prev_entry = ret_list[-1]
-                    self._append_text(prev_entry, raw_line)
+                if skip_entry:
+                    # continuation of rejected entry
+                    continue
+                if curr_entry is not None:
+                    if not self.multiline:
+                        # there should be message, because there is next line of multiline log
+                        raise RuntimeError("unexpected log")
+                    curr_entry.append_line(raw_line)
                 else:
                     raise RuntimeError(
-                        f"file {file_path}: unable to match pattern '{self.grok.pattern}'"
-                        f" to line {line_index + 1}: {raw_line}"
+                        f"file {file_path}: unable to match pattern '{self.matcher.pattern}'"
+                        f" to line {lines_num}: {raw_line.decode('utf8', errors='replace')}"
                     )
                 continue
 
-            if self.datetime_grok:
-                datetime_string = found.get("asctime")
-                if datetime_string:
-                    datetime_found = self.datetime_grok.match(datetime_string)
-                    if datetime_found:
-                        found["asctime"] = datetime_found
+            # new entry found - previous entry is completed
+            if curr_entry is not None:
+                yield curr_entry
+                curr_entry = None
 
-            ret_list.append([raw_line, found])
-        return ret_list
+            levelname = match_obj["levelname"] if self.has_level else None
+            priority = RAW_LEVEL_MAPPING.get(levelname)
+            if self.level_threshold and not self._check_level(priority):
+                # entry is rejected before extraction of fields
+                skip_entry = True
+                continue
+            skip_entry = False
 
-    @staticmethod
-    def _append_text(data_entry, text):
-        data_dict = data_entry[1]
-        if "message" not in data_dict:
-            # there should be message, because there is next line of multiline log
-            raise RuntimeError("unexpected log")
+            timestamp = None
+            if self.has_asctime:
+                timestamp = self.datetime_decoder.decode(match_obj["asctime"])
+            curr_entry = LogEntry(
+                [raw_line], line_number=lines_num, level=priority, timestamp=timestamp, decoder=self.decode_fields
+            )
+
+        if cursor is not None:
+            # last entry can be continued by lines appended to file later
+            cursor.state = (curr_entry, raise_detected, skip_entry, lines_num)
+        elif curr_entry is not None:
+            yield curr_entry
+
+    def _check_level(self, priority) -> bool:
+        if priority is None:
+            # unknown level
+            return True
+        return priority >= self.level_threshold
 
-        data_entry[0] += "\n" + text
-        data_dict["message"] += "\n" + text
+    def decode_fields(self, log_entry: LogEntry) -> Dict[str, Any]:
+        """Extract fields from lines of log entry."""
+        lines = log_entry.lines
+        # raw line is matched the same way as in 'parse_stream' - decoded line could match differently
+        # (e.g. non-ASCII whitespaces or invalid characters replaced)
+        match_obj = self.match_header(log_entry.raw_lines[0])
+        if match_obj is None:
+            return {"message": "\n".join(lines)}
+        fields = {
+            key: value.decode("utf8", errors="replace") if value is not None else None
+            for key, value in match_obj.groupdict().items()
+        }
+        if len(lines) > 1:
+            fields["message"] = "\n".join([fields["message"]] + lines[1:])
+        if isinstance(self.matcher, Grok):
+            # fields with type in pattern (e.g. '%{INT:lineno:int}') are converted the same way as Grok does
+            convert_grok_types(fields, self.matcher.type_mapper)
+        if self.datetime_matcher:
+            datetime_string = fields.get("asctime")
+            if datetime_string:
+                datetime_found = self.datetime_matcher.match(datetime_string)
+                if datetime_found:
+                    fields["asctime"] = datetime_found
+        return fields
+
+    def get_pending(self, cursor: LogCursor) -> List[Any]:
+        if cursor.state is None or cursor.state[0] is None:
+            return []
+        return [cursor.state[0]]
 
     @staticmethod
     # style='%' -- not supported yet
     def parse_format(fmt=None):
+        """Convert logging format to Grok pattern."""
         if fmt is None:
             return ""
         pattern_list = []
+        for prefix, token, token_modifier in LoggingParser.split_format(fmt):
+            if prefix:
+                pattern_list.append(escape_regex(prefix))
+            if token is None:
+                continue
+            token_type, token_pattern = LoggingParser.TOKENS[token]
+            pattern = f"%{{{token_pattern}:{token}}}"
+            pattern_list.append(pattern)
+
+            if token_type in ("s", "d"):  # nosec
+                if token_modifier:
+                    # case of string with reserved length
+                    # if string is shorter than reservation, then empty spaces will be filled with spaces
+                    pattern_list.append("%{SPACE}")
+
+        pattern = "".join(pattern_list)
+        return pattern
+
+    @staticmethod
+    def format_to_regex(fmt=None):
+        """Convert logging format to regular expression with named groups."""
+        if fmt is None:
+            return ""
+        pattern_list = []
+        for prefix, token, token_modifier in LoggingParser.split_format(fmt):
+            if prefix:
+                pattern_list.append(re.escape(prefix))
+            if token is None:
+                continue
+            token_type, token_pattern = LoggingParser.TOKENS[token]
+            pattern = f"(?P<{token}>{NATIVE_PATS[token_pattern]})"
+            pattern_list.append(pattern)
+
+            if token_type in ("s", "d"):  # nosec
+                if token_modifier:
+                    # case of string with reserved length
+                    pattern_list.append(NATIVE_PATS["SPACE"])
+
+        pattern = "".join(pattern_list)
+        return pattern
+
+    @staticmethod
+    def split_format(fmt):
+        """Split logging format into list of tuples: (prefix, token, token modifier).
+
+        Last tuple contains text after last token and None as token.
+        """
+        ret_list = []
         end_pos = 0
         while end_pos >= 0:
             # find start of next token
@@ -137,16 +295,11 @@ class LoggingParser(ABCParser):
             if start_pos < 0:
                 # no more tokens
                 postfix = fmt[end_pos:]
-                if postfix:
-                    postfix = escape_regex(postfix)
-                    pattern_list.append(postfix)
+                ret_list.append((postfix, None, None))
                 break
 
             # get token prefix
             prefix = fmt[end_pos:start_pos]
-            if prefix:
-                prefix = escape_regex(prefix)
-                pattern_list.append(prefix)
             start_pos += 2
 
             # get token name
@@ -169,24 +322,54 @@ class LoggingParser(ABCParser):
             token_modifier = fmt[end_pos:type_pos]
             end_pos = type_pos + 1
 
-            token_pattern = token_data[1]
+            ret_list.append((prefix, token, token_modifier))
+
+        return ret_list
+
+    @staticmethod
+    def parse_datetime(datefmt=None):
+        """Convert datetime format to Grok pattern."""
+        if datefmt is None:
+            return ""
+        pattern_list = []
+        for prefix, token in LoggingParser.split_datetime(datefmt):
+            if prefix:
+                pattern_list.append(prefix)
+            if token is None:
+                continue
+            token_pattern = LoggingParser.DATETIME_TOKENS[token]
             pattern = f"%{{{token_pattern}:{token}}}"
             pattern_list.append(pattern)
 
-            if token_type in ("s", "d"):  # nosec
-                if token_modifier:
-                    # case of string with reserved length
-                    # if string is shorter than reservation, then empty spaces will be filled with spaces
-                    pattern_list.append("%{SPACE}")
-
         pattern = "".join(pattern_list)
         return pattern
+        # return "%{GREEDYDATA:xxx}"#-%{NONNEGINT:m}-%{NONNEGINT:d} %{NONNEGINT:H}:%{NONNEGINT:M}:%{NONNEGINT:S}"
 
     @staticmethod
-    def parse_datetime(datefmt=None):
+    def datetime_to_regex(datefmt=None):
+        """Convert datetime format to regular expression with named groups."""
         if datefmt is None:
             return ""
         pattern_list = []
+        for prefix, token in LoggingParser.split_datetime(datefmt):
+            if prefix:
+                pattern_list.append(re.escape(prefix))
+            if token is None:
+                continue
+            token_pattern = LoggingParser.DATETIME_TOKENS[token]
+            pattern = f"(?P<{token}>{NATIVE_PATS[token_pattern]})"
+            pattern_list.append(pattern)
+
+        pattern = "".join(pattern_list)
+        return pattern
+
+    @staticmethod
+    def split_datetime(datefmt):
+        """Split datetime format into list of tuples: (prefix, token).
+
+        Last tuple contains text after last token and None as token.
+        """
+        ret_list = []
         end_pos = 0
         while end_pos >= 0:
             # find start of next token
@@ -194,14 +377,11 @@ class LoggingParser(ABCParser):
             if start_pos < 0:
                 # no more tokens
                 postfix = datefmt[end_pos:]
-                if postfix:
-                    pattern_list.append(postfix)
+                ret_list.append((postfix, None))
                 break
 
             # get token prefix
             prefix = datefmt[end_pos:start_pos]
-            if prefix:
-                pattern_list.append(prefix)
             start_pos += 1
 
             # get token name
@@ -209,15 +389,118 @@ class LoggingParser(ABCParser):
             end_pos = start_pos + 1
 
             # get token data
-            token_pattern = LoggingParser.DATETIME_TOKENS.get(token)
-            if token_pattern is None:
+            if token not in LoggingParser.DATETIME_TOKENS:
                 raise ValueError(f"unknown token: {token}")
-            pattern = f"%{{{token_pattern}:{token}}}"
-            pattern_list.append(pattern)
 
-        pattern = "".join(pattern_list)
-        return pattern
-        # return "%{GREEDYDATA:xxx}"#-%{NONNEGINT:m}-%{NONNEGINT:d} %{NONNEGINT:H}:%{NONNEGINT:M}:%{NONNEGINT:S}"
+            ret_list.append((prefix, token))
+
+        return ret_list
+
+
+class RegexMatcher:
+    """Matcher with interface of Grok, but based on native regular expression.
+
+    Pattern is anchored to beginning of matched text.
+    """
+
+    def __init__(self, pattern):
+        self.pattern = pattern
+        self.regex_obj = re.compile(pattern)
+
+    def match(self, text):
+        match_obj = self.regex_obj.match(text)
+        if match_obj is None:
+            return None
+        return match_obj.groupdict()
+
+
+class DatetimeDecoder:
+    """Converter of datetime strings in given format to datetime objects with timezone.
+
+    Consecutive log entries often have the same timestamp, so recently decoded value is reused.
+    Localization is expensive, so UTC offset is calculated once per hour.
+    """
+
+    # tokens that can be directly converted to datetime arguments
+    NUMERIC_TOKENS = {"Y": "year", "m": "month", "d": "day", "H": "hour", "M": "minute", "S": "second"}
+
+    def __init__(self, datefmt):
+        self.datefmt = datefmt
+        self.matcher = get_regex_matcher(LoggingParser.datetime_to_regex(datefmt))
+        tokens = {token for _, token in LoggingParser.split_datetime(datefmt) if token is not None}
+        self.numeric = {"Y", "m", "d"}.issubset(tokens) and tokens.issubset(self.NUMERIC_TOKENS.keys())
+        # pairs are replaced at once, so decoder can be shared between threads
+        self.recent_value = (None, None)  # recent string and its datetime
+        self.recent_offset = (None, None)  # recent hour and its timezone info
+
+    def decode(self, datetime_string) -> datetime.datetime:
+        """Convert string (or raw bytes) to datetime. Returns None if string does not match format."""
+        recent_string, recent_datetime = self.recent_value
+        if datetime_string == recent_string:
+            return recent_datetime
+        raw_string = datetime_string
+        if isinstance(datetime_string, bytes):
+            datetime_string = datetime_string.decode("utf8", errors="replace")
+        try:
+            if self.numeric:
+                found = self.matcher.match(datetime_string)
+                if found is None:
+                    return None
+                args = {self.NUMERIC_TOKENS[token]: int(value) for token, value in found.items()}
+                date_value = datetime.datetime(**args)
+            else:
+                date_value = datetime.datetime.strptime(datetime_string, self.datefmt)
+        except ValueError:
+            return None
+        hour_value = date_value.replace(minute=0, second=0, microsecond=0)
+        recent_hour, tz_info = self.recent_offset
+        if hour_value != recent_hour:
+            # timezone offset changes only on full hours
+            tz_info = add_timezone(hour_value).tzinfo
+            self.recent_offset = (hour_value, tz_info)
+        date_value = date_value.replace(tzinfo=tz_info)
+        self.recent_value = (raw_string, date_value)
+        return date_value
+
+
+# matchers are immutable, so they are shared by all parsers with the same format
+@functools.lru_cache(maxsize=None)
+def get_regex_matcher(pattern) -> RegexMatcher:
+    return RegexMatcher(pattern)
+
+
+@functools.lru_cache(maxsize=None)
+def get_bytes_regex(pattern: str) -> re.Pattern:
+    """Compile regular expression matching raw (not decoded) lines."""
+    return re.compile(pattern.encode("utf8"))
+
+
+@functools.lru_cache(maxsize=None)
+def get_grok_matcher(pattern) -> Grok:
+    return Grok(pattern, custom_patterns=LoggingParser.CUSTOM_PATS)
+
+
+def convert_grok_types(fields: Dict[str, Any], type_mapper: Dict[str, str]):
+    """Convert values of fields to types given in Grok pattern. Values that cannot be converted are not changed."""
+    converters = {"int": int, "float": float}
+    for key, type_name in type_mapper.items():
+        converter = converters.get(type_name)
+        value = fields.get(key)
+        if converter is None or value is None:
+            continue
+        try:
+            fields[key] = converter(value)
+        except ValueError:
+            pass
+
+
+@functools.lru_cache(maxsize=None)
+def get_datetime_decoder(datefmt) -> DatetimeDecoder:
+    return DatetimeDecoder(datefmt)
+
+
+def get_log_priority(level_name):
+    return LEVEL_MAPPING[level_name]
 
 
 def escape_regex(pattern):
@@ -0,0 +1,208 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import logging
+import multiprocessing
+from collections import deque
+from typing import List, Tuple, Iterator
+from concurrent.futures import ProcessPoolExecutor
+
+from logmonitor.parser.loggingparser import LoggingParser
+from logmonitor.parser.logcursor import LogCursor, read_file_identity
+from logmonitor.parser.logentry import LogEntry
+from logmonitor.parser.filereader import get_decompressor
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+# files smaller than given size are parsed sequentially
+PARALLEL_MIN_SIZE = 64 * 1024 * 1024
+
+# size of range parsed by single task
+PARALLEL_CHUNK_SIZE = 32 * 1024 * 1024
+
+
+def parse_file_parallel(
+    parser: LoggingParser,
+    file_path,
+    cursor: LogCursor = None,
+    reader=None,
+    workers=None,
+    min_size=PARALLEL_MIN_SIZE,
+    chunk_size=PARALLEL_CHUNK_SIZE,
+) -> Iterator[LogEntry]:
+    """Parse whole log file in parallel processes.
+
+    File is split into ranges (of about 'chunk_size' bytes) starting on log entry
+    headers, so entries never cross ranges. Entries are returned in the same order
+    and with the same content as in sequential parsing. Only few ranges are parsed
+    at once, so memory usage does not depend on size of file. Parallel parsing is
+    used only if there is nothing parsed yet (cursor in initial state) and file is
+    big enough. Raises FileNotFoundError if file does not exist.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    file_size = os.path.getsize(file_path)
+    sequential = workers < 2 or file_size < min_size
+    if cursor is not None and (cursor.identity is not None or cursor.offset > 0 or cursor.state is not None):
+        sequential = True
+    if not sequential:
+        with open(file_path, "rb") as fp:
+            # compressed file can't be split into ranges
+            sequential = get_decompressor(fp) is not None
+    if sequential:
+        yield from parser.parse_file_stream(file_path, cursor, reader=reader)
+        return
+    if reader is not None:
+        # file is read directly
+        reader.release(file_path)
+
+    with open(file_path, "rb") as fp:
+        data_end = file_size
+        if cursor is not None:
+            # incomplete last line will be parsed in next call
+            data_end = find_data_end(fp, file_size)
+        ranges_list = split_ranges(parser, fp, data_end, chunk_size)
+        identity = read_file_identity(fp)
+
+    _LOGGER.info("parsing file %s in %s ranges", file_path, len(ranges_list))
+    lines_num = 0
+    pending_entry = None
+    # workers are started from threads of application, so processes are not forked
+    with ProcessPoolExecutor(max_workers=workers, mp_context=get_mp_context()) as executor:
+        ranges_queue = deque(ranges_list)
+        futures_queue = deque()
+        while ranges_queue or futures_queue:
+            # limited number of ranges is submitted, so results do not accumulate
+            while ranges_queue and len(futures_queue) < 2 * workers:
+                range_start, range_end = ranges_queue.popleft()
+                futures_queue.append(executor.submit(parse_range, parser, file_path, range_start, range_end))
+            entries_list, range_state = futures_queue.popleft().result()
+            if pending_entry is not None:
+                # next range starts with header, so entry is completed
+                yield pending_entry
+            for entry_data in entries_list:
+                yield make_entry(parser, entry_data, lines_num)
+            pending_data, raise_detected, skip_entry, range_lines = range_state
+            pending_entry = None
+            if pending_data is not None:
+                pending_entry = make_entry(parser, pending_data, lines_num)
+            lines_num += range_lines
+
+    if cursor is None:
+        if pending_entry is not None:
+            yield pending_entry
+        return
+
+    cursor.offset = data_end
+    cursor.identity = identity
+    cursor.identity.size = data_end
+    cursor.state = (pending_entry, raise_detected, skip_entry, lines_num)
+
+
+def parse_range(parser: LoggingParser, file_path, start, end):
+    """Parse range of file. Executed in worker process.
+
+    Returns list of completed entries and parser state after last line of range.
+    Entries are passed without decoded fields to reduce transfer cost.
+    """
+    cursor = LogCursor()
+    with open(file_path, "rb") as fp:
+        lines = read_range_lines(fp, start, end)
+        entries_list = [
+            get_entry_data(entry) for entry in parser.parse_stream(lines, file_path=file_path, cursor=cursor)
+        ]
+    pending_entry, raise_detected, skip_entry, lines_num = cursor.state
+    if pending_entry is not None:
+        pending_entry = get_entry_data(pending_entry)
+    return entries_list, (pending_entry, raise_detected, skip_entry, lines_num)
+
+
+def read_range_lines(fp, start, end) -> Iterator[bytes]:
+    """Read lines of range line by line, without loading whole range."""
+    fp.seek(start)
+    position = start
+    while position < end:
+        raw_line = fp.readline()
+        if not raw_line:
+            break
+        position += len(raw_line)
+        yield raw_line
+
+
+def get_mp_context():
+    """Return context of worker processes. Forking process with running threads is not safe."""
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+def get_entry_data(entry: LogEntry):
+    return (entry.raw_lines, entry.line_number, entry.level, entry.timestamp)
+
+
+def make_entry(parser: LoggingParser, entry_data, lines_offset) -> LogEntry:
+    lines, line_number, level, timestamp = entry_data
+    return LogEntry(
+        lines, line_number=line_number + lines_offset, level=level, timestamp=timestamp, decoder=parser.decode_fields
+    )
+
+
+def split_ranges(parser: LoggingParser, fp, data_end, chunk_size) -> List[Tuple[int, int]]:
+    """Split file into ranges of about 'chunk_size' bytes starting on beginning of log entries."""
+    ranges_list = []
+    range_start = 0
+    position = chunk_size
+    while position < data_end:
+        range_end = find_entry_start(parser, fp, position, data_end)
+        if range_end >= data_end:
+            break
+        if range_end > range_start:
+            ranges_list.append((range_start, range_end))
+            range_start = range_end
+        position = max(range_end, position) + chunk_size
+    ranges_list.append((range_start, data_end))
+    return ranges_list
+
+
+def find_entry_start(parser: LoggingParser, fp, position, data_end) -> int:
+    """Find position of first log entry header after given position."""
+    fp.seek(position)
+    prev_line = b""
+    if position > 0:
+        # skip remaining part of line and line after it - previous line is needed
+        fp.readline()
+        prev_line = fp.readline()
+    while True:
+        line_start = fp.tell()
+        if line_start >= data_end:
+            return data_end
+        raw_line = fp.readline()
+        if not raw_line:
+            return data_end
+        line = raw_line.rstrip(b"\r\n")
+        if not prev_line.startswith(b"    raise ") and parser.match_header(line):
+            # line after 'raise' is never a header
+            return line_start
+        prev_line = line
+
+
+def find_data_end(fp, file_size) -> int:
+    """Find end of last complete line."""
+    position = file_size
+    while position > 0:
+        block_start = max(0, position - 64 * 1024)
+        fp.seek(block_start)
+        block = fp.read(position - block_start)
+        line_end = block.rfind(b"\n")
+        if line_end >= 0:
+            return block_start + line_end + 1
+        position = block_start
+    return 0
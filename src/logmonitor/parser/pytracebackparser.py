@@ -7,40 +7,64 @@
 #
 
 import os
-from typing import List, Any
+import hashlib
+from typing import List, Any, Iterable, Iterator, Deque
+from collections import deque
 
 from logmonitor.parser.abcparser import ABCParser
-from logmonitor.utils import calculate_hash
+from logmonitor.parser.logcursor import LogCursor, FILE_BOUNDARY
+from logmonitor.parser.logentry import LogEntry
 
 
 class PyTracebackParser(ABCParser):
 
     FIRST_LINE = "Traceback (most recent call last):"
+    RAW_FIRST_LINE = FIRST_LINE.encode()
 
     def __init__(self, linesbefore=0):
         super().__init__()
         self.lines_before = linesbefore
 
-    def parse_content(self, content, file_path=None) -> List[Any]:
-        ret_list = []
-        lines = content.splitlines()
+    def parse_stream(self, line_iterable: Iterable[bytes], file_path=None, cursor: LogCursor = None) -> Iterator[Any]:
+        mod_time = None
+        lines_num = 0  # number of lines parsed before
+        prev_lines: Deque[bytes] = deque(maxlen=self.lines_before)  # context of traceback
         traceback_content = None
+        traceback_line = None  # number of first line of traceback
+        context_size = 0  # number of context lines in traceback content
         reason_line = False
-        for line_index, raw_line in enumerate(lines):
-            if raw_line == self.FIRST_LINE:
+        if cursor is not None and cursor.state is not None:
+            # continue traceback from previous call
+            lines_num, prev_list, traceback_content, traceback_line, context_size, reason_line = cursor.state
+            prev_lines.extend(prev_list)
+        for raw_line in line_iterable:
+            if raw_line is FILE_BOUNDARY:
+                # lines of next file (e.g. after rotation) - traceback of previous file will not be continued
+                if reason_line:
+                    if mod_time is None:
+                        mod_time = os.path.getmtime(file_path)
+                    yield create_entry(traceback_content, traceback_line, context_size, mod_time)
+                traceback_content = None
+                reason_line = False
+                prev_lines.clear()
+                lines_num = 0
+                continue
+            if isinstance(raw_line, str):
+                raw_line = raw_line.encode("utf8")
+            raw_line = raw_line.rstrip(b"\r\n")
+            lines_num += 1
+            if raw_line == self.RAW_FIRST_LINE:
                 # traceback first line
-                traceback_content = []
-                if self.lines_before > 0:
-                    start_index = max(0, line_index - self.lines_before)
-                    traceback_content = lines[start_index:line_index]
+                traceback_content = list(prev_lines)
                 traceback_content.append(raw_line)
-                continue
+                traceback_line = lines_num
+                context_size = len(prev_lines)
 
-            if traceback_content is None:
+            elif traceback_content is None:
                 # no traceback state
-                continue
+                pass
 
-            if raw_line.startswith("  "):
+            elif raw_line.startswith(b"  "):
                 traceback_content.append(raw_line)
             else:
                 if reason_line is False:
@@ -49,12 +73,39 @@ class PyTracebackParser(ABCParser):
                     reason_line = True
                 else:
                     # no more traceback data
-                    mod_time = os.path.getmtime(file_path)
-                    prev_lines = lines[: line_index + 1]
-                    prev_content = "\n".join(prev_lines)
-                    lines_md5 = calculate_hash(prev_content)
-                    ret_list.append([mod_time, lines_md5, traceback_content])
+                    if mod_time is None:
+                        mod_time = os.path.getmtime(file_path)
+                    yield create_entry(traceback_content, traceback_line, context_size, mod_time)
                     reason_line = False
                     traceback_content = None
 
-        return ret_list
+            if self.lines_before > 0:
+                prev_lines.append(raw_line)
+
+        if cursor is not None:
+            # traceback can be continued by lines appended to file later
+            cursor.state = (lines_num, list(prev_lines), traceback_content, traceback_line, context_size, reason_line)
+
+
+def create_entry(traceback_content: List[bytes], traceback_line, context_size, mod_time) -> LogEntry:
+    entry_id = calculate_traceback_id(traceback_line, traceback_content[context_size:])
+    return LogEntry(
+        traceback_content,
+        line_number=traceback_line - context_size,
+        timestamp=mod_time,
+        entry_id=entry_id,
+    )
+
+
+def calculate_traceback_id(line_number, traceback_lines: List[bytes]) -> str:
+    """Calculate id of traceback based on its position and content.
+
+    Id does not depend on preceding content, so it can be calculated when parsing
+    is continued from middle of file.
+    """
+    content_hash = hashlib.md5()  # nosec
+    content_hash.update(f"{line_number}\n".encode("utf-8"))
+    for line in traceback_lines:
+        content_hash.update(line)
+        content_hash.update(b"\n")
+    return content_hash.hexdigest()
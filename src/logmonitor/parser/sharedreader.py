@@ -0,0 +1,121 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import logging
+import threading
+from typing import List, Dict, Iterator
+from collections import Counter
+
+from logmonitor.parser.logcursor import LogCursor, read_new_lines, is_same_file
+from logmonitor.parser.filereader import get_decompressor
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+# maximum size of unread data kept in memory for many parsers
+SHARED_MAX_SIZE = 8 * 1024 * 1024
+
+
+class SharedReader:
+    """Reader of log files sharing read lines between parsers of the same file.
+
+    Reader is meant to be used in single generation cycle. File read by more
+    than one parser is read once and its lines are kept until all parsers
+    registered on the file read them. Parsers with cursors in different
+    positions read the file separately. Lines are shared only if unread data
+    is smaller than 'max_size' - otherwise (also for compressed and rotated
+    files) each parser streams the file separately, so memory stays bounded.
+    Reader can be used by parsers running in many threads.
+    """
+
+    def __init__(self, logfiles: List[str] = None, max_size=SHARED_MAX_SIZE):
+        # number of parsers that will read given file
+        self.readers_num: Dict[str, int] = Counter(logfiles or [])
+        self.max_size = max_size
+        # lines read from files: (file path, cursor position) -> (lines, cursor after read)
+        self.cache = {}
+        self.lock = threading.RLock()
+
+    def read_new_lines(self, file_path, cursor: LogCursor) -> Iterator[bytes]:
+        """Read lines appended to file since previous read. Moves cursor."""
+        with self.lock:
+            return self._read_new_lines(file_path, cursor)
+
+    def _read_new_lines(self, file_path, cursor: LogCursor) -> Iterator[bytes]:
+        key = (file_path, get_position(cursor))
+        cached = self.cache.get(key)
+        if cached is None and self.readers_num.get(file_path, 0) < 2:
+            # no other parser will read the file
+            self.release(file_path)
+            return read_new_lines(file_path, cursor)
+        if cached is None:
+            unread_size = get_unread_size(file_path, cursor)
+            if unread_size is None or unread_size > self.max_size:
+                # too much data to keep in memory
+                _LOGGER.debug("streaming file %s separately", file_path)
+                self.release(file_path)
+                return read_new_lines(file_path, cursor)
+
+        if cached is None:
+            read_cursor = LogCursor()
+            read_cursor.offset = cursor.offset
+            read_cursor.identity = cursor.identity
+            try:
+                lines = list(read_new_lines(file_path, read_cursor))
+            except FileNotFoundError as exc:
+                lines = exc
+            cached = (lines, read_cursor)
+            self.cache[key] = cached
+        else:
+            _LOGGER.debug("reusing lines of file %s", file_path)
+        self.release(file_path)
+
+        lines, read_cursor = cached
+        if isinstance(lines, FileNotFoundError):
+            raise lines
+        cursor.offset = read_cursor.offset
+        cursor.identity = read_cursor.identity
+        return iter(lines)
+
+    def release(self, file_path):
+        """Mark file as read by one of parsers."""
+        with self.lock:
+            self._release(file_path)
+
+    def _release(self, file_path):
+        readers_num = self.readers_num.get(file_path, 0) - 1
+        self.readers_num[file_path] = readers_num
+        if readers_num <= 0:
+            # all parsers read the file
+            self.cache = {key: value for key, value in self.cache.items() if key[0] != file_path}
+
+
+def get_position(cursor: LogCursor):
+    identity = cursor.identity
+    if identity is None:
+        return (cursor.offset, None)
+    return (cursor.offset, identity.inode, identity.size, identity.head_size, identity.fingerprint)
+
+
+def get_unread_size(file_path, cursor: LogCursor) -> int:
+    """Return size of data appended to file since previous read.
+
+    Returns None if size is not known (compressed or rotated file).
+    """
+    try:
+        with open(file_path, "rb") as fp:
+            if get_decompressor(fp) is not None:
+                return None
+            file_size = os.fstat(fp.fileno()).st_size
+    except FileNotFoundError:
+        return 0
+    if cursor.identity is not None and not is_same_file(file_path, cursor.identity):
+        return None
+    return max(file_size - cursor.offset, 0)
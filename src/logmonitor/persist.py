@@ -109,6 +109,45 @@ def store_object_simple(inputObject, outputFile):
         pickle.dump(inputObject, fp)
 
 
+def store_object_atomic(inputObject, outputFile):
+    """Store object in file. Data is written to temporary file and then renamed, so file is never partially written."""
+    tmpFile = outputFile + "_tmp"
+    store_object_simple(inputObject, tmpFile)
+    os.replace(tmpFile, outputFile)
+
+
+def append_objects(inputObjects, outputFile, offset=0):
+    """Store objects one after another starting from given offset in file (data after offset is dropped).
+
+    Returns size of file after write.
+    """
+    outdirDir = os.path.dirname(outputFile)
+    if not os.path.exists(outdirDir):
+        os.makedirs(outdirDir, exist_ok=True)
+
+    mode = "r+b" if offset > 0 else "wb"
+    with open(outputFile, mode) as fp:
+        fp.seek(offset)
+        fp.truncate()
+        for inputObject in inputObjects:
+            pickle.dump(inputObject, fp)
+        return fp.tell()
+
+
+def load_objects(inputFile, size):
+    """Load objects stored by 'append_objects' from first 'size' bytes of file.
+
+    Raises exception if data is missing or invalid.
+    """
+    ret_list = []
+    with open(inputFile, "rb") as fp:
+        while fp.tell() < size:
+            ret_list.append(pickle.load(fp))
+        if fp.tell() != size:
+            raise pickle.UnpicklingError(f"invalid size of data in {inputFile}")
+    return ret_list
+
+
 def backup_files(inputFiles, outputArchive):
     ## create zip
     tmpZipFile = outputArchive + "_tmp"
@@ -0,0 +1,125 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import logging
+from typing import Dict, List, Set
+
+from feedgen.feed import FeedGenerator
+
+from logmonitor.rss.feedwriter import dumps_feed_items
+from logmonitor.utils import calculate_hash
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class FeedPager:
+    """Splitter of feed into subscription document and archive documents (archived feed, RFC 5005).
+
+    Subscription document (feed file) contains newest items - at least 'page_size' and less than
+    two pages. When there is enough older items, then they are moved to new archive page.
+    Archive pages always contain 'page_size' items and their items do not change, so they can
+    be cached by readers. Pages are linked by 'prev-archive', 'next-archive' and 'current' relations.
+    'next-archive' link points only to existing page, so last archive page is written again
+    when next page is created.
+    """
+
+    def __init__(self, outfile, page_size):
+        self.outfile = outfile
+        self.page_size = page_size
+        self.pages_num = 0  # number of archive pages
+        self.archived: Set[str] = set()  # hashes of items in archive pages
+        self.last_page: List[str] = None  # items of last archive page
+        # hashes of items from previous generation - fragments from items cache are reused between generations
+        self.fragment_hashes: Dict[str, str] = {}
+
+    def load(self, pager: "FeedPager"):
+        """Load state of pages from other pager (e.g. restored from state) of the same feed."""
+        if not isinstance(pager, FeedPager) or pager.outfile != self.outfile:
+            return
+        self.pages_num = pager.pages_num
+        self.archived = pager.archived
+        self.last_page = pager.last_page
+
+    def generate_pages(self, feed_gen: FeedGenerator, fragments: List[str]) -> Dict[str, str]:
+        """Generate subscription document and new archive pages.
+
+        'fragments' is list of serialized items (newest first). Returns dict with relative
+        paths and content of files - new or updated archive pages first.
+        """
+        fragment_hashes = {}
+        for fragment in fragments:
+            item_hash = self.fragment_hashes.get(fragment)
+            if item_hash is None:
+                item_hash = calculate_hash(fragment)
+            fragment_hashes[fragment] = item_hash
+        self.fragment_hashes = fragment_hashes
+        hashes = [fragment_hashes[fragment] for fragment in fragments]
+        # items no longer present (e.g. dropped because of entries limit) are forgotten
+        self.archived.intersection_update(hashes)
+        current_items = [
+            (fragment, item_hash) for fragment, item_hash in zip(fragments, hashes) if item_hash not in self.archived
+        ]
+
+        new_pages = []
+        while len(current_items) >= 2 * self.page_size:
+            # oldest items
+            split_index = len(current_items) - self.page_size
+            page_items = current_items[split_index:]
+            del current_items[split_index:]
+            new_pages.append([fragment for fragment, _ in page_items])
+            self.archived.update(item_hash for _, item_hash in page_items)
+
+        ret_dict = {}
+        if new_pages:
+            first_number = self.pages_num + 1
+            pages_list = new_pages
+            if self.pages_num > 0 and self.last_page is not None:
+                # previous page gets link to next page
+                first_number -= 1
+                pages_list = [self.last_page] + new_pages
+            for index, page_fragments in enumerate(pages_list):
+                has_next = index < len(pages_list) - 1
+                page_path, content = self._dumps_page(feed_gen, first_number + index, page_fragments, has_next)
+                ret_dict[page_path] = content
+            self.pages_num += len(new_pages)
+            self.last_page = new_pages[-1]
+
+        links = []
+        if self.pages_num > 0:
+            links.append(("prev-archive", self.get_page_href(self.pages_num)))
+        current_fragments = [fragment for fragment, _ in current_items]
+        ret_dict[self.outfile] = dumps_feed_items(feed_gen, current_fragments, links)
+        return ret_dict
+
+    def _dumps_page(self, feed_gen: FeedGenerator, page_number, fragments: List[str], has_next):
+        page_path = self.get_page_path(page_number)
+        _LOGGER.info("writing archive page %s", page_path)
+        links = [("current", os.path.basename(self.outfile))]
+        if has_next:
+            links.append(("next-archive", self.get_page_href(page_number + 1)))
+        if page_number > 1:
+            links.append(("prev-archive", self.get_page_href(page_number - 1)))
+        return page_path, dumps_feed_items(feed_gen, fragments, links, archive=True)
+
+    def __getstate__(self):
+        return (self.outfile, self.page_size, self.pages_num, self.archived, self.last_page)
+
+    def __setstate__(self, state):
+        self.outfile, self.page_size, self.pages_num, self.archived, self.last_page = state
+        self.fragment_hashes = {}
+
+    def get_page_path(self, page_number) -> str:
+        """Return path of archive page (relative, the same as path of feed file)."""
+        file_root, file_ext = os.path.splitext(self.outfile)
+        return f"{file_root}-archive-{page_number}{file_ext}"
+
+    def get_page_href(self, page_number) -> str:
+        """Return link to archive page (relative to feed file)."""
+        return os.path.basename(self.get_page_path(page_number))
@@ -0,0 +1,367 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+#
+# Streaming writer of RSS feeds.
+#
+# Writes content of 'FeedGenerator' directly to text stream, without building
+# lxml element tree of whole feed. Output is the same as output of
+# 'FeedGenerator.rss_str(pretty=False)' decoded to string. Only fields used
+# by generators are handled - feed with other fields is serialized by feedgen.
+#
+# Writer reads private attributes of feedgen objects (tested with versions
+# given in requirements). If they are not available, feedgen is used.
+#
+
+import io
+import re
+import logging
+import functools
+from typing import TextIO, List, Dict, Tuple, Callable, Any
+
+from feedgen.feed import FeedGenerator
+from feedgen.entry import FeedEntry
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+XML_HEADER = "<?xml version='1.0' encoding='UTF-8'?>\n"
+RSS_START = (
+    '<rss xmlns:atom="http://www.w3.org/2005/Atom"'
+    ' xmlns:content="http://purl.org/rss/1.0/modules/content/" version="2.0"><channel>'
+)
+# archive document of archived feed (RFC 5005)
+RSS_ARCHIVE_START = (
+    '<rss xmlns:atom="http://www.w3.org/2005/Atom"'
+    ' xmlns:content="http://purl.org/rss/1.0/modules/content/"'
+    ' xmlns:fh="http://purl.org/syndication/history/1.0" version="2.0"><channel>'
+)
+RSS_END = "</channel></rss>"
+
+# characters not allowed in XML (rejected by lxml as well)
+INVALID_CHARS_REGEX = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]")
+
+WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+# channel fields written by feedgen and not handled by writer
+UNSUPPORTED_FEED_FIELDS = (
+    "category",
+    "cloud",
+    "image",
+    "rating",
+    "skipHours",
+    "skipDays",
+    "textInput",
+)
+# item fields written by feedgen and not handled by writer
+UNSUPPORTED_ENTRY_FIELDS = ("category", "comments", "enclosure", "source")
+
+# private attributes of feedgen objects read by writer
+FEED_ATTRIBUTES = (
+    "feed_entries",
+    "extensions",
+    "atom_link",
+    "rss_title",
+    "rss_link",
+    "rss_description",
+    "rss_copyright",
+    "rss_docs",
+    "rss_generator",
+    "rss_language",
+    "rss_lastBuildDate",
+    "rss_managingEditor",
+    "rss_pubDate",
+    "rss_ttl",
+    "rss_webMaster",
+) + tuple(f"rss_{field}" for field in UNSUPPORTED_FEED_FIELDS)
+ENTRY_ATTRIBUTES = (
+    "extensions",
+    "rss_title",
+    "rss_link",
+    "rss_description",
+    "rss_content",
+    "rss_author",
+    "rss_guid",
+    "rss_pubDate",
+) + tuple(f"rss_{field}" for field in UNSUPPORTED_ENTRY_FIELDS)
+
+
+def dumps_feed_stream(feed_gen: FeedGenerator) -> str:
+    """Serialize feed to string.
+
+    If feed contains fields not handled by streaming writer, then feedgen is used.
+    """
+    if not is_feed_supported(feed_gen):
+        _LOGGER.info("feed contains fields not handled by streaming writer - using feedgen")
+        return feed_gen.rss_str(pretty=False).decode()
+    items_num = len(feed_gen._FeedGenerator__feed_entries)  # pylint: disable=W0212
+    _LOGGER.info("generating %s feed items", items_num)
+    out_buffer = io.StringIO()
+    write_feed(feed_gen, out_buffer)
+    return out_buffer.getvalue()
+
+
+@functools.lru_cache(maxsize=None)
+def is_writer_available() -> bool:
+    """Check if installed feedgen provides attributes read by streaming writer."""
+    feed_gen = FeedGenerator()
+    entry = FeedEntry()
+    missing = [name for name in FEED_ATTRIBUTES if not hasattr(feed_gen, f"_FeedGenerator__{name}")]
+    missing.extend(name for name in ENTRY_ATTRIBUTES if not hasattr(entry, f"_FeedEntry__{name}"))
+    if missing:
+        _LOGGER.warning("streaming writer not compatible with installed feedgen (missing: %s)", ", ".join(missing))
+        return False
+    return True
+
+
+def is_feed_supported(feed_gen: FeedGenerator) -> bool:
+    """Check if feed can be serialized by streaming writer."""
+    if not is_writer_available():
+        return False
+    for field in UNSUPPORTED_FEED_FIELDS:
+        if getattr(feed_gen, f"_FeedGenerator__rss_{field}"):
+            return False
+    if feed_gen._FeedGenerator__extensions:  # pylint: disable=W0212
+        return False
+    for entry in feed_gen._FeedGenerator__feed_entries:  # pylint: disable=W0212
+        for field in UNSUPPORTED_ENTRY_FIELDS:
+            if getattr(entry, f"_FeedEntry__rss_{field}"):
+                return False
+        if entry._FeedEntry__extensions:  # pylint: disable=W0212
+            return False
+    return True
+
+
+def dumps_feed_items(feed_gen: FeedGenerator, fragments: List[str], links=None, archive=False) -> str:
+    """Serialize feed with items already serialized (e.g. by 'ItemCache').
+
+    Items of 'feed_gen' are ignored. 'links' is list of additional tuples (relation, href)
+    written as 'atom:link' elements. If 'archive' is set, then feed is marked as archive document.
+    """
+    _LOGGER.info("generating %s feed items", len(fragments))
+    out_buffer = io.StringIO()
+    write_feed_items(feed_gen, fragments, out_buffer, links, archive)
+    return out_buffer.getvalue()
+
+
+def write_feed(feed_gen: FeedGenerator, out_stream: TextIO):
+    """Write RSS feed to text stream (e.g. file or 'io.StringIO').
+
+    Items are written one by one. Raises ValueError in case of missing required fields
+    or strings not allowed in XML.
+    """
+    out_stream.write(dumps_channel(feed_gen))
+    for entry in feed_gen._FeedGenerator__feed_entries:  # pylint: disable=W0212
+        out_stream.write(dumps_entry(entry))
+    out_stream.write(RSS_END)
+
+
+def write_feed_items(feed_gen: FeedGenerator, fragments: List[str], out_stream: TextIO, links=None, archive=False):
+    """Write RSS feed with given serialized items to text stream."""
+    out_stream.write(dumps_channel(feed_gen, links, archive))
+    for fragment in fragments:
+        out_stream.write(fragment)
+    out_stream.write(RSS_END)
+
+
+def dumps_channel(feed_gen: FeedGenerator, links=None, archive=False) -> str:
+    """Serialize beginning of feed (XML header and channel fields)."""
+    # pylint: disable=W0212
+    title = feed_gen._FeedGenerator__rss_title
+    link = feed_gen._FeedGenerator__rss_link
+    description = feed_gen._FeedGenerator__rss_description
+    if not (title and link and description):
+        missing = [
+            name for name, value in (("title", title), ("link", link), ("description", description)) if not value
+        ]
+        raise ValueError(f"Required fields not set ({', '.join(missing)})")
+
+    parts = [XML_HEADER, RSS_ARCHIVE_START if archive else RSS_START]
+    append_element(parts, "title", title)
+    append_element(parts, "link", link)
+    append_element(parts, "description", description)
+    for link_dict in feed_gen._FeedGenerator__atom_link or []:
+        if link_dict.get("rel") == "self":
+            attribs = [("href", link_dict["href"]), ("rel", "self")]
+            for key in ("type", "hreflang", "title", "length"):
+                if link_dict.get(key):
+                    attribs.append((key, link_dict[key]))
+            attribs_str = "".join(f' {key}="{escape_attrib(value)}"' for key, value in attribs)
+            parts.append(f"<atom:link{attribs_str}/>")
+            break
+    append_element(parts, "copyright", feed_gen._FeedGenerator__rss_copyright)
+    append_element(parts, "docs", feed_gen._FeedGenerator__rss_docs)
+    append_element(parts, "generator", feed_gen._FeedGenerator__rss_generator)
+    append_element(parts, "language", feed_gen._FeedGenerator__rss_language)
+    append_date(parts, "lastBuildDate", feed_gen._FeedGenerator__rss_lastBuildDate)
+    append_element(parts, "managingEditor", feed_gen._FeedGenerator__rss_managingEditor)
+    append_date(parts, "pubDate", feed_gen._FeedGenerator__rss_pubDate)
+    ttl = feed_gen._FeedGenerator__rss_ttl
+    if ttl:
+        append_element(parts, "ttl", str(ttl))
+    append_element(parts, "webMaster", feed_gen._FeedGenerator__rss_webMaster)
+    for rel, href in links or []:
+        parts.append(f'<atom:link href="{escape_attrib(href)}" rel="{escape_attrib(rel)}"/>')
+    if archive:
+        parts.append("<fh:archive/>")
+    return "".join(parts)
+
+
+def dumps_entry(entry: FeedEntry) -> str:
+    """Serialize feed item."""
+    # pylint: disable=W0212
+    title = entry._FeedEntry__rss_title
+    description = entry._FeedEntry__rss_description
+    content = entry._FeedEntry__rss_content
+    if not (title or description or content):
+        raise ValueError("Required fields not set")
+    parts = ["<item>"]
+    append_element(parts, "title", title)
+    append_element(parts, "link", entry._FeedEntry__rss_link)
+    if description and content:
+        append_element(parts, "description", description)
+        append_content(parts, "content:encoded", content)
+    elif description:
+        append_element(parts, "description", description)
+    elif content:
+        append_content(parts, "description", content)
+    for author in entry._FeedEntry__rss_author or []:
+        append_element(parts, "author", author)
+    guid = entry._FeedEntry__rss_guid
+    if guid.get("guid"):
+        permalink = "true" if guid.get("permalink", False) else "false"
+        parts.append(f'<guid isPermaLink="{permalink}">{escape_text(guid["guid"])}</guid>')
+    append_date(parts, "pubDate", entry._FeedEntry__rss_pubDate)
+    parts.append("</item>")
+    return "".join(parts)
+
+
+def append_element(parts, name, text):
+    if text:
+        parts.append(f"<{name}>{escape_text(text)}</{name}>")
+
+
+def append_content(parts, name, content_dict):
+    text = content_dict["content"]
+    if content_dict.get("type", "") != "CDATA":
+        append_element(parts, name, text)
+        return
+    check_text(text)
+    if "]]>" in text:
+        raise ValueError("']]>' not allowed inside CDATA")
+    parts.append(f"<{name}><![CDATA[{text}]]></{name}>")
+
+
+def append_date(parts, name, date_value):
+    if date_value:
+        parts.append(f"<{name}>{format_rfc2822(date_value)}</{name}>")
+
+
+def format_rfc2822(date_value) -> str:
+    """Format date independently of locale settings (the same as '%a, %d %b %Y %H:%M:%S %z')."""
+    weekday = WEEKDAYS[date_value.weekday()]
+    month = MONTHS[date_value.month - 1]
+    date_str = (
+        f"{weekday}, {date_value.day:02d} {month} {date_value.year:04d}"
+        f" {date_value.hour:02d}:{date_value.minute:02d}:{date_value.second:02d} "
+    )
+    offset = date_value.utcoffset()
+    if offset is None:
+        return date_str
+    if offset.days == 0 and not offset.seconds % 60 and not offset.microseconds:
+        offset_minutes = offset.seconds // 60
+        return f"{date_str}+{offset_minutes // 60:02d}{offset_minutes % 60:02d}"
+    # negative or unusual offset
+    return date_str + date_value.strftime("%z")
+
+
+def check_text(text):
+    if INVALID_CHARS_REGEX.search(text):
+        raise ValueError("All strings must be XML compatible: Unicode or ASCII, no NULL bytes or control characters")
+
+
+def escape_text(text) -> str:
+    if not isinstance(text, str):
+        text = str(text)
+    if INVALID_CHARS_REGEX.search(text):
+        check_text(text)
+    if "&" in text:
+        text = text.replace("&", "&amp;")
+    return text.replace("<", "&lt;").replace(">", "&gt;").replace("\r", "&#13;")
+
+
+def escape_attrib(value) -> str:
+    value = escape_text(value)
+    return value.replace('"', "&quot;").replace("\n", "&#10;").replace("\t", "&#9;")
+
+
+class ItemCache:
+    """Cache of serialized feed items kept between generations.
+
+    Items are identified by keys given by generator. Cache is valid only for
+    given signature (e.g. generator parameters affecting content of items).
+    """
+
+    def __init__(self, signature=None):
+        self.signature = signature
+        self.fragments: Dict[Any, str] = {}
+        self.used_fragments: Dict[Any, str] = {}  # fragments used since last commit
+        self.new_fragments: Dict[Any, str] = {}  # fragments serialized since last call of 'pop_new_fragments'
+        self.rendered_num = 0  # number of items serialized since last commit
+
+    def get_fragment(self, item_key, create_item: Callable[..., FeedEntry], *args) -> str:
+        """Return serialized item.
+
+        Item is created by 'create_item(*args)' and serialized only if it is not in cache.
+        Empty string is returned if 'create_item' returns None. Items with key None are not cached.
+        """
+        fragment = None
+        if item_key is not None:
+            fragment = self.fragments.get(item_key)
+        if fragment is None:
+            feed_item = create_item(*args)
+            fragment = dumps_entry(feed_item) if feed_item is not None else ""
+            self.rendered_num += 1
+            if item_key is not None:
+                self.new_fragments[item_key] = fragment
+        if item_key is not None:
+            self.used_fragments[item_key] = fragment
+        return fragment
+
+    def commit(self):
+        """Keep only fragments used since previous commit."""
+        _LOGGER.info("serialized items: %s cached items: %s", self.rendered_num, len(self.used_fragments))
+        self.fragments = self.used_fragments
+        self.used_fragments = {}
+        self.rendered_num = 0
+
+    def pop_new_fragments(self) -> List[Tuple[Any, str]]:
+        """Return list of (item key, fragment) serialized since previous call."""
+        ret_list = list(self.new_fragments.items())
+        self.new_fragments = {}
+        return ret_list
+
+    def load_fragments(self, fragments: List[Tuple[Any, str]]):
+        """Add fragments (e.g. restored from state). Fragments not used until next commit are dropped."""
+        self.fragments.update(fragments)
+
+    def load(self, cache: "ItemCache"):
+        """Load fragments from other cache (e.g. restored from state) if signatures are the same."""
+        if not isinstance(cache, ItemCache) or cache.signature != self.signature:
+            return
+        self.fragments = cache.fragments
+
+    def __getstate__(self):
+        return (self.signature, self.fragments)
+
+    def __setstate__(self, state):
+        self.signature, self.fragments = state
+        self.used_fragments = {}
+        self.new_fragments = {}
+        self.rendered_num = 0
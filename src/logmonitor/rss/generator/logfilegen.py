@@ -0,0 +1,212 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import logging
+import itertools
+from typing import List, Tuple, Iterator, Any
+from collections import deque
+
+from abc import abstractmethod
+from feedgen.feed import FeedGenerator
+from feedgen.entry import FeedEntry
+
+from logmonitor.rss.generator.rssgenerator import RSSGenerator
+from logmonitor.rss.utils import init_feed_gen
+from logmonitor.rss.feedwriter import ItemCache
+from logmonitor.parser.abcparser import ABCParser
+from logmonitor.parser.logcursor import LogCursor
+from logmonitor.parser.logentry import LogEntry
+
+
+_LOGGER = logging.getLogger(__name__)
+
+# types of records of generator state: (type, data)
+RECORD_ENTRY = "entry"  # parsed entry
+RECORD_ITEM = "item"  # serialized item: (item key, fragment)
+
+
+#
+class LogFileGenerator(RSSGenerator):
+    """Base class of generators of feed from entries of single log file.
+
+    Entries parsed in previous generations are kept with cursor of parser,
+    so only data appended to log file is parsed.
+    """
+
+    def __init__(self, name, outfile, logfile, parser: ABCParser, maxentries=None, item_signature=None):
+        super().__init__(outfile)
+        self.parser = parser
+        self.name = name
+        self.logfile = logfile
+
+        # allows to parse only data appended to log file since previous generation
+        self.cursor = LogCursor()
+        # entries parsed in previous generations - only newest entries are kept if limit is set
+        self.max_entries = maxentries
+        self.log_entries = deque(maxlen=maxentries)
+        self.new_entries_num = 0  # number of entries added since previous call of 'get_new_records'
+        # serialized items of entries
+        self.item_cache = ItemCache(signature=item_signature)
+        self.reader = None
+
+    def get_name(self) -> str:
+        return self.name
+
+    def get_logfiles(self) -> List[str]:
+        return [self.logfile]
+
+    def set_reader(self, reader):
+        self.reader = reader
+
+    def get_state(self):
+        # entries and serialized items are stored as records
+        return {
+            "logfile": self.logfile,
+            "cursor": self.cursor,
+            "pages": self.feed_pager,
+            "item_signature": self.item_cache.signature,
+        }
+
+    def set_state(self, state):
+        if not self._is_valid_state(state):
+            return
+        self.cursor = state["cursor"]
+        # state of previous version contains entries and items
+        self.log_entries = deque(state.get("entries", []), maxlen=self.max_entries)
+        self.new_entries_num = 0
+        self.item_cache.load(state.get("items"))
+        self.load_pager(state.get("pages"))
+        self._load_state(state)
+
+    def get_records(self) -> List[Tuple[str, Any]]:
+        records = [(RECORD_ENTRY, entry) for entry in self.log_entries]
+        records.extend((RECORD_ITEM, item) for item in self.item_cache.fragments.items())
+        return records
+
+    def get_new_records(self) -> List[Tuple[str, Any]]:
+        entries_num = min(self.new_entries_num, len(self.log_entries))
+        self.new_entries_num = 0
+        new_entries = itertools.islice(self.log_entries, len(self.log_entries) - entries_num, None)
+        records = [(RECORD_ENTRY, entry) for entry in new_entries]
+        records.extend((RECORD_ITEM, item) for item in self.item_cache.pop_new_fragments())
+        return records
+
+    def load_records(self, state, records: List[Tuple[str, Any]]):
+        if not self._is_valid_state(state):
+            return
+        entries = [data for record_type, data in records if record_type == RECORD_ENTRY]
+        # oldest entries are dropped if limit is exceeded
+        self.log_entries.extend(entries)
+        if state.get("item_signature") == self.item_cache.signature:
+            items = [data for record_type, data in records if record_type == RECORD_ITEM]
+            self.item_cache.load_fragments(items)
+
+    def _is_valid_state(self, state) -> bool:
+        if not state:
+            return False
+        if state.get("logfile") != self.logfile:
+            _LOGGER.info("generator %s state of different log file - ignoring", self.outfile)
+            return False
+        return True
+
+    def generate_feed(self) -> FeedGenerator:
+        feed_items = self.generate_feed_entries()
+        if feed_items is None:
+            return None
+
+        feed_gen = self._create_feed_gen()
+        for feed_item in feed_items:
+            feed_gen.add_entry(feed_item, order="append")
+
+        return feed_gen
+
+    def generate_feed_entries(self) -> Iterator[FeedEntry]:
+        if not self._read_new_entries():
+            return None
+        # entries are kept in order of occurrence
+        entries_list = self._get_feed_entries()
+        return self._iterate_feed_items(reversed(entries_list))
+
+    def generate_feed_items(self) -> Tuple[FeedGenerator, List[str]]:
+        if not self._read_new_entries():
+            return None
+
+        fragments = []
+        for item_key, entry, group in self._get_feed_entries():
+            fragment = self.item_cache.get_fragment(item_key, self._create_feed_item, entry, group)
+            if fragment:
+                fragments.append(fragment)
+        self.item_cache.commit()
+        # newest first
+        fragments.reverse()
+
+        return self._create_feed_gen(), fragments
+
+    def _iterate_feed_items(self, entries_list) -> Iterator[FeedEntry]:
+        for _, entry, group in entries_list:
+            feed_item = self._create_feed_item(entry, group)
+            if feed_item is not None:
+                yield feed_item
+
+    def _read_new_entries(self) -> bool:
+        entries_num = 0
+        try:
+            for entry in self._parse_new_entries():
+                self._add_entry(entry)
+                entries_num += 1
+        except FileNotFoundError:
+            _LOGGER.info("generator %s file %s does not exist", self.outfile, self.logfile)
+            return False
+
+        _LOGGER.info("found %s new entries", entries_num)
+        return True
+
+    # override if needed
+    def _parse_new_entries(self) -> Iterator[LogEntry]:
+        """Parse data appended to log file. Raises FileNotFoundError if file does not exist."""
+        return self.parser.parse_file_stream(self.logfile, self.cursor, reader=self.reader)
+
+    # override if needed
+    def _add_entry(self, entry: LogEntry):
+        # oldest entries are dropped if limit is exceeded
+        self.log_entries.append(entry)
+        self.new_entries_num += 1
+
+    # override if needed
+    def _load_state(self, state):
+        """Restore generator specific part of state."""
+
+    # override if needed
+    def _get_feed_entries(self) -> List[Tuple[Any, LogEntry, Any]]:
+        """Return list of tuples: (item key, entry, group of entry) from oldest to newest.
+
+        Item key identifies serialized item in cache. Pending entry can change, so it has no key.
+        """
+        entries_list = [(self._get_item_key(entry), entry, None) for entry in self.log_entries]
+        entries_list.extend((None, entry, None) for entry in self.parser.get_pending(self.cursor))
+        if self.max_entries is not None:
+            # pending entry is the newest one
+            start_index = max(len(entries_list) - self.max_entries, 0)
+            entries_list = entries_list[start_index:]
+        return entries_list
+
+    def _create_feed_gen(self) -> FeedGenerator:
+        feed_gen = init_feed_gen("http://not.set")  # have to be semantically valid
+        feed_gen.title(self.outfile)
+        feed_gen.description(self.outfile)
+        return feed_gen
+
+    @abstractmethod
+    def _get_item_key(self, entry: LogEntry):
+        """Return key of serialized item of entry."""
+        raise NotImplementedError("method not implemented")
+
+    @abstractmethod
+    def _create_feed_item(self, data_entry: LogEntry, group=None) -> FeedEntry:
+        """Create feed item of entry (or group of entries). Returns None if entry is not presented."""
+        raise NotImplementedError("method not implemented")
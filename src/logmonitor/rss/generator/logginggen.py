@@ -7,69 +7,107 @@
 #
 
 import logging
+from typing import List, Tuple, Iterator, Any
 
-from feedgen.feed import FeedGenerator
+from feedgen.entry import FeedEntry
 
-from logmonitor.rss.generator.rssgenerator import RSSGenerator
-from logmonitor.parser.loggingparser import LoggingParser
-from logmonitor.rss.utils import init_feed_gen
-from logmonitor.utils import calculate_hash, string_iso_to_date
+from logmonitor.rss.generator.logfilegen import LogFileGenerator
+from logmonitor.parser.loggingparser import LoggingParser, get_log_priority
+from logmonitor.parser.parallelparser import parse_file_parallel
+from logmonitor.parser.logentry import LogEntry
+from logmonitor.parser.entrygroup import EntryAggregator, EntryGroup
+from logmonitor.utils import calculate_hash
 
 
 _LOGGER = logging.getLogger(__name__)
 
 
-class LoggingGenerator(RSSGenerator):
-    def __init__(self, name=None, outfile=None, logfile=None, loglevel=None, **kwargs):
-        super().__init__(outfile)
-        self.parser = LoggingParser(**kwargs)
-        self.name = name
-        self.logfile = logfile
+class LoggingGenerator(LogFileGenerator):
+    def __init__(
+        self, name=None, outfile=None, logfile=None, loglevel=None, maxentries=None, aggregate=False, **kwargs
+    ):
+        parser = LoggingParser(loglevel=loglevel, **kwargs)
+        super().__init__(name, outfile, logfile, parser, maxentries=maxentries, item_signature=(name, loglevel))
         self.loglevelthreshhold = loglevel
 
-    def get_name(self) -> str:
-        return self.name
-
-    def generate_feed(self) -> FeedGenerator:
-        log_list = self.parser.parse_file(self.logfile)
-        if log_list is None:
-            _LOGGER.info("generator %s file %s does not exist", self.outfile, self.logfile)
-            return {self.outfile: None}
-
-        feed_gen = init_feed_gen("http://not.set")  # have to be semantically valid
-        feed_gen.title(self.outfile)
-        feed_gen.description(self.outfile)
-
-        _LOGGER.info("found %s entries", len(log_list))
-        for entry in log_list:
-            self._add_log_entry(feed_gen, entry)
-
-        return feed_gen
-
-    def _add_log_entry(self, feed_gen, data_entry):
-        raw_log_entry = data_entry[0]
-        data_dict = data_entry[1]
-
-        levelname = data_dict["levelname"]
-        if not self._check_loglevel(levelname):
-            return
-
-        filename = data_dict["filename"]
-        log_datetime_data = data_dict["asctime"]
-        log_datetime = get_log_date(log_datetime_data)
-
-        feed_item = feed_gen.add_entry()
+        # repeated entries are aggregated into one item if enabled
+        self.aggregator = None
+        if aggregate:
+            self.aggregator = EntryAggregator(maxentries)
+
+    def get_state(self):
+        state = super().get_state()
+        if self.aggregator is not None:
+            state["groups"] = self.aggregator.groups
+        return state
+
+    def _load_state(self, state):
+        if self.aggregator is not None:
+            self.aggregator.set_groups(state.get("groups", {}))
+
+    def _parse_new_entries(self) -> Iterator[LogEntry]:
+        # big file is parsed in parallel on first generation
+        return parse_file_parallel(self.parser, self.logfile, self.cursor, reader=self.reader)
+
+    def _add_entry(self, entry: LogEntry):
+        if self.aggregator is not None:
+            self.aggregator.add(entry)
+        else:
+            super()._add_entry(entry)
+
+    def _get_feed_entries(self) -> List[Tuple[Any, LogEntry, EntryGroup]]:
+        if self.aggregator is None:
+            return super()._get_feed_entries()
+        pending_list = self.parser.get_pending(self.cursor)
+        return [
+            ((group.fingerprint, group.count, group.last_seen), group.entry, group)
+            for group in self.aggregator.get_groups(pending_list)
+        ]
+
+    def _get_item_key(self, entry: LogEntry):
+        if entry.entry_id is None:
+            # calculated once - stored with entry
+            entry.entry_id = calculate_hash(entry.text)
+        return entry.entry_id
+
+    def _create_feed_item(self, data_entry: LogEntry, group: EntryGroup = None) -> FeedEntry:
+        if not self._check_loglevel(data_entry.level):
+            return None
+
+        raw_log_entry = data_entry.text
+        data_dict = data_entry.fields
+        # fields are missing if entry does not match format
+        levelname = data_dict.get("levelname", "UNKNOWN")
+
+        filename = data_dict.get("filename", "")
+        log_datetime = data_entry.timestamp
+
+        feed_item = FeedEntry()
 
         # calculating hash from data dict is "fragile"
         # log_hash = calculate_dict_hash(data_dict)
-        log_hash = calculate_hash(raw_log_entry)
+        log_hash = data_entry.entry_id
+        if log_hash is None:
+            log_hash = calculate_hash(raw_log_entry)
+        title = f"{self.name}: {levelname} - {filename}"
+        summary = ""
+        if group is not None:
+            # one item for all occurrences
+            log_hash = group.fingerprint
+            title = f"{title} ({group.count}x)"
+            summary = f"""
+<div>
+occurrences: {group.count}<br/>
+first seen: {group.first_seen}<br/>
+last seen: {group.last_seen}
+</div>"""
         feed_item.id(log_hash)
 
-        feed_item.title(f"{self.name}: {levelname} - {filename}")
+        feed_item.title(title)
         feed_item.author({"name": self.name, "email": self.name})
 
         # fill description
-        content = f"""
+        content = f"""{summary}
 <div>
 <pre>
 {raw_log_entry}
@@ -82,22 +120,11 @@ class LoggingGenerator(RSSGenerator):
         feed_item.pubDate(log_datetime)
         # feed_item.link(href=desc_url, rel="alternate")
         # feed_item.link( href=desc_url, rel='via')        # does not work in thunderbird
+        return feed_item
 
-    def _check_loglevel(self, entry_level) -> bool:
-        curr_priority = get_log_priority(entry_level)
+    def _check_loglevel(self, entry_priority) -> bool:
+        if entry_priority is None:
+            # unknown level
+            return True
         threshold_priority = get_log_priority(self.loglevelthreshhold)
-        return curr_priority >= threshold_priority
-
-
-def get_log_date(date_dict):
-    datetime_string = (
-        f"{date_dict['Y']}-{date_dict['m']}-{date_dict['d']} {date_dict['H']}:{date_dict['M']}:{date_dict['S']}"
-    )
-    return string_iso_to_date(datetime_string)
-
-
-LEVEL_MAPPING = {None: 0, "DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40, "CRITICAL": 50}
-
-
-def get_log_priority(level_name):
-    return LEVEL_MAPPING[level_name]
+        return entry_priority >= threshold_priority
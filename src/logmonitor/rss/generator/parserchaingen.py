@@ -6,12 +6,17 @@
 # LICENSE file in the root directory of this source tree.
 #
 
+import os
 import logging
+import heapq
+from typing import List
+from concurrent.futures import ThreadPoolExecutor
 
 from feedgen.feed import FeedGenerator
+from feedgen.entry import FeedEntry
 
 from logmonitor.parser.pytracebackparser import PyTracebackParser
-from logmonitor.rss.generator.rssgenerator import RSSGenerator
+from logmonitor.rss.generator.rssgenerator import RSSGenerator, get_item_date
 from logmonitor.rss.utils import init_feed_gen
 
 
@@ -19,13 +24,15 @@ _LOGGER = logging.getLogger(__name__)
 
 
 class ParserChainGenerator(RSSGenerator):
-    def __init__(self, name=None, outfile=None, chain=None):
+    def __init__(self, name=None, outfile=None, chain=None, workers=None):
         # prevents cyclic import error
         from logmonitor.rss.generatorspawn import spawn_generator_from_cfg
 
         super().__init__(outfile)
         self.parser = PyTracebackParser()
         self.name = name
+        # maximum number of child generators run concurrently
+        self.workers = workers
 
         self.generators = []
         for parser_conf in chain:
@@ -36,16 +43,91 @@ class ParserChainGenerator(RSSGenerator):
     def get_name(self) -> str:
         return self.name
 
+    def get_state(self):
+        children_state = [gen_state[1].get_state() for gen_state in self.generators]
+        return {"children": children_state, "pages": self.feed_pager}
+
+    def set_state(self, state):
+        children_state = self._get_children_state(state)
+        if children_state is None:
+            return
+        for gen_state, child_state in zip(self.generators, children_state):
+            gen_state[1].set_state(child_state)
+        if isinstance(state, dict):
+            self.load_pager(state.get("pages"))
+
+    def get_records(self):
+        # record is tuple: (index of child generator, child record)
+        ret_list = []
+        for index, gen_state in enumerate(self.generators):
+            ret_list.extend((index, record) for record in gen_state[1].get_records())
+        return ret_list
+
+    def get_new_records(self):
+        ret_list = []
+        for index, gen_state in enumerate(self.generators):
+            ret_list.extend((index, record) for record in gen_state[1].get_new_records())
+        return ret_list
+
+    def load_records(self, state, records):
+        children_state = self._get_children_state(state)
+        if children_state is None:
+            return
+        children_records = [[] for _ in self.generators]
+        for index, record in records:
+            children_records[index].append(record)
+        for gen_state, child_state, child_records in zip(self.generators, children_state, children_records):
+            gen_state[1].load_records(child_state, child_records)
+
+    def _get_children_state(self, state):
+        if not state:
+            return None
+        if isinstance(state, list):
+            # state of previous version
+            state = {"children": state}
+        children_state = state.get("children", [])
+        if len(children_state) != len(self.generators):
+            return None
+        return children_state
+
+    def get_logfiles(self) -> List[str]:
+        ret_list = []
+        for gen_state in self.generators:
+            ret_list.extend(gen_state[1].get_logfiles())
+        return ret_list
+
+    def set_reader(self, reader):
+        for gen_state in self.generators:
+            gen_state[1].set_reader(reader)
+
     def generate_feed(self) -> FeedGenerator:
         feed_gen = init_feed_gen("http://not.set")  # have to be semantically valid
         feed_gen.title(self.outfile)
         feed_gen.description(self.outfile)
 
-        for gen_state in self.generators:
-            gen = gen_state[1]
-            data = gen.generate_feed()
-            entries = data.entry()
-            for item in entries:
-                feed_gen.add_entry(item)
+        children = [gen_state[1] for gen_state in self.generators]
+        streams = self._run_children(children)
+        # children give items from newest to oldest - merged by publish date
+        for feed_item in heapq.merge(*streams, key=get_item_date, reverse=True):
+            feed_gen.add_entry(feed_item, order="append")
 
         return feed_gen
+
+    def _run_children(self, children: List[RSSGenerator]) -> List[List[FeedEntry]]:
+        workers = os.cpu_count() or 1
+        if self.workers is not None:
+            workers = min(workers, self.workers)
+        workers = min(workers, len(children))
+        if workers < 2:
+            return [generate_entries(child) for child in children]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(generate_entries, children))
+
+
+def generate_entries(generator: RSSGenerator) -> List[FeedEntry]:
+    """Run generator and return items of its feed from newest to oldest."""
+    feed_items = generator.generate_feed_entries()
+    if feed_items is None:
+        # no data (e.g. log file does not exist)
+        return []
+    return list(feed_items)
@@ -9,58 +9,38 @@
 import logging
 import datetime
 
-from feedgen.feed import FeedGenerator
+from feedgen.entry import FeedEntry
 
-from logmonitor.rss.generator.rssgenerator import RSSGenerator
-from logmonitor.rss.utils import init_feed_gen
+from logmonitor.rss.generator.logfilegen import LogFileGenerator
 from logmonitor.utils import add_timezone
 from logmonitor.parser.pytracebackparser import PyTracebackParser
+from logmonitor.parser.logentry import LogEntry
 
 
 _LOGGER = logging.getLogger(__name__)
 
 
-class PyTracebackGenerator(RSSGenerator):
-    def __init__(self, name=None, outfile=None, logfile=None, **kwargs):
-        super().__init__(outfile)
-        self.parser = PyTracebackParser(**kwargs)
-        self.name = name
-        self.logfile = logfile
+class PyTracebackGenerator(LogFileGenerator):
+    def __init__(self, name=None, outfile=None, logfile=None, maxentries=None, **kwargs):
+        parser = PyTracebackParser(**kwargs)
+        super().__init__(name, outfile, logfile, parser, maxentries=maxentries, item_signature=(name,))
 
-    def get_name(self) -> str:
-        return self.name
+    def _get_item_key(self, entry: LogEntry):
+        # the same traceback can occur many times
+        return (entry.entry_id, entry.line_number, entry.timestamp)
 
-    def generate_feed(self) -> FeedGenerator:
-        log_list = self.parser.parse_file(self.logfile)
-        if log_list is None:
-            _LOGGER.info("generator %s file %s does not exist", self.outfile, self.logfile)
-            return {self.outfile: None}
+    def _create_feed_item(self, data_entry: LogEntry, group=None) -> FeedEntry:  # pylint: disable=W0613
+        exception = data_entry.lines[-1]
 
-        feed_gen = init_feed_gen("http://not.set")  # have to be semantically valid
-        feed_gen.title(self.outfile)
-        feed_gen.description(self.outfile)
-
-        _LOGGER.info("found %s entries", len(log_list))
-        for entry in log_list:
-            self._add_log_entry(feed_gen, entry)
-
-        return feed_gen
-
-    def _add_log_entry(self, feed_gen, data_entry):
-        mod_time = data_entry[0]
-        log_hash = data_entry[1]
-        msg_list = data_entry[2]
-        exception = msg_list[-1]
-
-        datestamp = datetime.datetime.fromtimestamp(mod_time)
+        datestamp = datetime.datetime.fromtimestamp(data_entry.timestamp)
         log_datetime = add_timezone(datestamp)
 
-        feed_item = feed_gen.add_entry()
-        feed_item.id(log_hash)
+        feed_item = FeedEntry()
+        feed_item.id(data_entry.entry_id)
         feed_item.title(f"{self.name}: {exception}")
         feed_item.author({"name": self.name, "email": self.name})
 
-        raw_log_entry = "\n".join(msg_list)
+        raw_log_entry = data_entry.text
 
         # fill description
         content = f"""
@@ -76,3 +56,4 @@ class PyTracebackGenerator(RSSGenerator):
         feed_item.pubDate(log_datetime)
         # feed_item.link(href=desc_url, rel="alternate")
         # feed_item.link( href=desc_url, rel='via')        # does not work in thunderbird
+        return feed_item
@@ -7,21 +7,33 @@
 #
 
 import logging
-from typing import Dict
+from typing import Dict, List, Tuple, Iterator, Any
 
 from abc import ABC, abstractmethod
 from feedgen.feed import FeedGenerator
+from feedgen.entry import FeedEntry
 from logmonitor.rss.utils import dumps_feed_gen
+from logmonitor.rss.feedwriter import ItemCache, dumps_feed_stream, dumps_feed_items, dumps_entry, is_writer_available
+from logmonitor.rss.feedpager import FeedPager
 
 
 _LOGGER = logging.getLogger(__name__)
 
 
+# serializers of feeds: "stream" - streaming writer, "feedgen" - feedgen (pretty printed)
+FEED_WRITERS = ("stream", "feedgen")
+
+
 #
 class RSSGenerator(ABC):
 
     def __init__(self, outfile):
         self.outfile = outfile
+        self.feed_writer = "stream"
+        # serialized items kept between generations - used by generators implementing 'generate_feed_items'
+        self.item_cache: ItemCache = None
+        # splits feed into pages - set by 'set_page_size'
+        self.feed_pager: FeedPager = None
 
     @abstractmethod
     def get_name(self) -> str:
@@ -34,17 +46,122 @@ class RSSGenerator(ABC):
         Returned dict keys are relative paths to files where content from value will be stored to.
         Returns None if there was problem with generator.
         """
+        # if streaming writer is not available, then feed is serialized by feedgen
+        stream_writer = self.feed_writer == "stream" and is_writer_available()
+        if stream_writer and self.has_feed_items():
+            # only new items are serialized
+            feed_data = self.generate_feed_items()
+            if feed_data is None:
+                # problem with generator (e.g. log file does not exist)
+                return None
+            feed, fragments = feed_data
+            if self.feed_pager is not None:
+                return self.feed_pager.generate_pages(feed, fragments)
+            content = dumps_feed_items(feed, fragments)
+            return {self.outfile: content}
+
         feed = self.generate_feed()
         if feed is None:
             return None
-        content = dumps_feed_gen(feed)
+        if self.feed_writer == "feedgen":
+            content = dumps_feed_gen(feed)
+        elif self.feed_pager is not None and stream_writer:
+            fragments = [dumps_entry(feed_item) for feed_item in feed.entry()]
+            return self.feed_pager.generate_pages(feed, fragments)
+        else:
+            content = dumps_feed_stream(feed)
         return {self.outfile: content}
 
+    def set_feed_writer(self, feed_writer):
+        """Set serializer of feed used in 'generate' (one of 'FEED_WRITERS')."""
+        if feed_writer not in FEED_WRITERS:
+            raise ValueError(f"unknown feed writer: {feed_writer}")
+        self.feed_writer = feed_writer
+
+    def set_page_size(self, page_size):
+        """Enable splitting feed into archive pages of given size (only with streaming writer)."""
+        if page_size < 1:
+            raise ValueError(f"invalid page size: {page_size}")
+        self.feed_pager = FeedPager(self.outfile, page_size)
+
+    def load_pager(self, pager: FeedPager):
+        """Restore state of pages (part of generator state)."""
+        if self.feed_pager is not None:
+            self.feed_pager.load(pager)
+
     @abstractmethod
     def generate_feed(self) -> FeedGenerator:
-        """Grab data and generate RSS feed object."""
+        """Grab data and generate RSS feed object. Returns None if there is no data (e.g. log file does not exist)."""
+        raise NotImplementedError("method not implemented")
+
+    # override if needed
+    def generate_feed_entries(self) -> Iterator[FeedEntry]:
+        """Grab data and return iterator over feed items from newest to oldest.
+
+        Returns None if there is no data (e.g. log file does not exist).
+        """
+        feed = self.generate_feed()
+        if not isinstance(feed, FeedGenerator):
+            return None
+        return iter(sorted(feed.entry(), key=get_item_date, reverse=True))
+
+    # override if needed
+    def generate_feed_items(self) -> Tuple[FeedGenerator, List[str]]:
+        """Grab data and generate RSS feed object without items and list of serialized items (newest first).
+
+        Items can be serialized using 'item_cache'. Returns None if there is no data (e.g. log file does not exist).
+        Used by 'generate' only if overridden.
+        """
         raise NotImplementedError("method not implemented")
 
+    def has_feed_items(self) -> bool:
+        """Check if generator implements 'generate_feed_items'."""
+        return type(self).generate_feed_items is not RSSGenerator.generate_feed_items
+
+    # override if needed
+    def get_state(self):
+        """Return generator state that should be preserved between application runs."""
+        return None
+
+    # override if needed
+    def set_state(self, state):
+        """Restore generator state returned by 'get_state'."""
+
+    # override if needed
+    def get_records(self) -> List[Any]:
+        """Return records of generator state (e.g. parsed entries).
+
+        Records are part of state, but they are not returned by 'get_state', because they are stored
+        incrementally - only records added since previous call of 'get_new_records' are appended.
+        """
+        return []
+
+    # override if needed
+    def get_new_records(self) -> List[Any]:
+        """Return records added since previous call."""
+        return []
+
+    # override if needed
+    def load_records(self, state, records: List[Any]):
+        """Restore records stored with given state (called after 'set_state')."""
+
+    # override if needed
+    def get_logfiles(self) -> List[str]:
+        """Return list of log files read by generator."""
+        return []
+
+    # override if needed
+    def set_reader(self, reader):
+        """Set reader of log files (e.g. 'SharedReader') used in next generation."""
+
     # override if needed
     def close(self):
         """Request close on any open resources."""
+
+
+def get_item_date(feed_item: FeedEntry):
+    """Return key ordering feed items by publish date. Items without date are the oldest."""
+    pub_date = feed_item.pubDate()
+    if pub_date is None:
+        return (0,)
+    return (1, pub_date)
@@ -8,18 +8,25 @@
 
 import os
 import logging
-from typing import Dict, List
+from typing import Dict, List, Set
 from enum import Enum, auto, unique
 import threading
 
 from logmonitor.utils import save_recent_date, get_recent_date, write_data
+from logmonitor.persist import load_object_simple, store_object_atomic, append_objects, load_objects
+from logmonitor.filewatcher import FileWatcher, create_watcher, get_file_signature
 from logmonitor.configfileyaml import ConfigField
+from logmonitor.parser.sharedreader import SharedReader
 from logmonitor.rss.generator.rssgenerator import RSSGenerator
+from logmonitor.rss.utils import calculate_feed_hash
 from logmonitor.rss.generatorspawn import spawn_generator_from_cfg
 
 
 _LOGGER = logging.getLogger(__name__)
 
+# journal of generator records is compacted if it grows above twice the records and the limit
+JOURNAL_MIN_RECORDS = 1000
+
 
 # =========================================================================
 
@@ -33,6 +40,11 @@ class RSSManager:
             self.generator: RSSGenerator = generator
             self.type = gentype
             self.valid = True  # answers question: is problem with generator?
+            self.input_signature = None  # signature of log files read in last successful generation
+            self.output_digests: Dict[str, str] = {}  # feed path -> hash of feed content
+            # stored records: (index of journal file, size of data, number of records, number of compacted records)
+            self.journal = None
+            self.compact_journal = True  # answers question: should journal be rewritten in next store?
 
     # =================================
 
@@ -59,22 +71,65 @@ class RSSManager:
         # everything ok
         return True
 
+    def get_logfiles(self) -> List[str]:
+        """Return list of log files read by generators."""
+        if self._generators is None:
+            self._initialize_generators()
+        logfiles = []
+        for gen_state in self._generators:
+            for logfile in gen_state.generator.get_logfiles():
+                if logfile and logfile not in logfiles:
+                    logfiles.append(logfile)
+        return logfiles
+
     # returns 'True' if everything is OK, otherwise 'False'
-    def generate_data(self):
+    def generate_data(self, changed_files: Set[str] = None):
+        """Run generators.
+
+        If set of changed files is given, then only generators reading the files are run.
+        """
         if self._generators is None:
             self._initialize_generators()
         if not self._generators:
             _LOGGER.warning("generators not initialized")
             return
 
+        generators = self._generators
+        if changed_files is not None:
+            generators = [
+                gen_state for gen_state in generators if changed_files.intersection(gen_state.generator.get_logfiles())
+            ]
+            _LOGGER.info("files changed: %s affected generators: %s", sorted(changed_files), len(generators))
+            if not generators:
+                return
+
         _LOGGER.info("========== generating RSS data ==========")
         recent_datetime = get_recent_date()
 
-        for gen_state in self._generators:
+        # generators with not changed log files are skipped
+        signatures = {}
+        for gen_state in generators:
+            input_signature = get_input_signature(gen_state.generator)
+            if gen_state.valid and input_signature is not None and input_signature == gen_state.input_signature:
+                _LOGGER.info("log files of generator %s not changed - skipping", gen_state.generator.get_name())
+                continue
+            signatures[id(gen_state)] = input_signature
+        generators = [gen_state for gen_state in generators if id(gen_state) in signatures]
+
+        # log files read by many generators are read once
+        logfiles = []
+        for gen_state in generators:
+            logfiles.extend(gen_state.generator.get_logfiles())
+        reader = SharedReader(logfiles)
+        for gen_state in generators:
+            gen_state.generator.set_reader(reader)
+
+        for gen_state in generators:
             gen_type = gen_state.type
             gen = gen_state.generator
             gen_name = gen.get_name()
             _LOGGER.info("----- running generator %s -----", gen_name)
+            gen_state.input_signature = None
             try:
                 gen_data: Dict[str, str] = gen.generate()
             except Exception:  # pylint: disable=W0703
@@ -87,7 +142,9 @@ class RSSManager:
                 gen_state.valid = False
             else:
                 gen_state.valid = True
-            self._write_data(gen_type, gen_data)
+                gen_state.input_signature = signatures[id(gen_state)]
+            self._write_data(gen_state, gen_data)
+            self._store_gen_state(gen_state)
 
         save_recent_date(recent_datetime)
         _LOGGER.info("========== generation ended ==========")
@@ -106,15 +163,104 @@ class RSSManager:
             _LOGGER.warning("could not get generators configuration")
             return
 
+        general_section = self._params.get(ConfigField.GENERAL.value, {})
+        feed_writer = general_section.get(ConfigField.FEEDWRITER.value)
+        page_size = general_section.get(ConfigField.PAGESIZE.value)
+
         for gen_params in gen_items:
             gen_state = spawn_generator_from_cfg(gen_params)
             if gen_state is not None:
                 state = RSSManager.State(*gen_state)
+                if feed_writer:
+                    try:
+                        state.generator.set_feed_writer(feed_writer)
+                    except ValueError:
+                        _LOGGER.warning("invalid feed writer '%s' - using default", feed_writer)
+                if page_size:
+                    try:
+                        state.generator.set_page_size(page_size)
+                    except ValueError:
+                        _LOGGER.warning("invalid page size '%s' - feed not paged", page_size)
+                self._load_gen_state(state)
                 self._generators.append(state)
 
         _LOGGER.info("generators initialized: %s", len(self._generators))
 
-    def _write_data(self, generator_type, generator_data: Dict[str, str]):
+    def _get_state_path(self, generator: RSSGenerator):
+        state_dir = self._params.get(ConfigField.GENERAL.value, {}).get(ConfigField.STATEDIR.value)
+        if not state_dir or not generator.outfile:
+            return None
+        return os.path.join(state_dir, f"{generator.outfile}.obj")
+
+    def _load_gen_state(self, gen_state: "RSSManager.State"):
+        generator = gen_state.generator
+        state_path = self._get_state_path(generator)
+        if state_path is None:
+            return
+        try:
+            stored_data = load_object_simple(state_path, silent=True)
+            if stored_data is None:
+                return
+            journal = None
+            records = []
+            if isinstance(stored_data, dict) and "journal" in stored_data:
+                state = stored_data.get("generator")
+                journal = stored_data["journal"]
+                records = load_journal(state_path, journal)
+            else:
+                # state of previous version - records are part of state
+                state = stored_data
+        except Exception:  # pylint: disable=W0703
+            _LOGGER.warning(
+                "unable to load generator state from %s - starting from empty state", state_path, exc_info=True
+            )
+            return
+        _LOGGER.info("restoring generator state from: %s", state_path)
+        generator.set_state(state)
+        generator.load_records(state, records)
+        gen_state.journal = journal
+        # records not matching restored state are dropped by rewriting journal
+        gen_state.compact_journal = True
+
+    def _store_gen_state(self, gen_state: "RSSManager.State"):
+        """Store generator state. Only records added since previous store are written."""
+        generator = gen_state.generator
+        state_path = self._get_state_path(generator)
+        if state_path is None:
+            return
+        state = generator.get_state()
+        if state is None:
+            return
+
+        journal = gen_state.journal
+        new_records = generator.get_new_records()
+        if journal is not None and not gen_state.compact_journal:
+            index, size, records_num, compacted_num = journal
+            if records_num + len(new_records) > 2 * compacted_num + JOURNAL_MIN_RECORDS:
+                gen_state.compact_journal = True
+            elif new_records:
+                # data after committed size (e.g. left by interrupted write) is overwritten
+                size = append_objects(new_records, get_journal_path(state_path, index), offset=size)
+                journal = (index, size, records_num + len(new_records), compacted_num)
+
+        if journal is None or gen_state.compact_journal:
+            # all records are written to other file, so committed journal is valid until state is replaced
+            index = 0 if journal is None else 1 - journal[0]
+            records = generator.get_records()
+            size = append_objects(records, get_journal_path(state_path, index))
+            journal = (index, size, len(records), len(records))
+
+        # state and journal size are committed at once
+        store_object_atomic({"generator": state, "journal": journal}, state_path)
+
+        if gen_state.compact_journal:
+            prev_path = get_journal_path(state_path, 1 - journal[0])
+            if os.path.exists(prev_path):
+                os.remove(prev_path)
+            gen_state.compact_journal = False
+        gen_state.journal = journal
+
+    def _write_data(self, gen_state: "RSSManager.State", generator_data: Dict[str, str]):
         if not generator_data:
             return
         data_root_dir = self._params.get(ConfigField.GENERAL.value, {}).get(ConfigField.DATAROOT.value)
@@ -122,10 +268,50 @@ class RSSManager:
             if content is None:
                 continue
             feed_path = os.path.join(data_root_dir, rss_out)
+            # not changed feed is not written to keep file modification time
+            content_hash = calculate_feed_hash(content)
+            prev_hash = gen_state.output_digests.get(feed_path)
+            if prev_hash is None:
+                prev_hash = read_feed_hash(feed_path)
+            if content_hash == prev_hash:
+                _LOGGER.info("%s content not changed - skipping write to file: %s", gen_state.type, feed_path)
+                gen_state.output_digests[feed_path] = content_hash
+                continue
             feed_dir = os.path.dirname(feed_path)
             os.makedirs(feed_dir, exist_ok=True)
-            _LOGGER.info("writing %s content to file: %s", generator_type, feed_path)
+            _LOGGER.info("writing %s content to file: %s", gen_state.type, feed_path)
             write_data(feed_path, content)
+            gen_state.output_digests[feed_path] = content_hash
+
+
+def get_input_signature(generator: RSSGenerator):
+    """Return signature of log files read by generator or None if generator does not read files."""
+    logfiles = generator.get_logfiles()
+    if not logfiles:
+        return None
+    return tuple(get_file_signature(logfile) for logfile in logfiles)
+
+
+def get_journal_path(state_path, index):
+    """Return path of file with records of generator state."""
+    return f"{state_path}.{index}"
+
+
+def load_journal(state_path, journal):
+    """Load records of generator state. Raises exception if data is missing or invalid."""
+    index, size, _, _ = journal
+    if size == 0:
+        return []
+    return load_objects(get_journal_path(state_path, index), size)
+
+
+def read_feed_hash(feed_path):
+    """Return hash of feed stored in file or None if file does not exist."""
+    try:
+        with open(feed_path, encoding="utf8") as feed_file:
+            return calculate_feed_hash(feed_file.read())
+    except (OSError, UnicodeDecodeError):
+        return None
 
 
 @unique
@@ -144,19 +330,26 @@ class ThreadedRSSManager:
         self._lock = threading.RLock()
         self._wait_object = threading.Condition()
         self._thread = None
+        self._watcher: FileWatcher = None
 
     # set generator state (error) callback
     def set_state_callback(self, callback):
         self._state_callback = callback
 
-    def start(self, refresh_time, startupdelay):
-        """Start thread."""
+    def start(self, refresh_time, startupdelay, watch_files=False, debounce_time=2.0):
+        """Start thread.
+
+        If watching files is enabled, then generators are run when their log files change
+        and all generators are run every 'refresh_time' seconds.
+        """
         with self._lock:
             if self._execute_loop:
                 _LOGGER.warning("thread already running")
                 return
             self._execute_loop = True
-            self._thread = threading.Thread(target=self._run_loop, args=[refresh_time, startupdelay])
+            self._thread = threading.Thread(
+                target=self._run_loop, args=[refresh_time, startupdelay, watch_files, debounce_time]
+            )
             _LOGGER.info("starting thread")
             self._thread.start()
 
@@ -167,6 +360,8 @@ class ThreadedRSSManager:
                 return
             _LOGGER.info("stopping thread")
             self._execute_loop = False
+            if self._watcher is not None:
+                self._watcher.wakeup()
             try:
                 with self._wait_object:
                     self._wait_object.notifyAll()  # pylint: disable=W4902
@@ -174,11 +369,11 @@ class ThreadedRSSManager:
                 # no threads wait for notification
                 _LOGGER.info("thread does not wait")
 
-    def execute_loop(self, refresh_time, startupdelay):
+    def execute_loop(self, refresh_time, startupdelay, watch_files=False, debounce_time=2.0):
         """Start run loop without additional threads."""
         with self._lock:
             self._execute_loop = True
-        self._run_loop(refresh_time, startupdelay)
+        self._run_loop(refresh_time, startupdelay, watch_files, debounce_time)
 
     def execute_single(self):
         """Trigger single generation."""
@@ -188,6 +383,10 @@ class ThreadedRSSManager:
                 self._call_gen()
                 return
 
+            if self._watcher is not None:
+                _LOGGER.info("waking up RSS thread")
+                self._watcher.wakeup()
+                return
             try:
                 with self._wait_object:
                     _LOGGER.info("waking up RSS thread")
@@ -196,13 +395,17 @@ class ThreadedRSSManager:
                 # no threads wait for notification
                 _LOGGER.info("thread does not wait")
 
-    def _run_loop(self, refresh_time, startupdelay):
+    def _run_loop(self, refresh_time, startupdelay, watch_files=False, debounce_time=2.0):
         try:
             if startupdelay > 0:
                 _LOGGER.info("waiting %s seconds (startup delay)", startupdelay)
                 with self._wait_object:
                     self._wait_object.wait(startupdelay)
 
+            if watch_files:
+                self._watch_loop(refresh_time, debounce_time)
+                return
+
             while True:
                 with self._lock:
                     if not self._execute_loop:
@@ -236,11 +439,40 @@ class ThreadedRSSManager:
             with self._lock:
                 self._execute_loop = False
 
-    def _call_gen(self):
+    def _watch_loop(self, refresh_time, debounce_time):
+        with self._lock:
+            # created before first generation, so changes made during generation are not missed
+            if self._watcher is None:
+                self._watcher = create_watcher(self._manager.get_logfiles(), debounce_time)
+            watcher = self._watcher
+        changed_files = None  # all generators are run
+        while True:
+            with self._lock:
+                if not self._execute_loop:
+                    break
+
+            self._call_gen(changed_files)
+
+            with self._lock:
+                if not self._execute_loop:
+                    break
+            _LOGGER.info("waiting for changes of log files (at most %s seconds)", refresh_time)
+            changed_files = watcher.wait_changes(refresh_time)
+            if not changed_files:
+                # timeout or refresh request - all generators are run
+                changed_files = None
+
+        with self._lock:
+            if self._watcher is not None:
+                self._watcher.close()
+                self._watcher = None
+        _LOGGER.info("thread loop ended")
+
+    def _call_gen(self, changed_files: Set[str] = None):
         self._callback_state(RSSManagerState.PROCESSING)
 
         try:
-            self._manager.generate_data()
+            self._manager.generate_data(changed_files)
 
         except RuntimeError as exc:
             _LOGGER.error("exception occurred when calling generator: %s", exc)
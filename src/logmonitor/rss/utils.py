@@ -6,13 +6,19 @@
 # LICENSE file in the root directory of this source tree.
 #
 
+import re
 import logging
 
 from feedgen.feed import FeedGenerator
 
+from logmonitor.utils import calculate_hash
+
 
 _LOGGER = logging.getLogger(__name__)
 
+# build date is set to current time on each generation
+BUILD_DATE_REGEX = re.compile(r"<lastBuildDate>[^<]*</lastBuildDate>")
+
 
 def init_feed_gen(main_link, lang="pl") -> FeedGenerator:
     feed_gen = FeedGenerator()
@@ -26,3 +32,9 @@ def dumps_feed_gen(feed_gen: FeedGenerator):
     _LOGGER.info("generating %s feed items", items_num)
     content_bytes = feed_gen.rss_str(pretty=True)
     return content_bytes.decode()
+
+
+def calculate_feed_hash(content: str) -> str:
+    """Calculate hash of feed content ignoring feed build date."""
+    content = BUILD_DATE_REGEX.sub("", content, count=1)
+    return calculate_hash(content)
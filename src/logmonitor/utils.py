@@ -23,6 +23,10 @@ from logmonitor.persist import load_object_simple, store_object_simple
 _LOGGER = logging.getLogger(__name__)
 
 
+# getting timezone object is expensive, so it's done once
+LOCAL_TIMEZONE = pytz.timezone("Europe/Warsaw")
+
+
 def get_app_datadir():
     data_dir = user_data_dir("log-monitor")
     os.makedirs(data_dir, exist_ok=True)
@@ -109,8 +113,7 @@ def string_to_datetime(datetime_string) -> datetime.datetime:
 
 
 def add_timezone(dt: datetime.datetime) -> datetime.datetime:
-    tz_info = pytz.timezone("Europe/Warsaw")
-    return tz_info.localize(dt)
+    return LOCAL_TIMEZONE.localize(dt)
 
 
 def convert_to_html(content: str, preserve_newline=False) -> str:
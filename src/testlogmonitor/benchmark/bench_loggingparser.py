@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+#
+# Benchmark of LoggingParser matchers: Grok and native regular expression.
+#
+# Run from 'src' directory: python3 -m testlogmonitor.benchmark.bench_loggingparser
+#
+
+try:
+    ## following import success only when file is directly executed from command line
+    ## otherwise will throw exception when executing as parameter for "python -m"
+    # pylint: disable=W0611
+    import __init__
+except ImportError:
+    ## when import fails then it means that the script was executed indirectly
+    ## in this case __init__ is already loaded
+    pass
+
+
+import time
+import argparse
+
+from logmonitor.utils import read_data
+from logmonitor.parser.loggingparser import LoggingParser
+
+from testlogmonitor.data import get_data_path
+
+
+FMT = (
+    "%(asctime)s,%(msecs)-3d %(levelname)-8s %(threadName)s %(name)s:%(funcName)s"
+    " [%(filename)s:%(lineno)d] %(message)s"
+)
+DATEFMT = "%Y-%m-%d %H:%M:%S"
+DATA_FILES = ["log_trace.txt", "log_trace_hint.txt"]
+
+
+def load_content(repeat):
+    content_list = [read_data(get_data_path(data_file)) for data_file in DATA_FILES]
+    content = "\n".join(content_list)
+    return "\n".join([content] * repeat)
+
+
+def measure(parser: LoggingParser, content):
+    lines_num = content.count("\n") + 1
+    start_time = time.perf_counter()
+    parser.parse_content(content)
+    duration = time.perf_counter() - start_time
+    return lines_num / duration
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LoggingParser benchmark")
+    parser.add_argument("--repeat", type=int, default=2000, help="Number of test data repetitions")
+    args = parser.parse_args()
+
+    content = load_content(args.repeat)
+
+    grok_parser = LoggingParser(datefmt=DATEFMT, pattern=LoggingParser.parse_format(FMT))
+    native_parser = LoggingParser(FMT, DATEFMT)
+
+    grok_speed = measure(grok_parser, content)
+    native_speed = measure(native_parser, content)
+
+    print(f"grok:   {grok_speed:12.0f} lines/sec")
+    print(f"native: {native_speed:12.0f} lines/sec")
+    print(f"speedup: {native_speed / grok_speed:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+#
+# Throughput benchmark of parsers, generators and feed serialization on synthetic log.
+#
+# Run from 'src' directory: python3 -m testlogmonitor.benchmark.bench_suite --size 10 --json results.json
+#
+
+try:
+    ## following import success only when file is directly executed from command line
+    ## otherwise will throw exception when executing as parameter for "python -m"
+    # pylint: disable=W0611
+    import __init__
+except ImportError:
+    ## when import fails then it means that the script was executed indirectly
+    ## in this case __init__ is already loaded
+    pass
+
+
+import os
+import time
+import json
+import tempfile
+import tracemalloc
+import argparse
+from typing import Dict, Any
+
+from logmonitor.parser.loggingparser import LoggingParser
+from logmonitor.parser.pytracebackparser import PyTracebackParser
+from logmonitor.rss.generator.parserchaingen import ParserChainGenerator
+from logmonitor.rss.utils import dumps_feed_gen
+from logmonitor.rss.feedwriter import dumps_feed_stream
+
+from testlogmonitor.benchmark.logsynth import FMT, DATEFMT, generate_log, add_synth_args, get_synth_params
+
+
+def run_parser(parser, log_path):
+    entries_num = 0
+    for _ in parser.parse_file_stream(log_path):
+        entries_num += 1
+    return entries_num
+
+
+def create_chain_generator(log_path, loglevel):
+    chain = [
+        {
+            "parser": "logging",
+            "label": "bench-logging",
+            "params": {"logfile": log_path, "fmt": FMT, "datefmt": DATEFMT, "loglevel": loglevel},
+        },
+        {
+            "parser": "pytraceback",
+            "label": "bench-traceback",
+            "params": {"logfile": log_path},
+        },
+    ]
+    return ParserChainGenerator("bench-chain", "bench-chain.xml", chain=chain)
+
+
+def measure(function, *args):
+    """Call function twice: to measure time and to measure peak memory.
+
+    Tracing memory slows execution significantly, so time is measured separately.
+    """
+    start_time = time.perf_counter()
+    result = function(*args)
+    duration = time.perf_counter() - start_time
+
+    tracemalloc.start()
+    try:
+        function(*args)
+        _, peak_size = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, duration, peak_size
+
+
+def make_result(duration, peak_size, lines_num, data_size, **kwargs) -> Dict[str, Any]:
+    ret = {
+        "duration": round(duration, 4),
+        "lines_per_sec": round(lines_num / duration, 1),
+        "mb_per_sec": round(data_size / duration / 1024 / 1024, 3),
+        "peak_memory_mb": round(peak_size / 1024 / 1024, 3),
+    }
+    ret.update(kwargs)
+    return ret
+
+
+def measure_serialization(serializer, feed_gen) -> Dict[str, Any]:
+    items_num = len(feed_gen.entry())
+    content, duration, peak_size = measure(serializer, feed_gen)
+    content_size = len(content.encode())
+    result = make_result(
+        duration, peak_size, content.count("\n") + 1, content_size, entries=items_num, output_size=content_size
+    )
+    result["items_per_sec"] = round(items_num / duration, 1)
+    return result
+
+
+def run_suite(log_path, loglevel="WARNING") -> Dict[str, Any]:
+    with open(log_path, "rb") as log_file:
+        lines_num = sum(1 for _ in log_file)
+    data_size = os.path.getsize(log_path)
+
+    results = {}
+
+    logging_parser = LoggingParser(FMT, DATEFMT)
+    entries_num, duration, peak_size = measure(run_parser, logging_parser, log_path)
+    results["LoggingParser"] = make_result(duration, peak_size, lines_num, data_size, entries=entries_num)
+
+    traceback_parser = PyTracebackParser()
+    entries_num, duration, peak_size = measure(run_parser, traceback_parser, log_path)
+    results["PyTracebackParser"] = make_result(duration, peak_size, lines_num, data_size, entries=entries_num)
+
+    def generate_chain_feed():
+        # new generator - previously parsed data is not continued
+        return create_chain_generator(log_path, loglevel).generate_feed()
+
+    feed_gen, duration, peak_size = measure(generate_chain_feed)
+    items_num = len(feed_gen.entry())
+    results["ParserChainGenerator"] = make_result(duration, peak_size, lines_num, data_size, entries=items_num)
+
+    results["serialization"] = measure_serialization(dumps_feed_gen, feed_gen)
+    results["serialization stream"] = measure_serialization(dumps_feed_stream, feed_gen)
+
+    return {"lines": lines_num, "size": data_size, "loglevel": loglevel, "results": results}
+
+
+def print_results(data):
+    print(f"log: {data['lines']} lines, {data['size'] / 1024 / 1024:.2f} MB")
+    for name, result in data["results"].items():
+        print(
+            f"{name:22s} {result['lines_per_sec']:12.0f} lines/sec {result['mb_per_sec']:8.2f} MB/sec"
+            f" {result['peak_memory_mb']:8.2f} MB peak"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput benchmark")
+    add_synth_args(parser)
+    parser.add_argument("--loglevel", default="WARNING", help="Log level threshold of ParserChainGenerator")
+    parser.add_argument("--logfile", default=None, help="Benchmark given log file instead of synthetic one")
+    parser.add_argument("--json", default=None, help="Path to output JSON file with results")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        log_path = args.logfile
+        synth_params = None
+        if log_path is None:
+            log_path = os.path.join(tmp_dir, "synth.log")
+            synth_params = get_synth_params(args)
+            generate_log(log_path, args.size, **synth_params)
+        data = run_suite(log_path, args.loglevel)
+
+    data["synth"] = synth_params
+    print_results(data)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as json_file:
+            json.dump(data, json_file, indent=4)
+
+
+if __name__ == "__main__":
+    main()
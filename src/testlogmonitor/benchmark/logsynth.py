@@ -0,0 +1,142 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+#
+# Deterministic generator of synthetic logs in format of Python's logging module
+# (the same format as in 'config_example.yaml').
+#
+
+import random
+import datetime
+import argparse
+from typing import Dict, Iterator
+
+
+FMT = (
+    "%(asctime)s,%(msecs)-3d %(levelname)-8s %(threadName)s %(name)s:%(funcName)s"
+    " [%(filename)s:%(lineno)d] %(message)s"
+)
+DATEFMT = "%Y-%m-%d %H:%M:%S"
+
+# default ratios of entries per level
+LEVEL_RATIOS = {"DEBUG": 0.3, "INFO": 0.5, "WARNING": 0.12, "ERROR": 0.06, "CRITICAL": 0.02}
+
+START_TIME = datetime.datetime(2024, 10, 4, 12, 0, 0)
+
+THREADS = ["MainThread", "Thread-1", "Thread-2", "Worker-3"]
+MODULES = [
+    ("logmonitor.rss.rssmanager", "rssmanager.py", ["generate_data", "_write_data", "_load_state"]),
+    ("logmonitor.rss.server", "server.py", ["do_GET", "start", "stop"]),
+    ("logmonitor.parser.loggingparser", "loggingparser.py", ["parse_stream", "decode_fields"]),
+    ("app.worker", "worker.py", ["run", "process_item", "fetch"]),
+]
+MESSAGES = [
+    "writing logging content to file: /tmp/application/%s.xml",
+    "connection established to 192.168.0.%s",
+    "processed %s items in queue",
+    "request id=%s completed",
+    "unable to read configuration value: timeout=%s",
+]
+EXCEPTIONS = [
+    ("ValueError", "invalid literal for int() with base 10: 'abc'"),
+    ("KeyError", "'missing_key'"),
+    ("FileNotFoundError", "[Errno 2] No such file or directory: '/tmp/data.txt'"),
+]
+
+
+class LogSynthesizer:
+    """Generates log entries in deterministic way (the same seed gives the same output)."""
+
+    def __init__(self, seed=0, multiline_ratio=0.05, traceback_ratio=0.02, level_ratios: Dict[str, float] = None):
+        self.rand = random.Random(seed)
+        self.multiline_ratio = multiline_ratio
+        self.traceback_ratio = traceback_ratio
+        if level_ratios is None:
+            level_ratios = LEVEL_RATIOS
+        self.levels = list(level_ratios.keys())
+        self.level_weights = list(level_ratios.values())
+        self.curr_time = START_TIME
+
+    def generate_entries(self) -> Iterator[str]:
+        """Yield infinite sequence of entries (possibly multiline) terminated with new line."""
+        while True:
+            yield self.generate_entry()
+
+    def generate_entry(self) -> str:
+        rand = self.rand
+        self.curr_time += datetime.timedelta(milliseconds=rand.randint(0, 1500))
+        level = rand.choices(self.levels, self.level_weights)[0]
+        thread = rand.choice(THREADS)
+        module, filename, functions = rand.choice(MODULES)
+        func = rand.choice(functions)
+        lineno = rand.randint(10, 500)
+        message = rand.choice(MESSAGES) % rand.randint(0, 100000)
+
+        timestamp = self.curr_time.strftime(DATEFMT)
+        msecs = self.curr_time.microsecond // 1000
+        entry = f"{timestamp},{msecs:<3d} {level:<8s} {thread} {module}:{func} [{filename}:{lineno}] {message}\n"
+
+        value = rand.random()
+        if value < self.traceback_ratio:
+            entry += self.generate_traceback(filename, func, lineno)
+        elif value < self.traceback_ratio + self.multiline_ratio:
+            for index in range(rand.randint(1, 5)):
+                entry += f"    continuation line {index}: {rand.randint(0, 100000)}\n"
+        return entry
+
+    def generate_traceback(self, filename, func, lineno) -> str:
+        rand = self.rand
+        exc_type, exc_message = rand.choice(EXCEPTIONS)
+        ret = "Traceback (most recent call last):\n"
+        for depth in range(rand.randint(1, 4)):
+            ret += f'  File "/tmp/log-monitor/src/logmonitor/{filename}", line {lineno + depth}, in {func}\n'
+            ret += f"    result = self.{func}(item_{depth})\n"
+        ret += f"{exc_type}: {exc_message}\n"
+        return ret
+
+
+def generate_log(out_path, size_mb, **kwargs):
+    """Write synthetic log of given size (in MB) to file. Returns number of lines written."""
+    synth = LogSynthesizer(**kwargs)
+    size_limit = int(size_mb * 1024 * 1024)
+    written = 0
+    lines_num = 0
+    with open(out_path, "w", encoding="utf-8") as out_file:
+        for entry in synth.generate_entries():
+            if written >= size_limit:
+                break
+            out_file.write(entry)
+            written += len(entry)
+            lines_num += entry.count("\n")
+    return lines_num
+
+
+def add_synth_args(parser: argparse.ArgumentParser):
+    parser.add_argument("--size", type=float, default=10, help="Size of generated log in MB")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of random generator")
+    parser.add_argument("--multiline", type=float, default=0.05, help="Ratio of multiline entries")
+    parser.add_argument("--traceback", type=float, default=0.02, help="Ratio of entries with traceback")
+    parser.add_argument(
+        "--levels",
+        default=None,
+        help="Ratios of entries per level, e.g. 'DEBUG=0.3,INFO=0.5,WARNING=0.1,ERROR=0.1'",
+    )
+
+
+def get_synth_params(args) -> Dict:
+    level_ratios = None
+    if args.levels:
+        level_ratios = {}
+        for item in args.levels.split(","):
+            level, ratio = item.split("=")
+            level_ratios[level.strip().upper()] = float(ratio)
+    return {
+        "seed": args.seed,
+        "multiline_ratio": args.multiline,
+        "traceback_ratio": args.traceback,
+        "level_ratios": level_ratios,
+    }
@@ -0,0 +1,40 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import unittest
+import tempfile
+
+from logmonitor.parser.loggingparser import LoggingParser
+from logmonitor.parser.pytracebackparser import PyTracebackParser
+
+from testlogmonitor.benchmark.logsynth import FMT, DATEFMT, generate_log
+
+
+class LogSynthTest(unittest.TestCase):
+
+    def test_generate_log(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            log_path = os.path.join(tmp_dir, "synth.log")
+            lines_num = generate_log(log_path, 0.05, seed=1, multiline_ratio=0.0, traceback_ratio=0.1)
+            with open(log_path, encoding="utf-8") as log_file:
+                content = log_file.read()
+            self.assertEqual(lines_num, content.count("\n"))
+            self.assertGreaterEqual(len(content), 0.05 * 1024 * 1024)
+
+            other_path = os.path.join(tmp_dir, "other.log")
+            generate_log(other_path, 0.05, seed=1, multiline_ratio=0.0, traceback_ratio=0.1)
+            with open(other_path, encoding="utf-8") as log_file:
+                self.assertEqual(content, log_file.read())
+
+            parser = LoggingParser(FMT, DATEFMT)
+            log_list = parser.parse_file(log_path)
+            headers_num = sum(1 for line in content.splitlines() if line.startswith("2024-"))
+            self.assertEqual(headers_num, len(log_list))
+            traceback_list = PyTracebackParser().parse_file(log_path)
+            self.assertEqual(content.count("Traceback (most recent"), len(traceback_list))
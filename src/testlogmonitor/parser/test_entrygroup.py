@@ -0,0 +1,67 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import unittest
+import pickle
+
+from logmonitor.parser.logentry import LogEntry
+from logmonitor.parser.entrygroup import calculate_fingerprint, EntryAggregator
+
+
+class EntryGroupTest(unittest.TestCase):
+
+    def test_calculate_fingerprint(self):
+        fingerprint = calculate_fingerprint([b"2024-10-04 19:13:38,310 WARNING request 12 id=0x1F2a failed"])
+        self.assertEqual(
+            fingerprint, calculate_fingerprint([b"2024-10-05 08:01:02,999 WARNING request 345 id=0xfff failed"])
+        )
+        self.assertEqual(
+            calculate_fingerprint([b"session 3f2504e0-4f89-11d3-9a0c-0305e82c3301 closed"]),
+            calculate_fingerprint([b"session 9a7b1c2d-0000-4fff-8aaa-1234567890ab closed"]),
+        )
+        self.assertNotEqual(
+            fingerprint, calculate_fingerprint([b"2024-10-04 19:13:38,310 ERROR request 12 id=0x1F2a failed"])
+        )
+
+    def test_aggregate(self):
+        aggregator = EntryAggregator()
+        aggregator.add(LogEntry([b"request 1 failed"], timestamp=1))
+        aggregator.add(LogEntry([b"connection lost"], timestamp=2))
+        aggregator.add(LogEntry([b"request 2 failed"], timestamp=3))
+
+        groups = aggregator.get_groups()
+        self.assertEqual(2, len(groups))
+        # most recent group is the last one
+        self.assertEqual([b"connection lost"], groups[0].entry.raw_lines)
+        self.assertEqual([b"request 2 failed"], groups[1].entry.raw_lines)
+        self.assertEqual((2, 1, 3), (groups[1].count, groups[1].first_seen, groups[1].last_seen))
+
+        restored = pickle.loads(pickle.dumps(aggregator.groups))
+        self.assertEqual(2, restored[groups[1].fingerprint].count)
+
+    def test_aggregate_pending(self):
+        aggregator = EntryAggregator()
+        aggregator.add(LogEntry([b"request 1 failed"], timestamp=1))
+        aggregator.add(LogEntry([b"connection lost"], timestamp=2))
+
+        groups = aggregator.get_groups([LogEntry([b"request 2 failed"], timestamp=3)])
+        self.assertEqual([1, 2], [group.count for group in groups])
+        # state is not modified
+        groups = aggregator.get_groups()
+        self.assertEqual([1, 1], [group.count for group in groups])
+        self.assertEqual([b"connection lost"], groups[1].entry.raw_lines)
+
+    def test_aggregate_limit(self):
+        aggregator = EntryAggregator(max_groups=2)
+        aggregator.add(LogEntry([b"first"], timestamp=1))
+        aggregator.add(LogEntry([b"second"], timestamp=2))
+        aggregator.add(LogEntry([b"first"], timestamp=3))
+        aggregator.add(LogEntry([b"third"], timestamp=4))
+
+        groups = aggregator.get_groups()
+        self.assertEqual([[b"first"], [b"third"]], [group.entry.raw_lines for group in groups])
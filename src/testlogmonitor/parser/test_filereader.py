@@ -0,0 +1,62 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import unittest
+from unittest import mock
+import tempfile
+import gzip
+import bz2
+import lzma
+
+from logmonitor.parser import filereader
+from logmonitor.parser.filereader import open_log_file, read_lines
+
+
+class FileReaderTest(unittest.TestCase):
+    def setUp(self):
+        ## Called before testfunction is executed
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=R1732
+        self.log_path = os.path.join(self.tmp_dir.name, "log.txt")
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        self.tmp_dir.cleanup()
+
+    def write_log(self, content: bytes):
+        with open(self.log_path, "wb") as log_file:
+            log_file.write(content)
+
+    def read_log(self, offset=0):
+        with open(self.log_path, "rb") as log_file:
+            return list(read_lines(log_file, offset))
+
+    def test_read_lines(self):
+        self.write_log(b"aaa\nbbb\nccc")
+        self.assertEqual([b"aaa\n", b"bbb\n", b"ccc"], self.read_log())
+        self.assertEqual([b"bbb\n", b"ccc"], self.read_log(4))
+
+    @mock.patch.object(filereader, "MMAP_MIN_SIZE", 0)
+    @mock.patch.object(filereader, "CHUNK_SIZE", 8)
+    def test_read_lines_mmap(self):
+        content = b"aaa\nbbbbbbbbbbbbbbbb\ncc\n\ndddd\neee"
+        self.write_log(content)
+        lines = self.read_log()
+        self.assertEqual([b"aaa\n", b"bbbbbbbbbbbbbbbb\n", b"cc\n", b"\n", b"dddd\n", b"eee"], lines)
+
+        with open(self.log_path, "rb") as log_file:
+            expected = log_file.readlines()
+        self.assertEqual(expected, lines)
+        self.assertEqual([b"cc\n", b"\n", b"dddd\n", b"eee"], self.read_log(21))
+
+    def test_read_lines_compressed(self):
+        for compress_open in [gzip.open, bz2.open, lzma.open]:
+            with compress_open(self.log_path, "wb") as log_file:
+                log_file.write(b"aaa\nbbb\nccc")
+            with open_log_file(self.log_path) as log_file:
+                self.assertEqual([b"bbb\n", b"ccc"], list(read_lines(log_file, 4)))
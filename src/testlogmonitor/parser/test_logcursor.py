@@ -0,0 +1,137 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import unittest
+from unittest import mock
+import tempfile
+import gzip
+import bz2
+import lzma
+
+from logmonitor.parser import logcursor
+from logmonitor.parser.logcursor import LogCursor, read_new_data, get_rotated_files
+
+
+EXTENSIONS = {gzip.open: ".gz", bz2.open: ".bz2", lzma.open: ".xz"}
+
+
+class LogCursorTest(unittest.TestCase):
+    def setUp(self):
+        ## Called before testfunction is executed
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=R1732
+        self.log_path = os.path.join(self.tmp_dir.name, "log.txt")
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        self.tmp_dir.cleanup()
+
+    def append_log(self, content):
+        with open(self.log_path, "a", encoding="utf-8") as log_file:
+            log_file.write(content)
+
+    def test_read_new_data(self):
+        cursor = LogCursor()
+        self.append_log("aaa\nbbb\nccc")
+        self.assertEqual("aaa\nbbb\n", read_new_data(self.log_path, cursor))
+        self.assertEqual(8, cursor.offset)
+
+        self.assertEqual("", read_new_data(self.log_path, cursor))
+
+        self.append_log("c\nddd\n")
+        self.assertEqual("cccc\nddd\n", read_new_data(self.log_path, cursor))
+        self.assertEqual(17, cursor.offset)
+
+    def test_read_new_data_truncated(self):
+        cursor = LogCursor()
+        self.append_log("aaa\nbbb\n")
+        read_new_data(self.log_path, cursor)
+        cursor.state = "xxx"
+
+        os.remove(self.log_path)
+        self.append_log("eee\n")
+        self.assertEqual("eee\n", read_new_data(self.log_path, cursor))
+        self.assertEqual(None, cursor.state)
+
+    def rotate_log(self):
+        rotated_list = get_rotated_files(self.log_path)
+        for index in range(len(rotated_list), 0, -1):
+            os.rename(f"{self.log_path}.{index}", f"{self.log_path}.{index + 1}")
+        os.rename(self.log_path, f"{self.log_path}.1")
+
+    def test_read_new_data_rotated(self):
+        cursor = LogCursor()
+        self.append_log("aaa\nbbb\n")
+        read_new_data(self.log_path, cursor)
+        cursor.state = "xxx"
+
+        self.append_log("ccc\nddd")
+        self.rotate_log()
+        self.append_log("eee\nfff")
+        self.assertEqual("ccc\nddd\neee\n", read_new_data(self.log_path, cursor))
+        self.assertEqual(4, cursor.offset)
+        self.assertEqual("xxx", cursor.state)
+
+        self.append_log("\n")
+        self.assertEqual("fff\n", read_new_data(self.log_path, cursor))
+
+    def test_read_new_data_rotated_multiple(self):
+        cursor = LogCursor()
+        self.append_log("aaa\n")
+        read_new_data(self.log_path, cursor)
+
+        self.append_log("bbb\n")
+        self.rotate_log()
+        self.append_log("ccc\n")
+        self.rotate_log()
+        self.append_log("ddd\n")
+        self.rotate_log()
+        self.append_log("eee\n")
+        self.assertEqual("bbb\nccc\nddd\neee\n", read_new_data(self.log_path, cursor))
+        self.assertEqual("", read_new_data(self.log_path, cursor))
+
+    def compress_log(self, file_path, compress_open):
+        with open(file_path, "rb") as log_file:
+            content = log_file.read()
+        with compress_open(file_path + EXTENSIONS[compress_open], "wb") as compressed_file:
+            compressed_file.write(content)
+        os.remove(file_path)
+
+    def test_read_new_data_rotated_compressed(self):
+        for compress_open in [gzip.open, bz2.open, lzma.open]:
+            cursor = LogCursor()
+            self.append_log("aaa\n")
+            read_new_data(self.log_path, cursor)
+
+            self.append_log("bbb\n")
+            self.rotate_log()
+            self.append_log("ccc\n")
+            self.rotate_log()
+            self.compress_log(f"{self.log_path}.2", compress_open)
+            self.append_log("ddd\n")
+            self.assertEqual("bbb\nccc\nddd\n", read_new_data(self.log_path, cursor))
+            os.remove(f"{self.log_path}.1")
+            os.remove(f"{self.log_path}.2" + EXTENSIONS[compress_open])
+            os.remove(self.log_path)
+
+    def test_read_new_data_compressed(self):
+        compressed_path = f"{self.log_path}.gz"
+        with gzip.open(compressed_path, "wt", encoding="utf-8") as log_file:
+            log_file.write("aaa\nbbb")
+
+        cursor = LogCursor()
+        self.assertEqual("aaa\nbbb\n", read_new_data(compressed_path, cursor))
+        # processed file is skipped
+        with mock.patch.object(logcursor, "open_log_file") as open_mock:
+            self.assertEqual("", read_new_data(compressed_path, cursor))
+            open_mock.assert_not_called()
+
+        # file replaced
+        with gzip.open(compressed_path, "wt", encoding="utf-8") as log_file:
+            log_file.write("ccc\n")
+        self.assertEqual("ccc\n", read_new_data(compressed_path, cursor))
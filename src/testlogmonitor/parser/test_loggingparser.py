@@ -8,8 +8,14 @@
 
 import os
 import unittest
+import pickle
+import datetime
+import time
+import tempfile
 
-from logmonitor.parser.loggingparser import LoggingParser
+from logmonitor.parser.loggingparser import LoggingParser, DatetimeDecoder
+from logmonitor.parser.logcursor import LogCursor
+from logmonitor.utils import add_timezone
 
 from testlogmonitor.data import get_data_path
 
@@ -21,6 +27,10 @@ def sort_dict(data_dict):
     return dict(sorted(data_dict.items()))
 
 
+def to_list(entries_list):
+    return [[entry.text, sort_dict(entry.fields)] for entry in entries_list]
+
+
 class LoggingParserTest(unittest.TestCase):
     def test_parse_format(self):
         fmt = (
@@ -35,6 +45,15 @@ class LoggingParserTest(unittest.TestCase):
             " %{GREEDYDATA:message}",
         )
 
+    def test_format_to_regex(self):
+        fmt = "%(asctime)s,%(msecs)-3d %(levelname)-8s [%(filename)s:%(lineno)d] %(message)s"
+        pattern = LoggingParser.format_to_regex(fmt)
+        self.assertEqual(
+            pattern,
+            r"(?P<asctime>.*?),(?P<msecs>\b(?:[0-9]+)\b)\s*\ (?P<levelname>\S+)\s*\ \[(?P<filename>\S+):"
+            r"(?P<lineno>\b(?:[0-9]+)\b)\]\ (?P<message>.*)",
+        )
+
     def test_parse_datetime_format(self):
         datefmt = "%Y-%m-%d %H:%M:%S"
         pattern = LoggingParser.parse_datetime(datefmt)
@@ -65,7 +84,7 @@ class LoggingParserTest(unittest.TestCase):
             "lineno": "86",
             "message": "downloading completed",
         }
-        self.assertListEqual([[log_content, sort_dict(data)]], response)
+        self.assertListEqual([[log_content, sort_dict(data)]], to_list(response))
 
     def test_parse_02(self):
         # log entry with two digits milliseconds
@@ -89,7 +108,7 @@ class LoggingParserTest(unittest.TestCase):
             "lineno": "89",
             "message": "Starting the application",
         }
-        self.assertListEqual([[log_content, sort_dict(data)]], response)
+        self.assertListEqual([[log_content, sort_dict(data)]], to_list(response))
 
     def test_parse_03(self):
         # thread name with thread function
@@ -115,7 +134,7 @@ class LoggingParserTest(unittest.TestCase):
             "lineno": "89",
             "message": "Starting the application",
         }
-        self.assertListEqual([[log_content, sort_dict(data)]], response)
+        self.assertListEqual([[log_content, sort_dict(data)]], to_list(response))
 
     def test_parse_optional(self):
         # log entry to test optional thread function
@@ -146,7 +165,19 @@ class LoggingParserTest(unittest.TestCase):
             "message": "getting offer details: "
             "https://www.pracuj.pl/praca/c%2b%2b-senior-developer-warszawa,oferta,1003608626",
         }
-        self.assertListEqual([[log_content, sort_dict(data)]], response)
+        self.assertListEqual([[log_content, sort_dict(data)]], to_list(response))
+
+    def test_parse_grok_types(self):
+        parser = LoggingParser(
+            pattern=r"%{NOTSPACE:levelname} \[%{NOTSPACE:filename}:%{INT:lineno:int}\] %{NUMBER:duration:float}"
+            r" %{GREEDYDATA:message}",
+        )
+        response = parser.parse_content("ERROR [app.py:42] 1.5 request failed\nsecond line")
+        fields = response[0].fields
+        self.assertEqual(42, fields["lineno"])
+        self.assertIsInstance(fields["lineno"], int)
+        self.assertEqual(1.5, fields["duration"])
+        self.assertEqual("request failed\nsecond line", fields["message"])
 
     def test_parse_multiline(self):
         self.maxDiff = None
@@ -170,7 +201,7 @@ class LoggingParserTest(unittest.TestCase):
             "lineno": "86",
             "message": "downloading completed\nsecond log line\nthird log line",
         }
-        self.assertListEqual([[log_content, sort_dict(data)]], response)
+        self.assertListEqual([[log_content, sort_dict(data)]], to_list(response))
 
     def test_parse_traceback(self):
         self.maxDiff = None
@@ -182,10 +213,10 @@ class LoggingParserTest(unittest.TestCase):
         response = parser.parse_file(log_pagh)
 
         self.assertEqual(4, len(response))
-        line_dict = response[0][1]
+        line_dict = response[0].fields
         self.assertEqual("writing logging content to file: /tmp/application", line_dict["message"])
 
-        line_dict = response[1][1]
+        line_dict = response[1].fields
         message = line_dict["message"]
         message_lines = message.split("\n")
         self.assertEqual("exception raised during generator execution", message_lines[0])
@@ -196,5 +227,244 @@ class LoggingParserTest(unittest.TestCase):
             message_lines[-1],
         )
 
-        line_dict = response[2][1]
+        line_dict = response[2].fields
         self.assertEqual("found 5556 items", line_dict["message"])
+
+    def test_parse_level_threshold(self):
+        parser = LoggingParser(
+            "%(asctime)s,%(msecs)-3d %(levelname)-8s"
+            " %(threadName)s %(name)s:%(funcName)s [%(filename)s:%(lineno)d] %(message)s",
+            loglevel="WARNING",
+        )
+        log_content = (
+            "2024-09-09 20:30:24,86  INFO     MainThread __main__:main [main.py:89] info entry\n"
+            "info continuation\n"
+            "2024-09-09 20:30:25,86  WARNING  MainThread __main__:main [main.py:90] warning entry\n"
+            "warning continuation\n"
+            "2024-09-09 20:30:26,86  DEBUG    MainThread __main__:main [main.py:91] debug entry\n"
+            "debug continuation\n"
+            "2024-09-09 20:30:27,86  ERROR    MainThread __main__:main [main.py:92] error entry"
+        )
+        response = parser.parse_content(log_content)
+        self.assertEqual(2, len(response))
+        self.assertEqual("warning entry\nwarning continuation", response[0].fields["message"])
+        self.assertEqual("error entry", response[1].fields["message"])
+
+    def test_parse_level_threshold_cursor(self):
+        parser = LoggingParser(
+            "%(asctime)s,%(msecs)-3d %(levelname)-8s"
+            " %(threadName)s %(name)s:%(funcName)s [%(filename)s:%(lineno)d] %(message)s",
+            loglevel="WARNING",
+        )
+        cursor = LogCursor()
+        log_content = (
+            "2024-09-09 20:30:24,86  ERROR    MainThread __main__:main [main.py:89] error entry\n"
+            "2024-09-09 20:30:25,86  INFO     MainThread __main__:main [main.py:90] info entry\n"
+        )
+        response = parser.parse_content(log_content, cursor=cursor)
+        self.assertEqual(1, len(response))
+        self.assertEqual([], parser.get_pending(cursor))
+
+        response = parser.parse_content("info continuation\n", cursor=cursor)
+        self.assertEqual([], response)
+        self.assertEqual([], parser.get_pending(cursor))
+
+    def test_parse_stream(self):
+        parser = LoggingParser(
+            "%(asctime)s,%(msecs)-3d %(levelname)-8s"
+            " %(threadName)s %(name)s:%(funcName)s [%(filename)s:%(lineno)d] %(message)s"
+        )
+        consumed_lines = []
+
+        def lines_gen():
+            for index in range(3):
+                line = f"2024-09-09 20:30:24,86  INFO     MainThread __main__:main [main.py:89] entry {index}\n"
+                consumed_lines.append(line)
+                yield line
+
+        entry_stream = parser.parse_stream(lines_gen())
+        entry = next(entry_stream)
+        # entry is completed after next entry is read
+        self.assertEqual(2, len(consumed_lines))
+        self.assertEqual("entry 0", entry.fields["message"])
+        self.assertEqual(["entry 1", "entry 2"], [item.fields["message"] for item in entry_stream])
+
+    def test_parse_native_grok(self):
+        # native regex gives the same results as Grok
+        fmt = (
+            "%(asctime)s,%(msecs)-3d %(levelname)-8s"
+            " %(threadName)s %(name)s:%(funcName)s [%(filename)s:%(lineno)d] %(message)s"
+        )
+        native_parser = LoggingParser(fmt, "%Y-%m-%d %H:%M:%S")
+        grok_parser = LoggingParser(datefmt="%Y-%m-%d %H:%M:%S", pattern=LoggingParser.parse_format(fmt))
+        for data_file in ["log_trace.txt", "log_trace_hint.txt"]:
+            log_path = get_data_path(data_file)
+            self.assertEqual(grok_parser.parse_file(log_path), native_parser.parse_file(log_path))
+
+    def test_parse_file_cursor(self):
+        parser = LoggingParser(
+            "%(asctime)s,%(msecs)-3d %(levelname)-8s"
+            " %(threadName)s %(name)s:%(funcName)s [%(filename)s:%(lineno)d] %(message)s"
+        )
+        line1 = "2024-09-09 20:30:24,86  DEBUG    MainThread __main__:main [main.py:89] first entry"
+        line2 = "2024-09-09 20:30:25,86  ERROR    MainThread __main__:main [main.py:90] second entry"
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            log_path = os.path.join(tmp_dir, "log.txt")
+            with open(log_path, "w", encoding="utf-8") as log_file:
+                log_file.write(f"{line1}\nsecond line\n{line2}\n")
+
+            cursor = LogCursor()
+            response = parser.parse_file(log_path, cursor)
+            self.assertEqual(1, len(response))
+            self.assertEqual(f"{line1}\nsecond line", response[0].text)
+            pending = parser.get_pending(cursor)
+            self.assertEqual(1, len(pending))
+            self.assertEqual(line2, pending[0].text)
+
+            with open(log_path, "a", encoding="utf-8") as log_file:
+                log_file.write("continuation\n")
+                log_file.write(f"{line1}\nincomplete")
+
+            response = parser.parse_file(log_path, cursor)
+            self.assertEqual(1, len(response))
+            self.assertEqual(f"{line2}\ncontinuation", response[0].text)
+            self.assertEqual("second entry\ncontinuation", response[0].fields["message"])
+            pending = parser.get_pending(cursor)
+            self.assertEqual(line1, pending[0].text)
+
+            response = parser.parse_file(log_path, cursor)
+            self.assertEqual([], response)
+
+    def test_parse_file_rotated(self):
+        parser = LoggingParser(
+            "%(asctime)s,%(msecs)-3d %(levelname)-8s"
+            " %(threadName)s %(name)s:%(funcName)s [%(filename)s:%(lineno)d] %(message)s"
+        )
+        line1 = "2024-09-09 20:30:24,86  DEBUG    MainThread __main__:main [main.py:89] first entry"
+        line2 = "2024-09-09 20:30:25,86  ERROR    MainThread __main__:main [main.py:90] second entry"
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            log_path = os.path.join(tmp_dir, "log.txt")
+            with open(log_path, "w", encoding="utf-8") as log_file:
+                log_file.write(f"{line2}\n{line1}\n")
+            cursor = LogCursor()
+            response = parser.parse_file(log_path, cursor)
+            self.assertEqual(1, len(response))
+            # entry pending while file is rotated
+            self.assertEqual(line1, parser.get_pending(cursor)[0].text)
+
+            with open(log_path, "a", encoding="utf-8") as log_file:
+                log_file.write("continuation\n")
+            os.rename(log_path, f"{log_path}.1")
+            with open(log_path, "w", encoding="utf-8") as log_file:
+                log_file.write(f"{line2}\n{line1}\n")
+
+            response = parser.parse_file(log_path, cursor)
+            # entry of rotated file completed with its remaining lines, lines of new file counted from beginning
+            self.assertEqual([f"{line1}\ncontinuation", line2], [entry.text for entry in response])
+            self.assertEqual([2, 1], [entry.line_number for entry in response])
+            pending = parser.get_pending(cursor)
+            self.assertEqual(line1, pending[0].text)
+            self.assertEqual(2, pending[0].line_number)
+
+    def test_parse_lazy_fields(self):
+        parser = LoggingParser(
+            "%(asctime)s,%(msecs)-3d %(levelname)-8s"
+            " %(threadName)s %(name)s:%(funcName)s [%(filename)s:%(lineno)d] %(message)s",
+            "%Y-%m-%d %H:%M:%S",
+        )
+        cursor = LogCursor()
+        log_content = "2024-09-09 20:30:24,86  ERROR    MainThread __main__:main [main.py:89] error entry\n"
+        response = parser.parse_content(log_content, cursor=cursor)
+        self.assertEqual([], response)
+        pending = parser.get_pending(cursor)
+        self.assertEqual(40, pending[0].level)
+        self.assertEqual(add_timezone(datetime.datetime(2024, 9, 9, 20, 30, 24)), pending[0].timestamp)
+        self.assertEqual("error entry", pending[0].fields["message"])
+
+        # fields are stored with state, because decoder is part of parser
+        cursor = pickle.loads(pickle.dumps(cursor))  # nosec
+        response = parser.parse_content("continuation\n", cursor=cursor)
+        pending = parser.get_pending(cursor)
+        self.assertEqual(1, pending[0].line_number)
+        self.assertEqual("error entry\ncontinuation", pending[0].fields["message"])
+        self.assertEqual(
+            {"H": "20", "M": "30", "S": "24", "Y": "2024", "d": "09", "m": "09"}, pending[0].fields["asctime"]
+        )
+
+    def test_datetime_decoder(self):
+        decoder = DatetimeDecoder("%Y-%m-%d %H:%M:%S")
+        date_value = decoder.decode("2024-09-09 20:30:24")
+        self.assertEqual(add_timezone(datetime.datetime(2024, 9, 9, 20, 30, 24)), date_value)
+        self.assertIs(date_value, decoder.decode("2024-09-09 20:30:24"))
+        self.assertEqual(None, decoder.decode("2024-13-09 20:30:24"))
+
+        decoder = DatetimeDecoder("%d %b %Y %H:%M:%S")
+        date_value = decoder.decode("09 Sep 2024 20:30:24")
+        self.assertEqual(add_timezone(datetime.datetime(2024, 9, 9, 20, 30, 24)), date_value)
+
+    def test_parse_multiline_long(self):
+        parser = LoggingParser(
+            "%(asctime)s,%(msecs)-3d %(levelname)-8s"
+            " %(threadName)s %(name)s:%(funcName)s [%(filename)s:%(lineno)d] %(message)s"
+        )
+        header = "2024-09-09 20:30:24,86  ERROR    MainThread __main__:main [main.py:89] payload dump"
+
+        def measure_parse(lines_num):
+            log_content = header + "\n" + "continuation line\n" * lines_num
+            start_time = time.perf_counter()
+            response = parser.parse_content(log_content)
+            message = response[0].fields["message"]
+            duration = time.perf_counter() - start_time
+            self.assertEqual(1, len(response))
+            self.assertEqual(lines_num + 1, len(message.split("\n")))
+            return duration
+
+        short_time = measure_parse(10000)
+        long_time = measure_parse(100000)
+        # linear time gives ratio close to 10, quadratic time gives ratio close to 100
+        self.assertLess(long_time, short_time * 30)
+
+    def test_shared_matchers(self):
+        fmt = "%(asctime)s,%(msecs)-3d %(levelname)-8s [%(filename)s:%(lineno)d] %(message)s"
+        parser1 = LoggingParser(fmt, "%Y-%m-%d %H:%M:%S")
+        parser2 = LoggingParser(fmt, "%Y-%m-%d %H:%M:%S", loglevel="WARNING")
+        self.assertIs(parser1.matcher, parser2.matcher)
+        self.assertIs(parser1.datetime_decoder, parser2.datetime_decoder)
+
+        pattern = LoggingParser.parse_format(fmt)
+        self.assertIs(LoggingParser(pattern=pattern).matcher, LoggingParser(pattern=pattern).matcher)
+
+    def test_parse_file_invalid_utf8(self):
+        parser = LoggingParser(
+            "%(asctime)s,%(msecs)-3d %(levelname)-8s"
+            " %(threadName)s %(name)s:%(funcName)s [%(filename)s:%(lineno)d] %(message)s",
+            loglevel="WARNING",
+        )
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            log_path = os.path.join(tmp_dir, "log.txt")
+            with open(log_path, "wb") as log_file:
+                log_file.write(b"2024-09-09 20:30:24,86  INFO     MainThread __main__:main [main.py:89] info \xff\n")
+                log_file.write(b"2024-09-09 20:30:25,86  ERROR    MainThread __main__:main [main.py:90] error entry\n")
+                log_file.write(b"invalid \xc3\x28 sequence\n")
+
+            response = parser.parse_file(log_path)
+            self.assertEqual(1, len(response))
+            self.assertEqual("error entry\ninvalid �( sequence", response[0].fields["message"])
+
+    def test_parse_non_ascii_whitespace(self):
+        parser = LoggingParser(
+            "%(asctime)s,%(msecs)-3d %(levelname)-8s"
+            " %(threadName)s %(name)s:%(funcName)s [%(filename)s:%(lineno)d] %(message)s"
+        )
+        # no-break space and next line are whitespaces only in decoded line
+        line = "2024-09-09 20:30:24,86  ERROR    MainThread __main__:main [ma\u00a0in.py:89] error\u0085entry\n"
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            log_path = os.path.join(tmp_dir, "log.txt")
+            with open(log_path, "wb") as log_file:
+                log_file.write(line.encode("utf8"))
+            response = parser.parse_file(log_path)
+        self.assertEqual(1, len(response))
+        fields = response[0].fields
+        self.assertEqual("ERROR", fields["levelname"])
+        self.assertEqual("ma\u00a0in.py", fields["filename"])
+        self.assertEqual("error\u0085entry", fields["message"])
@@ -0,0 +1,85 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import unittest
+import tempfile
+
+from logmonitor.parser.loggingparser import LoggingParser
+from logmonitor.parser.logcursor import LogCursor
+from logmonitor.parser.parallelparser import parse_file_parallel, split_ranges
+
+from testlogmonitor.data import get_data_path
+
+
+FMT = (
+    "%(asctime)s,%(msecs)-3d %(levelname)-8s"
+    " %(threadName)s %(name)s:%(funcName)s [%(filename)s:%(lineno)d] %(message)s"
+)
+DATEFMT = "%Y-%m-%d %H:%M:%S"
+
+
+class ParallelParserTest(unittest.TestCase):
+    def setUp(self):
+        ## Called before testfunction is executed
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=R1732
+        self.log_path = os.path.join(self.tmp_dir.name, "log.txt")
+        content_list = []
+        for data_file in ["log_trace.txt", "log_trace_hint.txt"]:
+            with open(get_data_path(data_file), "r", encoding="utf-8") as data_fp:
+                content_list.append(data_fp.read())
+        with open(self.log_path, "w", encoding="utf-8") as log_file:
+            log_file.write("".join(content_list * 20))
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        self.tmp_dir.cleanup()
+
+    def test_split_ranges(self):
+        parser = LoggingParser(FMT, DATEFMT)
+        file_size = os.path.getsize(self.log_path)
+        with open(self.log_path, "rb") as log_file:
+            ranges_list = split_ranges(parser, log_file, file_size, file_size // 8)
+            self.assertLessEqual(7, len(ranges_list))
+            self.assertGreaterEqual(9, len(ranges_list))
+            self.assertEqual(0, ranges_list[0][0])
+            self.assertEqual(file_size, ranges_list[-1][1])
+            for (_, prev_end), (range_start, _) in zip(ranges_list, ranges_list[1:]):
+                self.assertEqual(prev_end, range_start)
+            for range_start, _ in ranges_list:
+                log_file.seek(range_start)
+                line = log_file.readline()
+                self.assertIsNotNone(parser.match_header(line))
+
+    def test_parse_file_parallel(self):
+        parser = LoggingParser(FMT, DATEFMT, loglevel="INFO")
+        expected = parser.parse_file(self.log_path)
+        # more ranges than workers
+        response = list(parse_file_parallel(parser, self.log_path, workers=2, min_size=0, chunk_size=4096))
+        self.assertEqual(len(expected), len(response))
+        self.assertEqual(expected, response)
+
+    def test_parse_file_parallel_cursor(self):
+        parser = LoggingParser(FMT, DATEFMT)
+        with open(self.log_path, "a", encoding="utf-8") as log_file:
+            log_file.write("continuation\nincomplete")
+
+        expected_cursor = LogCursor()
+        expected = parser.parse_file(self.log_path, expected_cursor)
+        cursor = LogCursor()
+        response = list(parse_file_parallel(parser, self.log_path, cursor, workers=3, min_size=0, chunk_size=4096))
+        self.assertEqual(expected, response)
+        self.assertEqual(expected_cursor.offset, cursor.offset)
+        self.assertEqual(expected_cursor.state, cursor.state)
+
+        with open(self.log_path, "a", encoding="utf-8") as log_file:
+            log_file.write(" line\n")
+        expected = parser.parse_file(self.log_path, expected_cursor)
+        response = parser.parse_file(self.log_path, cursor)
+        self.assertEqual(expected, response)
+        self.assertEqual(parser.get_pending(expected_cursor), parser.get_pending(cursor))
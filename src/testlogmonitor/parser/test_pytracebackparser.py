@@ -9,8 +9,10 @@
 import os
 import datetime
 import unittest
+import tempfile
 
 from logmonitor.parser.pytracebackparser import PyTracebackParser
+from logmonitor.parser.logcursor import LogCursor
 
 from testlogmonitor.data import get_data_path
 
@@ -31,15 +33,15 @@ class PyTracebackParserTest(unittest.TestCase):
 
         self.assertEqual(1, len(response))
 
-        mod_time = response[0][0]
+        mod_time = response[0].timestamp
         # self.assertEqual(1728075360.8512435, mod_time)
         datestamp = datetime.datetime.fromtimestamp(mod_time)
         self.assertEqual(datetime.datetime(2024, 10, 4, 22, 56, 0, 851243), datestamp)
 
-        message_id = response[0][1]
-        self.assertEqual("3b6169c3311e84eab8aec3b80628c96a", message_id)
+        message_id = response[0].entry_id
+        self.assertEqual("3fcd8a3f7bb5205bc0392d4ba97eb0a0", message_id)
 
-        message_lines = response[0][2]
+        message_lines = response[0].lines
         self.assertEqual("Traceback (most recent call last):", message_lines[0])
         self.assertEqual(
             """RuntimeError: file /tmplog/log.txt: unable to match pattern to line 1: """
@@ -55,15 +57,15 @@ class PyTracebackParserTest(unittest.TestCase):
 
         self.assertEqual(1, len(response))
 
-        mod_time = response[0][0]
+        mod_time = response[0].timestamp
         # self.assertEqual(1728075360.8512435, mod_time)
         datestamp = datetime.datetime.fromtimestamp(mod_time)
         self.assertEqual(datetime.datetime(2024, 10, 4, 22, 56, 0, 851243), datestamp)
 
-        message_id = response[0][1]
-        self.assertEqual("3b6169c3311e84eab8aec3b80628c96a", message_id)
+        message_id = response[0].entry_id
+        self.assertEqual("3fcd8a3f7bb5205bc0392d4ba97eb0a0", message_id)
 
-        message_lines = response[0][2]
+        message_lines = response[0].lines
         self.assertEqual(
             "2024-10-04 19:13:38,311 ERROR    MainThread logmonitor.rss.rssmanager:generate_data "
             "[rssmanager.py:92] exception raised during generator execution",
@@ -84,17 +86,59 @@ class PyTracebackParserTest(unittest.TestCase):
 
         self.assertEqual(1, len(response))
 
-        mod_time = response[0][0]
+        mod_time = response[0].timestamp
         # self.assertEqual(1728075360.8512435, mod_time)
         datestamp = datetime.datetime.fromtimestamp(mod_time)
         self.assertEqual(datetime.datetime(2024, 10, 8, 17, 1, 42, 186263), datestamp)
 
-        message_id = response[0][1]
-        self.assertEqual("ee87529631a74faf35dc6810a8e2b06f", message_id)
+        message_id = response[0].entry_id
+        self.assertEqual("a42c4fe49b54c047d72b4050d8ac60af", message_id)
 
-        message_lines = response[0][2]
+        message_lines = response[0].lines
         self.assertEqual("Traceback (most recent call last):", message_lines[0])
         self.assertEqual(
             """  start(self): too many arguments""",
             message_lines[-1],
         )
+
+    def test_parse_stream(self):
+        parser = PyTracebackParser(linesbefore=1)
+        log_pagh = get_data_path("log_trace.txt")
+        with open(log_pagh, "r", encoding="utf-8") as log_file:
+            response = list(parser.parse_stream(log_file, file_path=log_pagh))
+        self.assertEqual(parser.parse_file(log_pagh), response)
+
+    def test_parse_cursor(self):
+        parser = PyTracebackParser(linesbefore=1)
+        log_pagh = get_data_path("log_trace.txt")
+        with open(log_pagh, "r", encoding="utf-8") as log_file:
+            content_lines = log_file.readlines()
+        expected = parser.parse_file(log_pagh)
+
+        # entries found in parts of content are the same as entries found in whole content
+        for split_index in range(len(content_lines) + 1):
+            cursor = LogCursor()
+            response = list(parser.parse_stream(content_lines[:split_index], file_path=log_pagh, cursor=cursor))
+            response += list(parser.parse_stream(content_lines[split_index:], file_path=log_pagh, cursor=cursor))
+            self.assertEqual(expected, response)
+
+    def test_parse_file_rotated(self):
+        parser = PyTracebackParser()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            log_path = os.path.join(tmp_dir, "log.txt")
+            with open(log_path, "w", encoding="utf-8") as log_file:
+                log_file.write("first message\nTraceback (most recent call last):\n")
+            cursor = LogCursor()
+            self.assertEqual([], parser.parse_file(log_path, cursor))
+
+            # traceback pending while file is rotated
+            with open(log_path, "a", encoding="utf-8") as log_file:
+                log_file.write('  File "app.py", line 1, in <module>\nValueError: error\n')
+            os.rename(log_path, f"{log_path}.1")
+            with open(log_path, "w", encoding="utf-8") as log_file:
+                log_file.write("Traceback (most recent call last):\nKeyError: key\nnext message\n")
+
+            response = parser.parse_file(log_path, cursor)
+            # traceback of rotated file completed, lines of new file counted from beginning
+            self.assertEqual(["ValueError: error", "KeyError: key"], [entry.lines[-1] for entry in response])
+            self.assertEqual([2, 1], [entry.line_number for entry in response])
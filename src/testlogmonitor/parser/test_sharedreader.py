@@ -0,0 +1,97 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import gzip
+import unittest
+from unittest import mock
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from logmonitor.parser import sharedreader
+from logmonitor.parser.sharedreader import SharedReader
+from logmonitor.parser.logcursor import LogCursor, read_new_lines
+
+
+class SharedReaderTest(unittest.TestCase):
+    def setUp(self):
+        ## Called before testfunction is executed
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=R1732
+        self.log_path = os.path.join(self.tmp_dir.name, "log.txt")
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        self.tmp_dir.cleanup()
+
+    def append_log(self, content):
+        with open(self.log_path, "a", encoding="utf-8") as log_file:
+            log_file.write(content)
+
+    def test_read_new_lines(self):
+        self.append_log("aaa\nbbb\n")
+        cursor1 = LogCursor()
+        cursor2 = LogCursor()
+        reader = SharedReader([self.log_path, self.log_path])
+        with mock.patch.object(sharedreader, "read_new_lines", wraps=read_new_lines) as read_mock:
+            self.assertEqual([b"aaa\n", b"bbb\n"], list(reader.read_new_lines(self.log_path, cursor1)))
+            self.assertEqual([b"aaa\n", b"bbb\n"], list(reader.read_new_lines(self.log_path, cursor2)))
+            self.assertEqual(1, read_mock.call_count)
+        self.assertEqual(8, cursor1.offset)
+        self.assertEqual(8, cursor2.offset)
+        self.assertEqual({}, reader.cache)
+
+        # cursors in different positions
+        self.append_log("ccc\n")
+        cursor3 = LogCursor()
+        reader = SharedReader([self.log_path, self.log_path])
+        self.assertEqual([b"ccc\n"], list(reader.read_new_lines(self.log_path, cursor1)))
+        self.assertEqual([b"aaa\n", b"bbb\n", b"ccc\n"], list(reader.read_new_lines(self.log_path, cursor3)))
+        self.assertEqual(12, cursor3.offset)
+
+    def test_read_new_lines_big(self):
+        self.append_log("aaa\nbbb\n")
+        reader = SharedReader([self.log_path, self.log_path], max_size=4)
+        with mock.patch.object(sharedreader, "read_new_lines", wraps=read_new_lines) as read_mock:
+            self.assertEqual([b"aaa\n", b"bbb\n"], list(reader.read_new_lines(self.log_path, LogCursor())))
+            self.assertEqual([b"aaa\n", b"bbb\n"], list(reader.read_new_lines(self.log_path, LogCursor())))
+            # too much data to keep - each parser streams file
+            self.assertEqual(2, read_mock.call_count)
+        self.assertEqual({}, reader.cache)
+
+    def test_read_new_lines_compressed(self):
+        with gzip.open(self.log_path, "wb") as log_file:
+            log_file.write(b"aaa\nbbb\n")
+        reader = SharedReader([self.log_path, self.log_path])
+        with mock.patch.object(sharedreader, "read_new_lines", wraps=read_new_lines) as read_mock:
+            self.assertEqual([b"aaa\n", b"bbb\n"], list(reader.read_new_lines(self.log_path, LogCursor())))
+            self.assertEqual([b"aaa\n", b"bbb\n"], list(reader.read_new_lines(self.log_path, LogCursor())))
+            # size of decompressed data is unknown
+            self.assertEqual(2, read_mock.call_count)
+
+    def test_read_new_lines_threads(self):
+        self.append_log("aaa\nbbb\n")
+        readers_num = 8
+        reader = SharedReader([self.log_path] * readers_num)
+
+        def read_lines(_):
+            return list(reader.read_new_lines(self.log_path, LogCursor()))
+
+        with mock.patch.object(sharedreader, "read_new_lines", wraps=read_new_lines) as read_mock:
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                results = list(executor.map(read_lines, range(readers_num)))
+            # file read once
+            self.assertEqual(1, read_mock.call_count)
+        self.assertEqual([[b"aaa\n", b"bbb\n"]] * readers_num, results)
+        self.assertEqual({}, reader.cache)
+
+    def test_read_new_lines_missing(self):
+        reader = SharedReader([self.log_path, self.log_path])
+        with self.assertRaises(FileNotFoundError):
+            reader.read_new_lines(self.log_path, LogCursor())
+        with self.assertRaises(FileNotFoundError):
+            reader.read_new_lines(self.log_path, LogCursor())
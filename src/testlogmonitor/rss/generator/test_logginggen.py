@@ -0,0 +1,109 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import unittest
+from unittest import mock
+import tempfile
+
+from testlogmonitor.data import get_data_path
+from logmonitor.rss.generator.logginggen import LoggingGenerator
+from logmonitor.parser.logentry import LogEntry
+from logmonitor.rss.feedwriter import dumps_feed_stream
+from logmonitor.rss.utils import calculate_feed_hash
+
+
+FMT = (
+    "%(asctime)s,%(msecs)-3d %(levelname)-8s %(threadName)s %(name)s:%(funcName)s"
+    " [%(filename)s:%(lineno)d] %(message)s"
+)
+DATEFMT = "%Y-%m-%d %H:%M:%S"
+
+
+class LoggingGeneratorTest(unittest.TestCase):
+
+    def test_max_entries(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            log_path = os.path.join(tmp_dir, "log.txt")
+            with open(log_path, "w", encoding="utf-8") as log_file:
+                for index in range(5):
+                    log_file.write(
+                        f"2024-10-04 19:13:0{index},100 ERROR    MainThread app:run [app.py:{index}] error {index}\n"
+                    )
+
+            generator = LoggingGenerator("testgen", "outlog.xml", log_path, maxentries=2, fmt=FMT, datefmt=DATEFMT)
+            feed_gen = generator.generate_feed()
+            # last entry is pending
+            self.assertEqual(2, len(generator.log_entries))
+            # newest entries are kept
+            dates = sorted(item.pubDate().second for item in feed_gen.entry())
+            self.assertEqual([3, 4], dates)
+
+    def test_aggregate(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            log_path = os.path.join(tmp_dir, "log.txt")
+            with open(log_path, "w", encoding="utf-8") as log_file:
+                for index in range(5):
+                    log_file.write(
+                        f"2024-10-04 19:13:0{index},100 ERROR    MainThread app:run [app.py:10] request {index} failed\n"
+                    )
+                log_file.write("2024-10-04 19:13:06,100 ERROR    MainThread app:run [app.py:20] connection lost\n")
+
+            generator = LoggingGenerator("testgen", "outlog.xml", log_path, aggregate=True, fmt=FMT, datefmt=DATEFMT)
+            feed_gen = generator.generate_feed()
+            titles = sorted(item.title() for item in feed_gen.entry())
+            self.assertEqual(["testgen: ERROR - app.py (1x)", "testgen: ERROR - app.py (5x)"], titles)
+
+            state = generator.get_state()
+            with open(log_path, "a", encoding="utf-8") as log_file:
+                log_file.write("2024-10-04 19:13:07,100 ERROR    MainThread app:run [app.py:10] request 7 failed\n")
+            generator = LoggingGenerator("testgen", "outlog.xml", log_path, aggregate=True, fmt=FMT, datefmt=DATEFMT)
+            generator.set_state(state)
+            feed_gen = generator.generate_feed()
+            titles = sorted(item.title() for item in feed_gen.entry())
+            self.assertEqual(["testgen: ERROR - app.py (1x)", "testgen: ERROR - app.py (6x)"], titles)
+
+    def test_item_cache(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            log_path = os.path.join(tmp_dir, "log.txt")
+            with open(log_path, "w", encoding="utf-8") as log_file:
+                for index in range(4):
+                    log_file.write(
+                        f"2024-10-04 19:13:0{index},100 ERROR    MainThread app:run [app.py:{index}] error {index}\n"
+                    )
+
+            generator = LoggingGenerator("testgen", "outlog.xml", log_path, loglevel="INFO", fmt=FMT, datefmt=DATEFMT)
+            generator.generate()
+            state = generator.get_state()
+            records = generator.get_records()
+
+            with open(log_path, "a", encoding="utf-8") as log_file:
+                log_file.write("2024-10-04 19:13:05,100 DEBUG    MainThread app:run [app.py:5] debug 5\n")
+                log_file.write("2024-10-04 19:13:06,100 ERROR    MainThread app:run [app.py:6] error 6\n")
+            generator = LoggingGenerator("testgen", "outlog.xml", log_path, loglevel="INFO", fmt=FMT, datefmt=DATEFMT)
+            generator.set_state(state)
+            generator.load_records(state, records)
+            with mock.patch.object(generator, "_create_feed_item", wraps=generator._create_feed_item) as create_mock:
+                content = generator.generate()["outlog.xml"]
+                # previously pending entry and new pending entry serialized
+                self.assertEqual(2, create_mock.call_count)
+            # previously pending entry serialized and cached, current pending entry not cached
+            self.assertEqual(4, len(generator.item_cache.fragments))
+
+            # the same as not cached feed
+            generator = LoggingGenerator("testgen", "outlog.xml", log_path, loglevel="INFO", fmt=FMT, datefmt=DATEFMT)
+            expected = dumps_feed_stream(generator.generate_feed())
+            self.assertEqual(calculate_feed_hash(expected), calculate_feed_hash(content))
+            self.assertEqual(5, content.count("<item>"))
+
+    def test_missing_fields(self):
+        generator = LoggingGenerator("testgen", "outlog.xml", "log.txt", fmt=FMT, datefmt=DATEFMT)
+        # entry not matching format
+        data_entry = LogEntry([b"invalid line"], fields={"message": "invalid line"})
+        feed_item = generator._create_feed_item(data_entry)
+        self.assertEqual("testgen: UNKNOWN - ", feed_item.title())
@@ -8,9 +8,17 @@
 
 import os
 import unittest
+from unittest import mock
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 from testlogmonitor.data import get_data_path
+from logmonitor.rss.generator import parserchaingen
 from logmonitor.rss.generator.parserchaingen import ParserChainGenerator
+from logmonitor.rss.generator.logginggen import LoggingGenerator
+from logmonitor.parser.sharedreader import SharedReader
+from logmonitor.rss.utils import calculate_feed_hash
 
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -52,4 +60,111 @@ class ParserChainGeneratorTest(unittest.TestCase):
         gen_data = generator.generate()
         self.assertEqual({"parser-chain.txt"}, gen_data.keys())
         content = gen_data["parser-chain.txt"]
+        self.assertEqual(3407, len(content))
+
+        # pretty printed by feedgen
+        generator = ParserChainGenerator("testgen", "parser-chain.txt", **chain_params)
+        generator.set_feed_writer("feedgen")
+        gen_data = generator.generate()
+        content = gen_data["parser-chain.txt"]
         self.assertEqual(3540, len(content))
+
+    def test_records(self):
+        log_path = get_data_path("log_trace.txt")
+        chain_params = {
+            "chain": [
+                {
+                    "parser": "logging",
+                    "label": "log-monitor-a",
+                    "outfile": "log-monitor.xml",
+                    "params": {
+                        "logfile": log_path,
+                        "fmt": "%(asctime)s,%(msecs)-3d %(levelname)-8s %(threadName)s %(name)s:%(funcName)s"
+                        " [%(filename)s:%(lineno)d] %(message)s",
+                        "datefmt": "%Y-%m-%d %H:%M:%S",
+                        "loglevel": "WARNING",
+                    },
+                },
+                {"parser": "pytraceback", "label": "log-monitor-b", "params": {"logfile": log_path}},
+            ],
+        }
+        generator = ParserChainGenerator("testgen", "parser-chain.txt", **chain_params)
+        content = generator.generate()["parser-chain.txt"]
+        records = generator.get_new_records()
+        self.assertEqual({0, 1}, {index for index, _ in records})
+        self.assertEqual(records, generator.get_records())
+        # nothing added since previous call
+        self.assertEqual([], generator.get_new_records())
+
+        state = generator.get_state()
+        generator = ParserChainGenerator("testgen", "parser-chain.txt", **chain_params)
+        generator.set_state(state)
+        generator.load_records(state, records)
+        self.assertEqual(records, generator.get_records())
+        restored_content = generator.generate()["parser-chain.txt"]
+        self.assertEqual(calculate_feed_hash(content), calculate_feed_hash(restored_content))
+
+    def test_merge_entries(self):
+        fmt = (
+            "%(asctime)s,%(msecs)-3d %(levelname)-8s %(threadName)s %(name)s:%(funcName)s"
+            " [%(filename)s:%(lineno)d] %(message)s"
+        )
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            chain = []
+            for file_index in range(2):
+                log_path = os.path.join(tmp_dir, f"log{file_index}.txt")
+                with open(log_path, "w", encoding="utf-8") as log_file:
+                    # timestamps of files interleave
+                    for index in range(file_index, 8, 2):
+                        log_file.write(
+                            f"2024-10-04 19:13:0{index},100 ERROR    MainThread app:run [app{file_index}.py:{index}] error\n"
+                        )
+                # the same file read by two generators
+                for _ in range(2):
+                    chain.append(
+                        {
+                            "parser": "logging",
+                            "label": "log",
+                            "params": {"logfile": log_path, "fmt": fmt, "datefmt": "%Y-%m-%d %H:%M:%S"},
+                        }
+                    )
+            # file does not exist
+            chain.append({"parser": "pytraceback", "params": {"logfile": os.path.join(tmp_dir, "missing.txt")}})
+
+            for workers in (1, 4):
+                generator = ParserChainGenerator("testgen", "parser-chain.xml", chain=chain, workers=workers)
+                generator.set_reader(SharedReader(generator.get_logfiles()))
+                with mock.patch.object(LoggingGenerator, "generate_feed") as generate_mock:
+                    with mock.patch("os.cpu_count", return_value=4):
+                        feed_gen = generator.generate_feed()
+                    # feeds of children are not created
+                    generate_mock.assert_not_called()
+                seconds = [item.pubDate().second for item in feed_gen.entry()]
+                # newest first, each entry is found by two generators
+                self.assertEqual([7, 7, 6, 6, 5, 5, 4, 4, 3, 3, 2, 2, 1, 1, 0, 0], seconds)
+
+    def test_run_children_concurrently(self):
+        chain = [{"parser": "pytraceback", "params": {"logfile": f"log{index}.txt"}} for index in range(2)]
+        generator = ParserChainGenerator("testgen", "parser-chain.xml", chain=chain)
+        # fails with timeout if children are not run concurrently
+        barrier = threading.Barrier(2, timeout=5)
+
+        def generate_entries():
+            barrier.wait()
+            return iter([])
+
+        for gen_state in generator.generators:
+            gen_state[1].generate_feed_entries = generate_entries
+        with mock.patch("os.cpu_count", return_value=8):
+            with mock.patch.object(parserchaingen, "ThreadPoolExecutor", wraps=ThreadPoolExecutor) as pool_mock:
+                generator.generate_feed()
+        # bounded by number of children
+        pool_mock.assert_called_once_with(max_workers=2)
+
+        chain = [{"parser": "pytraceback", "params": {"logfile": f"log{index}.txt"}} for index in range(3)]
+        generator = ParserChainGenerator("testgen", "parser-chain.xml", chain=chain)
+        with mock.patch("os.cpu_count", return_value=2):
+            with mock.patch.object(parserchaingen, "ThreadPoolExecutor", wraps=ThreadPoolExecutor) as pool_mock:
+                generator.generate_feed()
+        # bounded by number of CPUs
+        pool_mock.assert_called_once_with(max_workers=2)
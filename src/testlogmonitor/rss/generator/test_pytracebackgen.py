@@ -8,9 +8,13 @@
 
 import os
 import unittest
+from unittest import mock
+import tempfile
 
 from testlogmonitor.data import get_data_path
 from logmonitor.rss.generator.pytracebackgen import PyTracebackGenerator
+from logmonitor.rss.feedwriter import dumps_feed_stream
+from logmonitor.rss.utils import calculate_feed_hash
 
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -28,4 +32,80 @@ class PyTracebackGeneratorTest(unittest.TestCase):
         gen_data = generator.generate()
         self.assertEqual({"outtraces.xml"}, gen_data.keys())
         content = gen_data["outtraces.xml"]
+        self.assertEqual(1926, len(content))
+
+        # pretty printed by feedgen
+        generator = PyTracebackGenerator("testgen", "outtraces.xml", log_path)
+        generator.set_feed_writer("feedgen")
+        gen_data = generator.generate()
+        content = gen_data["outtraces.xml"]
         self.assertEqual(2014, len(content))
+
+        # feedgen not compatible with streaming writer
+        generator = PyTracebackGenerator("testgen", "outtraces.xml", log_path)
+        with mock.patch("logmonitor.rss.generator.rssgenerator.is_writer_available", return_value=False):
+            gen_data = generator.generate()
+        content = gen_data["outtraces.xml"]
+        expected = generator.generate_feed().rss_str(pretty=False).decode()
+        self.assertEqual(calculate_feed_hash(expected), calculate_feed_hash(content))
+
+    def test_max_entries(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            log_path = os.path.join(tmp_dir, "log.txt")
+            with open(log_path, "w", encoding="utf-8") as log_file:
+                for index in range(3):
+                    log_file.write("Traceback (most recent call last):\n")
+                    log_file.write(f'  File "app.py", line {index}, in <module>\n')
+                    log_file.write(f"ValueError: error {index}\n")
+                    log_file.write("next message\n")
+
+            generator = PyTracebackGenerator("testgen", "outtraces.xml", log_path, maxentries=2)
+            feed_gen = generator.generate_feed()
+            self.assertEqual(2, len(generator.log_entries))
+            # newest entries are kept
+            titles = sorted(item.title() for item in feed_gen.entry())
+            self.assertEqual(["testgen: ValueError: error 1", "testgen: ValueError: error 2"], titles)
+
+            state = generator.get_state()
+            records = generator.get_records()
+            generator = PyTracebackGenerator("testgen", "outtraces.xml", log_path, maxentries=1)
+            generator.set_state(state)
+            generator.load_records(state, records)
+            feed_gen = generator.generate_feed()
+            titles = [item.title() for item in feed_gen.entry()]
+            self.assertEqual(["testgen: ValueError: error 2"], titles)
+
+    def test_item_cache(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            log_path = os.path.join(tmp_dir, "log.txt")
+            with open(log_path, "w", encoding="utf-8") as log_file:
+                for index in range(3):
+                    log_file.write("Traceback (most recent call last):\n")
+                    log_file.write('  File "app.py", line 1, in <module>\n')
+                    log_file.write("ValueError: error\n")
+                    log_file.write("next message\n")
+
+            generator = PyTracebackGenerator("testgen", "outtraces.xml", log_path)
+            generator.generate()
+            # the same traceback occurred many times
+            self.assertEqual(3, len(generator.item_cache.fragments))
+            state = generator.get_state()
+            records = generator.get_new_records()
+
+            with open(log_path, "a", encoding="utf-8") as log_file:
+                log_file.write("Traceback (most recent call last):\n")
+                log_file.write("KeyError: key\n")
+                log_file.write("next message\n")
+            # serialized items restored with state
+            generator = PyTracebackGenerator("testgen", "outtraces.xml", log_path)
+            generator.set_state(state)
+            generator.load_records(state, records)
+            with mock.patch.object(generator, "_create_feed_item", wraps=generator._create_feed_item) as create_mock:
+                content = generator.generate()["outtraces.xml"]
+                # only new entry serialized
+                self.assertEqual(1, create_mock.call_count)
+
+            generator = PyTracebackGenerator("testgen", "outtraces.xml", log_path)
+            expected = dumps_feed_stream(generator.generate_feed())
+            self.assertEqual(calculate_feed_hash(expected), calculate_feed_hash(content))
+            self.assertEqual(4, content.count("<item>"))
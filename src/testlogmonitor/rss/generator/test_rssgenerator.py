@@ -0,0 +1,43 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import unittest
+
+from feedgen.feed import FeedGenerator
+
+from logmonitor.rss.generator.rssgenerator import RSSGenerator
+from logmonitor.rss.generator.pytracebackgen import PyTracebackGenerator
+from logmonitor.rss.feedwriter import ItemCache
+from logmonitor.rss.utils import init_feed_gen
+
+
+class FeedGeneratorStub(RSSGenerator):
+    def get_name(self) -> str:
+        return "stub"
+
+    def generate_feed(self) -> FeedGenerator:
+        feed_gen = init_feed_gen("http://not.set")
+        feed_gen.title(self.outfile)
+        feed_gen.description(self.outfile)
+        feed_item = feed_gen.add_entry()
+        feed_item.title("item")
+        return feed_gen
+
+
+class RSSGeneratorTest(unittest.TestCase):
+    def test_generate_without_feed_items(self):
+        generator = FeedGeneratorStub("out.xml")
+        # cache alone does not enable serialization of items
+        generator.item_cache = ItemCache()
+        self.assertFalse(generator.has_feed_items())
+        content = generator.generate()["out.xml"]
+        self.assertEqual(1, content.count("<item>"))
+
+    def test_has_feed_items(self):
+        generator = PyTracebackGenerator("testgen", "out.xml", "log.txt")
+        self.assertTrue(generator.has_feed_items())
@@ -0,0 +1,150 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import unittest
+import tempfile
+import pickle
+
+from lxml import etree
+
+from logmonitor.rss.utils import init_feed_gen
+from logmonitor.rss.feedpager import FeedPager
+from logmonitor.rss.generator.pytracebackgen import PyTracebackGenerator
+
+
+ATOM_NS = "http://www.w3.org/2005/Atom"
+FH_NS = "http://purl.org/syndication/history/1.0"
+
+
+def create_feed_gen():
+    feed_gen = init_feed_gen("http://not.set")
+    feed_gen.title("feed")
+    feed_gen.description("feed")
+    return feed_gen
+
+
+def create_fragments(items_num):
+    """Return items newest first."""
+    return [f"<item><title>item {index}</title></item>" for index in reversed(range(items_num))]
+
+
+def get_titles(content):
+    root = etree.fromstring(content.encode())
+    return [title.text for title in root.iterfind("channel/item/title")]
+
+
+def get_links(content):
+    root = etree.fromstring(content.encode())
+    return {link.get("rel"): link.get("href") for link in root.iterfind(f"channel/{{{ATOM_NS}}}link")}
+
+
+def is_archive(content):
+    root = etree.fromstring(content.encode())
+    return root.find(f"channel/{{{FH_NS}}}archive") is not None
+
+
+class FeedPagerTest(unittest.TestCase):
+    def test_no_archive(self):
+        pager = FeedPager("sub/feed.xml", 2)
+        pages = pager.generate_pages(create_feed_gen(), create_fragments(3))
+        self.assertEqual(["sub/feed.xml"], list(pages.keys()))
+        self.assertEqual(["item 2", "item 1", "item 0"], get_titles(pages["sub/feed.xml"]))
+        self.assertEqual({}, get_links(pages["sub/feed.xml"]))
+
+    def test_archive(self):
+        pager = FeedPager("sub/feed.xml", 2)
+        pages = pager.generate_pages(create_feed_gen(), create_fragments(5))
+        self.assertEqual(["sub/feed-archive-1.xml", "sub/feed.xml"], list(pages.keys()))
+
+        content = pages["sub/feed.xml"]
+        self.assertEqual(["item 4", "item 3", "item 2"], get_titles(content))
+        self.assertEqual({"prev-archive": "feed-archive-1.xml"}, get_links(content))
+        self.assertFalse(is_archive(content))
+
+        content = pages["sub/feed-archive-1.xml"]
+        self.assertEqual(["item 1", "item 0"], get_titles(content))
+        # next page does not exist yet
+        self.assertEqual({"current": "feed.xml"}, get_links(content))
+        self.assertTrue(is_archive(content))
+
+        # archive page is not written again
+        pages = pager.generate_pages(create_feed_gen(), create_fragments(5))
+        self.assertEqual(["sub/feed.xml"], list(pages.keys()))
+
+        pages = pager.generate_pages(create_feed_gen(), create_fragments(6))
+        self.assertEqual(["sub/feed-archive-1.xml", "sub/feed-archive-2.xml", "sub/feed.xml"], list(pages.keys()))
+        self.assertEqual(["item 5", "item 4"], get_titles(pages["sub/feed.xml"]))
+        self.assertEqual({"prev-archive": "feed-archive-2.xml"}, get_links(pages["sub/feed.xml"]))
+        content = pages["sub/feed-archive-2.xml"]
+        self.assertEqual(["item 3", "item 2"], get_titles(content))
+        self.assertEqual({"current": "feed.xml", "prev-archive": "feed-archive-1.xml"}, get_links(content))
+        # previous page links to new page
+        content = pages["sub/feed-archive-1.xml"]
+        self.assertEqual(["item 1", "item 0"], get_titles(content))
+        self.assertEqual({"current": "feed.xml", "next-archive": "feed-archive-2.xml"}, get_links(content))
+
+    def test_many_pages(self):
+        pager = FeedPager("feed.xml", 2)
+        pages = pager.generate_pages(create_feed_gen(), create_fragments(7))
+        self.assertEqual(["feed-archive-1.xml", "feed-archive-2.xml", "feed.xml"], list(pages.keys()))
+        self.assertEqual(
+            {"current": "feed.xml", "next-archive": "feed-archive-2.xml"}, get_links(pages["feed-archive-1.xml"])
+        )
+        self.assertEqual(
+            {"current": "feed.xml", "prev-archive": "feed-archive-1.xml"}, get_links(pages["feed-archive-2.xml"])
+        )
+
+    def test_load(self):
+        pager = FeedPager("feed.xml", 2)
+        pager.generate_pages(create_feed_gen(), create_fragments(5))
+        restored = pickle.loads(pickle.dumps(pager))
+
+        pager = FeedPager("feed.xml", 2)
+        pager.load(restored)
+        pages = pager.generate_pages(create_feed_gen(), create_fragments(6))
+        self.assertEqual(["feed-archive-1.xml", "feed-archive-2.xml", "feed.xml"], list(pages.keys()))
+        self.assertEqual(["item 1", "item 0"], get_titles(pages["feed-archive-1.xml"]))
+
+        # different feed
+        pager = FeedPager("other.xml", 2)
+        pager.load(restored)
+        self.assertEqual(0, pager.pages_num)
+
+    def test_generator(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            log_path = os.path.join(tmp_dir, "log.txt")
+            with open(log_path, "w", encoding="utf-8") as log_file:
+                for index in range(5):
+                    log_file.write("Traceback (most recent call last):\n")
+                    log_file.write(f"ValueError: error {index}\n")
+                    log_file.write("next message\n")
+
+            generator = PyTracebackGenerator("testgen", "outtraces.xml", log_path)
+            generator.set_page_size(2)
+            pages = generator.generate()
+            self.assertEqual(["outtraces-archive-1.xml", "outtraces.xml"], list(pages.keys()))
+            self.assertEqual(3, len(get_titles(pages["outtraces.xml"])))
+            state = generator.get_state()
+            records = generator.get_records()
+
+            with open(log_path, "a", encoding="utf-8") as log_file:
+                log_file.write("Traceback (most recent call last):\n")
+                log_file.write("ValueError: error 5\n")
+                log_file.write("next message\n")
+            generator = PyTracebackGenerator("testgen", "outtraces.xml", log_path)
+            generator.set_page_size(2)
+            generator.set_state(state)
+            generator.load_records(state, records)
+            pages = generator.generate()
+            self.assertEqual(
+                ["outtraces-archive-1.xml", "outtraces-archive-2.xml", "outtraces.xml"], list(pages.keys())
+            )
+            self.assertEqual(
+                ["testgen: ValueError: error 5", "testgen: ValueError: error 4"], get_titles(pages["outtraces.xml"])
+            )
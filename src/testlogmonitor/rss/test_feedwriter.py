@@ -0,0 +1,137 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import io
+import unittest
+from unittest import mock
+import datetime
+import pickle
+
+from logmonitor.rss.utils import init_feed_gen
+from logmonitor.rss.feedwriter import dumps_feed_stream, dumps_feed_items, write_feed, is_feed_supported, ItemCache
+from logmonitor.rss.feedwriter import is_writer_available
+
+
+def create_feed():
+    feed_gen = init_feed_gen("http://not.set?a=1&b=2")
+    feed_gen.title("feed <title>")
+    feed_gen.description("feed & description")
+    feed_gen.link(href="http://localhost/feed.xml", rel="self")
+    feed_gen.lastBuildDate(datetime.datetime(2024, 10, 4, 19, 13, 0, tzinfo=datetime.timezone.utc))
+    tz_info = datetime.timezone(datetime.timedelta(hours=2))
+    for index in range(3):
+        feed_item = feed_gen.add_entry()
+        feed_item.id(f"id{index}")
+        feed_item.title(f"item {index}: a < b && c > d")
+        feed_item.author({"name": "author", "email": "author"})
+        feed_item.content(f"\n<div>\n<pre>\nTraceback \"quoted\" 'text'\r\nline {index}\tą\n</pre>\n</div>\n")
+        feed_item.pubDate(datetime.datetime(2024, 10, 4, 19, 13, index, tzinfo=tz_info))
+    return feed_gen
+
+
+class FeedWriterTest(unittest.TestCase):
+    def test_same_as_feedgen(self):
+        feed_gen = create_feed()
+        content = dumps_feed_stream(feed_gen)
+        self.assertEqual(feed_gen.rss_str(pretty=False).decode(), content)
+
+    def test_description_and_content(self):
+        feed_gen = create_feed()
+        for feed_item in feed_gen.entry():
+            feed_item.description("summary")
+            feed_item.content("<b>content</b>", type="CDATA")
+        content = dumps_feed_stream(feed_gen)
+        self.assertIn("<content:encoded><![CDATA[<b>content</b>]]></content:encoded>", content)
+        self.assertEqual(feed_gen.rss_str(pretty=False).decode(), content)
+
+    def test_write_stream(self):
+        feed_gen = create_feed()
+        out_stream = io.StringIO()
+        write_feed(feed_gen, out_stream)
+        self.assertEqual(feed_gen.rss_str(pretty=False).decode(), out_stream.getvalue())
+
+    def test_unsupported(self):
+        feed_gen = create_feed()
+        self.assertTrue(is_feed_supported(feed_gen))
+        feed_gen.entry()[0].category({"term": "category"})
+        self.assertFalse(is_feed_supported(feed_gen))
+        # fallback to feedgen
+        content = dumps_feed_stream(feed_gen)
+        self.assertEqual(feed_gen.rss_str(pretty=False).decode(), content)
+
+    def test_writer_not_available(self):
+        self.assertTrue(is_writer_available())
+        feed_gen = create_feed()
+        with mock.patch("logmonitor.rss.feedwriter.is_writer_available", return_value=False):
+            self.assertFalse(is_feed_supported(feed_gen))
+            # fallback to feedgen
+            content = dumps_feed_stream(feed_gen)
+        self.assertEqual(feed_gen.rss_str(pretty=False).decode(), content)
+
+    def test_invalid_chars(self):
+        feed_gen = create_feed()
+        feed_gen.entry()[0].title("control \x02 char")
+        self.assertRaises(ValueError, dumps_feed_stream, feed_gen)
+
+    def test_missing_fields(self):
+        feed_gen = init_feed_gen("http://not.set")
+        self.assertRaises(ValueError, dumps_feed_stream, feed_gen)
+
+    def test_feed_items(self):
+        feed_gen = create_feed()
+        cache = ItemCache()
+        fragments = [cache.get_fragment(index, lambda item: item, item) for index, item in enumerate(feed_gen.entry())]
+        content = dumps_feed_items(create_feed(), fragments)
+        self.assertEqual(feed_gen.rss_str(pretty=False).decode(), content)
+
+
+class ItemCacheTest(unittest.TestCase):
+    def test_get_fragment(self):
+        created = []
+
+        def create_item(index):
+            created.append(index)
+            if index == 2:
+                return None
+            return create_feed().entry()[index]
+
+        cache = ItemCache()
+        fragment = cache.get_fragment("a", create_item, 0)
+        self.assertTrue(fragment.startswith("<item><title>item "))
+        cache.get_fragment("b", create_item, 0)
+        # item not cached
+        cache.get_fragment(None, create_item, 0)
+        cache.get_fragment("c", create_item, 2)
+        cache.commit()
+        self.assertEqual([0, 0, 0, 2], created)
+        self.assertEqual({"a", "b", "c"}, cache.fragments.keys())
+        self.assertEqual("", cache.fragments["c"])
+
+        # cached items are not created again
+        created.clear()
+        cache.get_fragment("b", create_item, 0)
+        cache.get_fragment("d", create_item, 1)
+        cache.commit()
+        self.assertEqual([1], created)
+        # not used items are dropped
+        self.assertEqual({"b", "d"}, cache.fragments.keys())
+
+    def test_load(self):
+        cache = ItemCache(signature=("name", "INFO"))
+        cache.get_fragment("a", lambda: create_feed().entry()[0])
+        cache.commit()
+        restored = pickle.loads(pickle.dumps(cache))
+
+        loaded = ItemCache(signature=("name", "INFO"))
+        loaded.load(restored)
+        self.assertEqual(cache.fragments, loaded.fragments)
+
+        # different parameters of generator
+        loaded = ItemCache(signature=("name", "ERROR"))
+        loaded.load(restored)
+        self.assertEqual({}, loaded.fragments)
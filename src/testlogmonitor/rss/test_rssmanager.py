@@ -0,0 +1,219 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import unittest
+from unittest import mock
+import tempfile
+
+from logmonitor.rss.rssmanager import RSSManager, ThreadedRSSManager
+from logmonitor.rss.generator.pytracebackgen import PyTracebackGenerator
+
+
+class RSSManagerTest(unittest.TestCase):
+    def setUp(self):
+        ## Called before testfunction is executed
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=R1732
+        self.data_dir = os.path.join(self.tmp_dir.name, "data")
+        self.log_paths = []
+        gen_items = []
+        for index in range(2):
+            log_path = os.path.join(self.tmp_dir.name, f"log{index}.txt")
+            with open(log_path, "w", encoding="utf-8") as log_file:
+                log_file.write("Traceback (most recent call last):\n")
+                log_file.write("ValueError: error\n")
+                log_file.write("next message\n")
+            self.log_paths.append(log_path)
+            gen_items.append(
+                {
+                    "parser": "pytraceback",
+                    "label": f"gen{index}",
+                    "outfile": f"out{index}.xml",
+                    "params": {"logfile": log_path},
+                }
+            )
+        self.params = {"general": {"dataroot": self.data_dir}, "item": gen_items}
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        self.tmp_dir.cleanup()
+
+    def test_get_logfiles(self):
+        manager = RSSManager(self.params)
+        self.assertEqual(self.log_paths, manager.get_logfiles())
+
+    @mock.patch("logmonitor.rss.rssmanager.save_recent_date")
+    def test_generate_changed(self, _):
+        manager = RSSManager(self.params)
+        manager.generate_data({self.log_paths[1]})
+        # only generator reading changed file is run
+        self.assertFalse(os.path.exists(os.path.join(self.data_dir, "out0.xml")))
+        self.assertTrue(os.path.exists(os.path.join(self.data_dir, "out1.xml")))
+
+        manager.generate_data()
+        self.assertTrue(os.path.exists(os.path.join(self.data_dir, "out0.xml")))
+
+    @mock.patch("logmonitor.rss.rssmanager.save_recent_date")
+    def test_generate_unchanged_input(self, _):
+        manager = RSSManager(self.params)
+        manager.generate_data()
+        with mock.patch("logmonitor.rss.generator.pytracebackgen.PyTracebackGenerator.generate") as generate_mock:
+            manager.generate_data()
+            # log files not changed
+            generate_mock.assert_not_called()
+
+            with open(self.log_paths[0], "a", encoding="utf-8") as log_file:
+                log_file.write("next message\n")
+            generate_mock.return_value = {"out0.xml": None}
+            manager.generate_data()
+            generate_mock.assert_called_once()
+
+    @mock.patch("logmonitor.rss.rssmanager.save_recent_date")
+    def test_generate_missing_file(self, _):
+        os.remove(self.log_paths[0])
+        manager = RSSManager(self.params)
+        manager.generate_data()
+        # missing log file is reported as problem
+        self.assertFalse(manager.is_gen_valid())
+        self.assertFalse(os.path.exists(os.path.join(self.data_dir, "out0.xml")))
+
+        with mock.patch("logmonitor.rss.generator.pytracebackgen.PyTracebackGenerator.generate") as generate_mock:
+            generate_mock.return_value = None
+            manager.generate_data()
+            # generator is not skipped
+            generate_mock.assert_called_once()
+
+    @mock.patch("logmonitor.rss.rssmanager.save_recent_date")
+    def test_generate_unchanged_output(self, _):
+        manager = RSSManager(self.params)
+        manager.generate_data()
+        feed_path = os.path.join(self.data_dir, "out0.xml")
+        os.utime(feed_path, (1000, 1000))
+
+        # new line without new entry
+        with open(self.log_paths[0], "a", encoding="utf-8") as log_file:
+            log_file.write("next message\n")
+        manager = RSSManager(self.params)
+        manager.generate_data()
+        # feed content not changed - file not written
+        self.assertEqual(1000, os.stat(feed_path).st_mtime)
+
+        with open(self.log_paths[0], "a", encoding="utf-8") as log_file:
+            log_file.write("Traceback (most recent call last):\n")
+            log_file.write("KeyError: error\n")
+            log_file.write("next message\n")
+        manager.generate_data()
+        self.assertNotEqual(1000, os.stat(feed_path).st_mtime)
+
+    @mock.patch("logmonitor.rss.rssmanager.save_recent_date")
+    def test_state_restore(self, _):
+        self.params["general"]["statedir"] = os.path.join(self.tmp_dir.name, "state")
+        state_path = os.path.join(self.params["general"]["statedir"], "out0.xml.obj")
+        manager = RSSManager(self.params)
+        manager.generate_data()
+        journal_size = os.path.getsize(f"{state_path}.0")
+        state_size = os.path.getsize(state_path)
+
+        self.append_traceback(0)
+        manager.generate_data()
+        # only new entry appended to journal
+        self.assertLess(journal_size, os.path.getsize(f"{state_path}.0"))
+        self.assertAlmostEqual(state_size, os.path.getsize(state_path), delta=8)
+
+        self.append_traceback(0)
+        manager = RSSManager(self.params)
+        create_item = PyTracebackGenerator._create_feed_item
+        with mock.patch.object(
+            PyTracebackGenerator, "_create_feed_item", autospec=True, side_effect=create_item
+        ) as create_mock:
+            manager.generate_data({self.log_paths[0]})
+            # only new entry serialized - items of restored entries are cached
+            self.assertEqual(1, create_mock.call_count)
+        # journal rewritten after restore
+        self.assertFalse(os.path.exists(f"{state_path}.0"))
+        self.assertTrue(os.path.exists(f"{state_path}.1"))
+        self.assertEqual(3, self.count_items("out0.xml"))
+
+    @mock.patch("logmonitor.rss.rssmanager.save_recent_date")
+    @mock.patch("logmonitor.rss.rssmanager.JOURNAL_MIN_RECORDS", 3)
+    def test_state_compaction(self, _):
+        self.params["general"]["statedir"] = os.path.join(self.tmp_dir.name, "state")
+        self.params["item"][0]["params"]["maxentries"] = 1
+        state_path = os.path.join(self.params["general"]["statedir"], "out0.xml.obj")
+        manager = RSSManager(self.params)
+        manager.generate_data()
+        self.append_traceback(0)
+        manager.generate_data()
+        self.append_traceback(0)
+        manager.generate_data()
+        self.assertTrue(os.path.exists(f"{state_path}.0"))
+        self.append_traceback(0)
+        manager.generate_data()
+        # journal exceeded limit - only recent entries written to other file
+        self.assertFalse(os.path.exists(f"{state_path}.0"))
+        self.assertTrue(os.path.exists(f"{state_path}.1"))
+
+        manager = RSSManager(self.params)
+        manager.get_logfiles()
+        generator = manager._generators[0].generator  # pylint: disable=W0212
+        # entry and its serialized item
+        self.assertEqual(1, len(generator.log_entries))
+        self.assertEqual(1, len(generator.item_cache.fragments))
+
+    @mock.patch("logmonitor.rss.rssmanager.save_recent_date")
+    def test_state_invalid(self, _):
+        self.params["general"]["statedir"] = os.path.join(self.tmp_dir.name, "state")
+        state_path = os.path.join(self.params["general"]["statedir"], "out0.xml.obj")
+        manager = RSSManager(self.params)
+        manager.generate_data()
+        with open(state_path, "r+b") as state_file:
+            state_file.truncate(os.path.getsize(state_path) // 2)
+
+        with self.assertLogs("logmonitor.rss.rssmanager", level="WARNING"):
+            manager = RSSManager(self.params)
+            manager.generate_data()
+        # log file parsed from beginning
+        self.assertTrue(manager.is_gen_valid())
+        self.assertEqual(1, self.count_items("out0.xml"))
+
+    def append_traceback(self, log_index):
+        with open(self.log_paths[log_index], "a", encoding="utf-8") as log_file:
+            log_file.write("Traceback (most recent call last):\n")
+            log_file.write("KeyError: error\n")
+            log_file.write("next message\n")
+
+    def count_items(self, feed_name):
+        with open(os.path.join(self.data_dir, feed_name), encoding="utf-8") as feed_file:
+            return feed_file.read().count("<item>")
+
+
+class ThreadedRSSManagerTest(unittest.TestCase):
+    def test_watch_during_first_generation(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            log_path = os.path.join(tmp_dir, "log.txt")
+            with open(log_path, "w", encoding="utf-8") as log_file:
+                log_file.write("first message\n")
+
+            calls = []
+
+            def generate_data(changed_files=None):
+                calls.append(changed_files)
+                if len(calls) == 1:
+                    # log written during first generation
+                    with open(log_path, "a", encoding="utf-8") as log_file:
+                        log_file.write("next message\n")
+                else:
+                    threaded_manager.stop()
+
+            manager = mock.Mock()
+            manager.get_logfiles.return_value = [log_path]
+            manager.generate_data.side_effect = generate_data
+            threaded_manager = ThreadedRSSManager(manager)
+            threaded_manager.execute_loop(60, 0, watch_files=True, debounce_time=0.1)
+            # change detected without waiting for refresh time
+            self.assertEqual([None, {log_path}], calls)
@@ -9,6 +9,7 @@
 import unittest
 
 from logmonitor.utils import normalize_string
+from logmonitor.rss.utils import init_feed_gen, dumps_feed_gen, calculate_feed_hash
 
 
 class UtilsTest(unittest.TestCase):
@@ -25,3 +26,19 @@ class UtilsTest(unittest.TestCase):
         converted = []
         converted.append(normalize_string(string[0]))
         self.assertEqual(["aaa bbb\nccc"], converted)
+
+    def test_calculate_feed_hash(self):
+        feed_gen = init_feed_gen("http://not.set")
+        feed_gen.title("title")
+        feed_gen.description("description")
+        feed_gen.lastBuildDate("2024-10-04 19:13:00+00:00")
+        content1 = dumps_feed_gen(feed_gen)
+        feed_gen.lastBuildDate("2024-10-05 19:13:00+00:00")
+        content2 = dumps_feed_gen(feed_gen)
+        self.assertNotEqual(content1, content2)
+        # build date is ignored
+        self.assertEqual(calculate_feed_hash(content1), calculate_feed_hash(content2))
+
+        feed_gen.title("title2")
+        content3 = dumps_feed_gen(feed_gen)
+        self.assertNotEqual(calculate_feed_hash(content1), calculate_feed_hash(content3))
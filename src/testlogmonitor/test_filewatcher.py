@@ -0,0 +1,135 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import unittest
+import tempfile
+import threading
+
+from logmonitor.filewatcher import FileWatcher, PollingWatcher, InotifyWatcher
+
+
+def append_file(file_path, content):
+    with open(file_path, "a", encoding="utf-8") as out_file:
+        out_file.write(content)
+
+
+def create_inotify_watcher(file_list, **kwargs):
+    try:
+        return InotifyWatcher(file_list, **kwargs)
+    except (OSError, AttributeError) as exc:
+        raise unittest.SkipTest(f"inotify not available: {exc}")
+
+
+class FileWatcherTest(unittest.TestCase):
+    def test_incomplete_watcher(self):
+        class IncompleteWatcher(FileWatcher):
+            def wakeup(self):
+                pass
+
+        # fails on creation, not when waiting for changes
+        with self.assertRaises(TypeError):
+            IncompleteWatcher([])
+
+
+class PollingWatcherTest(unittest.TestCase):
+    def setUp(self):
+        ## Called before testfunction is executed
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=R1732
+        self.log_path = os.path.join(self.tmp_dir.name, "log.txt")
+        self.other_path = os.path.join(self.tmp_dir.name, "other.txt")
+        append_file(self.log_path, "line 1\n")
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        self.tmp_dir.cleanup()
+
+    def test_append(self):
+        watcher = PollingWatcher([self.log_path, self.other_path], debounce_time=0.1, poll_interval=0.05)
+        append_file(self.log_path, "line 2\n")
+        changed = watcher.wait_changes(2.0)
+        self.assertEqual({self.log_path}, changed)
+
+    def test_create(self):
+        watcher = PollingWatcher([self.log_path, self.other_path], debounce_time=0.1, poll_interval=0.05)
+        append_file(self.other_path, "line 1\n")
+        changed = watcher.wait_changes(2.0)
+        self.assertEqual({self.other_path}, changed)
+
+    def test_timeout(self):
+        watcher = PollingWatcher([self.log_path], debounce_time=0.1, poll_interval=0.05)
+        changed = watcher.wait_changes(0.2)
+        self.assertEqual(set(), changed)
+
+    def test_wakeup(self):
+        watcher = PollingWatcher([self.log_path], debounce_time=0.1, poll_interval=0.05)
+        timer = threading.Timer(0.1, watcher.wakeup)
+        timer.start()
+        changed = watcher.wait_changes(10.0)
+        timer.join()
+        self.assertEqual(set(), changed)
+
+
+class InotifyWatcherTest(unittest.TestCase):
+    def setUp(self):
+        ## Called before testfunction is executed
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=R1732
+        self.log_path = os.path.join(self.tmp_dir.name, "log.txt")
+        self.other_path = os.path.join(self.tmp_dir.name, "other.txt")
+        append_file(self.log_path, "line 1\n")
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        self.tmp_dir.cleanup()
+
+    def test_append(self):
+        watcher = create_inotify_watcher([self.log_path, self.other_path], debounce_time=0.1)
+        try:
+            append_file(self.log_path, "line 2\n")
+            # file not watched
+            append_file(os.path.join(self.tmp_dir.name, "ignored.txt"), "line 1\n")
+            changed = watcher.wait_changes(2.0)
+            self.assertEqual({self.log_path}, changed)
+        finally:
+            watcher.close()
+
+    def test_rotate(self):
+        watcher = create_inotify_watcher([self.log_path], debounce_time=0.1)
+        try:
+            os.rename(self.log_path, self.log_path + ".1")
+            append_file(self.log_path, "line 1\n")
+            changed = watcher.wait_changes(2.0)
+            self.assertEqual({self.log_path}, changed)
+        finally:
+            watcher.close()
+
+    def test_debounce(self):
+        watcher = create_inotify_watcher([self.log_path, self.other_path], debounce_time=0.3)
+        try:
+            timer = threading.Timer(0.1, append_file, args=[self.other_path, "line 1\n"])
+            append_file(self.log_path, "line 2\n")
+            timer.start()
+            # burst of changes is reported once
+            changed = watcher.wait_changes(2.0)
+            timer.join()
+            self.assertEqual({self.log_path, self.other_path}, changed)
+            changed = watcher.wait_changes(0.2)
+            self.assertEqual(set(), changed)
+        finally:
+            watcher.close()
+
+    def test_wakeup(self):
+        watcher = create_inotify_watcher([self.log_path], debounce_time=0.1)
+        try:
+            timer = threading.Timer(0.1, watcher.wakeup)
+            timer.start()
+            changed = watcher.wait_changes(10.0)
+            timer.join()
+            self.assertEqual(set(), changed)
+        finally:
+            watcher.close()